@@ -0,0 +1,6 @@
+"""Benchmarks for Hyprshade's hot paths.
+
+Each module is runnable on its own, e.g. `python -m benchmarks.template_render`.
+`python -m benchmarks.suite` times all hot paths against synthetic data and
+saves the results as JSON, to compare across commits.
+"""
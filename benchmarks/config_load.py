@@ -0,0 +1,73 @@
+"""Compare cold, warm and invalidated config loads.
+
+A config with many shader entries, each with a `config` table, is loaded
+without a cache (cold), from an up-to-date cache (warm) and after its mtime
+changed (invalidated, which parses the TOML and rewrites the cache).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import timeit
+from typing import TYPE_CHECKING
+
+from benchmarks.synthetic import generate_schedule
+from hyprshade.config import cache
+from hyprshade.config.core import Config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def time_per_call(
+    f: Callable[[], object], setup: Callable[[], object], number: int
+) -> float:
+    total = 0.0
+    for _ in range(number):
+        setup()
+        total += timeit.timeit(f, number=1)
+    return total / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--variables", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_STATE_HOME"] = os.path.join(tmp, "state")
+        path = os.path.join(tmp, "hyprshade.toml")
+        with open(path, "w") as f:
+            f.write(generate_schedule(args.entries, args.variables))
+        mtime = 1_000_000_000
+
+        def settle() -> None:
+            nonlocal mtime
+            mtime += 1
+            os.utime(path, (mtime, mtime))
+
+        def remove_cache() -> None:
+            if os.path.exists(cache.cache_path(path)):
+                os.unlink(cache.cache_path(path))
+
+        def load() -> None:
+            Config(path)
+
+        settle()
+        results = {
+            "cold": time_per_call(load, remove_cache, args.number),
+            "warm": time_per_call(load, lambda: None, args.number),
+            "invalidated": time_per_call(load, settle, args.number),
+        }
+
+    print(f"{args.entries} entries with {args.variables} variables each")
+    for name, seconds in results.items():
+        print(f"{name:<12} {seconds * 1e3:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare scanning shader roots one after another and on a thread pool.
+
+Four roots with `--dirs` subdirectories each are listed with `ls_dirs`. To
+stand in for network-backed home directories, `os.scandir` and `os.stat` are
+replaced by versions which sleep for `--latency` seconds per call, as a round
+trip to a remote file system would. With `--latency 0`, the local file system
+is used as is.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING
+
+from hyprshade.utils.fs import ls_dirs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+ROOTS = ["env", "hypr", "hyprshade", "system"]
+
+
+def generate_roots(root: str, dirs: int, files: int) -> list[str]:
+    roots = []
+    for name in ROOTS:
+        for i in range(dirs):
+            directory = os.path.join(root, name, f"dir-{i}")
+            os.makedirs(directory)
+            for j in range(files):
+                open(os.path.join(directory, f"{name}-{i}-{j}.glsl"), "w").close()
+        roots.append(os.path.join(root, name))
+    return roots
+
+
+@contextmanager
+def slow_filesystem(latency: float) -> Iterator[None]:
+    scandir, stat = os.scandir, os.stat
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(latency)
+        return scandir(*args, **kwargs)
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(latency)
+        return stat(*args, **kwargs)
+
+    os.scandir, os.stat = slow_scandir, slow_stat  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        os.scandir, os.stat = scandir, stat  # type: ignore[assignment]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("--dirs", type=int, default=5)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = generate_roots(tmp, args.dirs, args.files)
+        print(
+            f"{len(roots)} roots with {args.dirs} directories each,"
+            f" {args.latency * 1e3:g}ms per file system call"
+        )
+        with slow_filesystem(args.latency) if args.latency else nullcontext():
+            for max_workers in [1, 2, 4]:
+                seconds = (
+                    timeit.timeit(
+                        lambda n=max_workers: list(ls_dirs(roots, max_workers=n)),
+                        number=args.number,
+                    )
+                    / args.number
+                )
+                print(f"{max_workers} worker(s) {seconds * 1e3:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""In-process stand-in for `hyprctl`, so benchmarks need no compositor."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Final
+
+from hyprshade.shader import hyprctl, ipc
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+BATCH_PREFIX: Final = "[[BATCH]]"
+BATCH_DELIMITER: Final = "\n\n\n"
+
+
+class StubHyprctl:
+    """Replacement for `hyprshade.shader.hyprctl.hyprctl`.
+
+    Answers the requests Hyprshade makes (`keyword` and `getoption`) from
+    `options`, as Hyprland would. `latency` delays each call, standing in for
+    a socket round trip.
+    """
+
+    def __init__(self, *, latency: float = 0.0):
+        self.latency = latency
+        self.options: dict[str, str] = {"decoration:screen_shader": hyprctl.EMPTY_STR}
+        self.calls = 0
+
+    def __call__(
+        self, *args: str, signature: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        command = ["hyprctl", *args]
+        reply = self.reply(ipc.command_from_args(command))
+        returncode = 0 if ipc.is_success(command, reply) else 1
+        return subprocess.CompletedProcess(command, returncode, reply, "")
+
+    @contextmanager
+    def installed(self) -> Iterator[StubHyprctl]:
+        original = hyprctl.hyprctl
+        hyprctl.hyprctl = self  # type: ignore[assignment]
+        try:
+            yield self
+        finally:
+            hyprctl.hyprctl = original
+
+    def reply(self, command: str) -> str:
+        # Older trees batch requests, as Hyprland's `hyprctl --batch` does.
+        if command.startswith(BATCH_PREFIX):
+            batch = command.removeprefix(BATCH_PREFIX).split(";")
+            return BATCH_DELIMITER.join(self.reply(c) for c in batch)
+        flags, sep, rest = command.partition("/")
+        if not sep or " " in flags:
+            flags, rest = "", command
+        name, _, args = rest.partition(" ")
+        match name:
+            case "keyword":
+                option, _, value = args.partition(" ")
+                if option not in self.options:
+                    return f"config option <{option}> does not exist."
+                self.options[option] = value
+                return "ok"
+            case "getoption":
+                if args not in self.options:
+                    return "no such option"
+                if "j" in flags:
+                    return json.dumps(
+                        {"option": args, "str": self.options[args], "set": True}
+                    )
+                return f"str: {self.options[args]}\nset: true"
+            case _:
+                return "unknown request"
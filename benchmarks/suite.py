@@ -0,0 +1,314 @@
+"""Time Hyprshade's hot paths against synthetic data and save the results.
+
+A shader library, a schedule and a template are generated in a temporary
+directory (see `benchmarks.synthetic`), and `hyprctl` is replaced by
+`benchmarks.stub_hyprctl.StubHyprctl`. Each case is timed over `--repeat`
+rounds of `--number` calls, and the time per call is reported. The
+`dispatch.*` cases instead time dispatching each command in a fresh
+interpreter, once per round, which is mostly spent importing its modules.
+
+Results are written as JSON with `--output`. Passing a previous output file
+to `--compare` prints how each case changed, and exits with status 1 if any
+case got slower by more than `--threshold`. The suite avoids interfaces newer
+than itself, so it can also time older trees, as long as they send hyprctl
+commands through `hyprshade.shader.hyprctl.hyprctl`. For example, to compare
+the working tree against the commit BASE:
+
+    git worktree add ../hyprshade-base BASE
+    PYTHONPATH=../hyprshade-base/src python -m benchmarks.suite -o base.json
+    python -m benchmarks.suite --compare base.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final
+
+import click
+
+import hyprshade
+from benchmarks.stub_hyprctl import StubHyprctl
+from benchmarks.synthetic import (
+    backdate,
+    generate_schedule,
+    generate_shader_library,
+    generate_template,
+)
+from hyprshade.cli import cli
+from hyprshade.config.core import Config
+from hyprshade.config.schedule import Schedule
+from hyprshade.shader.core import PureShader, Shader
+from hyprshade.template import mustache
+from hyprshade.utils.fs import ls_dirs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+VERSION: Final = 1
+
+Case = tuple[str, "Callable[[], object]", "Callable[[], object] | None"]
+
+
+def measure(
+    f: Callable[[], object],
+    *,
+    number: int,
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> list[float]:
+    """Seconds per call of `f` in each of `repeat` rounds of `number` calls.
+
+    `setup` is called before each call of `f`, outside of the timed section.
+    """
+
+    rounds = []
+    for _ in range(repeat):
+        total = 0.0
+        for _ in range(number):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            f()
+            total += time.perf_counter() - start
+        rounds.append(total / number)
+    return rounds
+
+
+def measure_dispatch(command: str, *, repeat: int) -> list[float]:
+    """Seconds to dispatch `command` in each of `repeat` new interpreters."""
+
+    code = (
+        "import sys, time\n"
+        "from hyprshade.cli import cli\n"
+        "start = time.perf_counter()\n"
+        f"cli.main([{command!r}, '--help'], standalone_mode=False)\n"
+        "print(time.perf_counter() - start, file=sys.stderr)\n"
+    )
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stderr.splitlines()[-1]
+        )
+        for _ in range(repeat)
+    ]
+
+
+def cases(root: str, args: argparse.Namespace) -> list[Case]:
+    library = generate_shader_library(
+        os.path.join(root, "shaders"),
+        files=args.files,
+        depth=args.depth,
+        symlinks=args.symlinks,
+        templates=args.templates,
+        sections=args.sections,
+    )
+    config_path = os.path.join(root, "hyprshade.toml")
+    with open(config_path, "w") as f:
+        f.write(generate_schedule(args.entries, args.variables))
+    backdate(root)
+    os.environ["HYPRSHADE_SHADERS_DIR"] = library
+    os.environ["HYPRSHADE_CONFIG"] = config_path
+
+    dirs = Shader.dirs.all()
+    last_shader = f"shader-{args.files - 1}"
+    PureShader(last_shader)._resolve_path()
+
+    template = generate_template(args.sections)
+    data = {f"var_{i}": i / 10 for i in range(0, args.sections, 2)}
+
+    def remove_config_cache() -> None:
+        try:
+            from hyprshade.config import cache
+        except ImportError:  # Older trees have no config cache
+            return
+        if os.path.exists(cache.cache_path(config_path)):
+            os.unlink(cache.cache_path(config_path))
+
+    config = Config(config_path)
+    schedule = Schedule(config)
+    times = [
+        datetime.min.replace(hour=h, minute=m).time()
+        for h in range(24)
+        for m in (15, 45)
+    ]
+
+    def scheduled_shaders(schedule: Schedule) -> None:
+        for t in times:
+            schedule.scheduled_shader(t)
+
+    def toggle() -> None:
+        cli.main(["toggle"], standalone_mode=False)
+
+    return [
+        ("ls_dirs", lambda: list(ls_dirs(dirs)), None),
+        ("resolve_path", lambda: PureShader(last_shader)._resolve_path(), None),
+        ("mustache.render", lambda: mustache.render(template, data), None),
+        ("config.load.cold", lambda: Config(config_path), remove_config_cache),
+        ("config.load.warm", lambda: Config(config_path), None),
+        ("schedule.scheduled_shader", lambda: scheduled_shaders(schedule), None),
+        (
+            "schedule.scheduled_shader.cold",
+            lambda: scheduled_shaders(Schedule(config)),
+            None,
+        ),
+        ("toggle", toggle, None),
+    ]
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    stub = StubHyprctl(latency=args.latency)
+    with tempfile.TemporaryDirectory() as root, stub.installed():
+        os.environ["XDG_STATE_HOME"] = os.path.join(root, "state")
+        os.environ["XDG_CONFIG_HOME"] = os.path.join(root, "config")
+        measurements: list[tuple[str, Callable[[], list[float]]]] = [
+            (
+                name,
+                partial(
+                    measure, f, number=args.number, repeat=args.repeat, setup=setup
+                ),
+            )
+            for name, f, setup in cases(root, args)
+        ]
+        measurements += [
+            (
+                f"dispatch.{command}",
+                partial(measure_dispatch, command, repeat=args.repeat),
+            )
+            for command in cli.list_commands(click.Context(cli))
+        ]
+        for name, measure_rounds in measurements:
+            if args.case and not any(name.startswith(c) for c in args.case):
+                continue
+            rounds = measure_rounds()
+            results[name] = {
+                "min": min(rounds),
+                "median": statistics.median(rounds),
+                "max": max(rounds),
+            }
+            print(f"{name:<32} {min(rounds) * 1e6:>12.1f}us", file=sys.stderr)
+
+    return {
+        "version": VERSION,
+        "commit": git_commit(),
+        "date": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            name: getattr(args, name)
+            for name in [
+                "number",
+                "repeat",
+                "files",
+                "depth",
+                "symlinks",
+                "templates",
+                "sections",
+                "entries",
+                "variables",
+                "latency",
+            ]
+        },
+        "results": results,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            encoding="utf-8",
+            cwd=os.path.dirname(hyprshade.__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> int:
+    """Print each case's change from `baseline`; return how many regressed.
+
+    Cases are compared by their fastest round, which is the least noisy.
+    """
+
+    if baseline.get("parameters") != current["parameters"]:
+        print("warning: baseline was run with different parameters", file=sys.stderr)
+
+    regressions = 0
+    print(f"{'case':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        if (before := baseline.get("results", {}).get(name)) is None:
+            print(f"{name:<32} {'-':>12} {result['min'] * 1e6:>10.1f}us")
+            continue
+        change = result["min"] / before["min"] - 1
+        regressed = change > threshold
+        regressions += regressed
+        print(
+            f"{name:<32} {before['min'] * 1e6:>10.1f}us {result['min'] * 1e6:>10.1f}us"
+            f" {change:>+7.1%}{'  slower' if regressed else ''}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--number", type=int, default=20)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--symlinks", type=int, default=4)
+    parser.add_argument("--templates", type=int, default=100)
+    parser.add_argument("--sections", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--variables", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per hyprctl call"
+    )
+    parser.add_argument(
+        "-c",
+        "--case",
+        action="append",
+        help="only run cases whose name starts with CASE; may be repeated",
+    )
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="a previous --output")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="slowdown counted as a regression by --compare (default: 0.2)",
+    )
+    args = parser.parse_args()
+    if args.files < args.entries:
+        parser.error("--files must be at least --entries")
+
+    current = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Generators for synthetic shader libraries, schedules and templates."""
+
+from __future__ import annotations
+
+import os
+import time
+
+
+def generate_shader_library(
+    root: str,
+    *,
+    files: int,
+    depth: int,
+    fanout: int = 4,
+    symlinks: int = 0,
+    templates: int = 0,
+    sections: int = 10,
+) -> str:
+    """Create a tree of `files` shaders under `root` and return its path.
+
+    Every directory above `depth` has `fanout` subdirectories, and shaders
+    named `shader-0` to `shader-{files - 1}` are dealt out across all of them.
+    The first `templates` shaders are templates with `sections` `{{#nc}}`
+    sections each. `symlinks` directories get a symlink back to `root`, so
+    walkers which follow symlinks have loops to skip.
+    """
+
+    directories = [root]
+    level = [root]
+    for _ in range(depth):
+        level = [
+            os.path.join(parent, f"dir-{i}") for parent in level for i in range(fanout)
+        ]
+        directories += level
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    template = generate_template(sections)
+    for i in range(files):
+        directory = directories[i % len(directories)]
+        if i < templates:
+            path, text = os.path.join(directory, f"shader-{i}.glsl.mustache"), template
+        else:
+            path, text = os.path.join(directory, f"shader-{i}.glsl"), "void main() {}"
+        with open(path, "w") as f:
+            f.write(text)
+
+    for i in range(symlinks):
+        directory = directories[i % len(directories)]
+        os.symlink(root, os.path.join(directory, f"loop-{i}"))
+
+    return root
+
+
+def backdate(root: str, seconds: float = 60 * 60) -> None:
+    """Set the mtime of `root` and everything under it `seconds` in the past.
+
+    Hyprshade does not cache anything derived from files modified in the last
+    few seconds, since they may still be changing; freshly generated data
+    would otherwise never be served from its caches.
+    """
+
+    mtime = time.time() - seconds
+    for directory, subdirs, files in os.walk(root):
+        for name in [*subdirs, *files]:
+            os.utime(
+                os.path.join(directory, name), (mtime, mtime), follow_symlinks=False
+            )
+    os.utime(root, (mtime, mtime))
+
+
+def generate_schedule(entries: int, variables: int) -> str:
+    """TOML config scheduling `shader-0` to `shader-{entries - 1}`.
+
+    `shader-0` is the default shader, and the others are scheduled for half an
+    hour starting on the hour. Each has a `config` table of `variables`
+    variables named `var_0`, `var_1`, ...
+    """
+
+    lines = []
+    for i in range(entries):
+        lines += [
+            "[[shaders]]",
+            f'name = "shader-{i}"',
+            f"start_time = {i % 24:02}:00:00",
+            f"end_time = {i % 24:02}:30:00",
+        ]
+        if i == 0:
+            lines = lines[:-2] + ["default = true"]
+        lines.append("[shaders.config]")
+        lines += [f"var_{j} = {j / 10}" for j in range(variables)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_template(sections: int) -> str:
+    """Shader template with `sections` `{{#nc}}` sections.
+
+    Section `i` reads the variable `var_{i}`, falling back to `i` when it is
+    not given, as the templates in `shaders/` do.
+    """
+
+    lines = ["#version 300 es", "precision highp float;", ""]
+    lines += [
+        f"const float Var{i} = float({{{{#nc}}}}{{{{var_{i}}}}} ? {i}.0{{{{/nc}}}});"
+        for i in range(sections)
+    ]
+    lines += ["", "void main() {}", ""]
+    return "\n".join(lines)
@@ -0,0 +1,66 @@
+"""Compare Hyprshade's built-in template renderer against chevron.
+
+Renders every template shipped in `shaders/` with both renderers, checks that
+their output is identical and reports the time per render.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import chevron
+
+from hyprshade.template import mustache, renderer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SHADERS_DIR = Path(__file__).parents[1] / "shaders"
+DATA: dict[str, Any] = {
+    "balance": {"red": 1.2, "green": 1.0},
+    "strength": 0.5,
+    "temperature": 4000,
+    "type": "GREEN_RED",
+}
+
+
+def time_per_call(f: Callable[[], object], number: int, repeat: int) -> float:
+    return min(timeit.repeat(f, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = mustache.DEFAULT_RENDER_DATA | mustache.normalize_data(DATA)
+    print(f"{'template':<32} {'chevron':>12} {'hyprshade':>12} {'speedup':>8}")
+    for path in sorted(SHADERS_DIR.glob("*.mustache")):
+        source = path.read_text()
+        nodes = renderer.compile_nodes(source)
+        expected = chevron.render(source, data)
+        if renderer.render(nodes, data) != expected:
+            raise SystemExit(f"{path.name}: output differs from chevron")
+
+        before = time_per_call(
+            lambda source=source: chevron.render(source, data),
+            args.number,
+            args.repeat,
+        )
+        after = time_per_call(
+            lambda nodes=nodes: renderer.render(nodes, data),
+            args.number,
+            args.repeat,
+        )
+        print(
+            f"{path.name:<32} {before * 1e6:>10.1f}us {after * 1e6:>10.1f}us"
+            f" {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare walking a shader tree with symlink loops before and after dedup.
+
+The synthetic tree has `--dirs` subdirectories with `--files` shaders each.
+Every subdirectory holds a symlink back to the root, and a second root is
+a symlink to the first, as when `~/.config/hypr/shaders` points at
+`~/.config/hyprshade/shaders`. The naive walker, which follows symlinks
+without remembering visited directories, re-enters the loops up to the depth
+limit; the deduplicating walker visits each directory once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import timeit
+from typing import TYPE_CHECKING
+
+from hyprshade.utils.fs import scandir_tree
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MAX_DEPTH = 5
+
+
+def generate_tree(root: str, dirs: int, files: int) -> list[str]:
+    shaders = os.path.join(root, "hyprshade")
+    for i in range(dirs):
+        directory = os.path.join(shaders, f"dir-{i}")
+        os.makedirs(directory)
+        for j in range(files):
+            open(os.path.join(directory, f"shader-{i}-{j}.glsl"), "w").close()
+        os.symlink(shaders, os.path.join(directory, "loop"))
+    hypr = os.path.join(root, "hypr")
+    os.symlink(shaders, hypr)
+    return [hypr, shaders]
+
+
+def naive_scandir_recursive(path: str, *, max_depth: int) -> Iterator[os.DirEntry]:
+    dir_stack = []
+    with os.scandir(path) as it:
+        for direntry in it:
+            if not direntry.is_dir():
+                yield direntry
+            elif max_depth > 0:
+                dir_stack.append(direntry)
+    while dir_stack:
+        yield from naive_scandir_recursive(
+            dir_stack.pop().path, max_depth=max_depth - 1
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("--dirs", type=int, default=4)
+    parser.add_argument("--files", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = generate_tree(tmp, args.dirs, args.files)
+
+        def naive() -> int:
+            return sum(
+                1
+                for root in roots
+                for _ in naive_scandir_recursive(root, max_depth=MAX_DEPTH)
+            )
+
+        def dedup() -> int:
+            visited: set[tuple[int, int]] = set()
+            return sum(
+                len(files)
+                for root in roots
+                for _, files in scandir_tree(root, max_depth=MAX_DEPTH, visited=visited)
+            )
+
+        print(f"{args.dirs} directories with {args.files} files each, with loops")
+        for name, walk in [("naive", naive), ("dedup", dedup)]:
+            seconds = timeit.timeit(walk, number=args.number) / args.number
+            print(f"{name:<8} {seconds * 1e3:>10.2f}ms {walk():>10} entries")
+
+
+if __name__ == "__main__":
+    main()
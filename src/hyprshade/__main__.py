@@ -1,6 +1,6 @@
 import sys
 
 if __name__ == "__main__":
-    from hyprshade.cli import main
+    from hyprshade.client import main
 
     sys.exit(main())
@@ -1,45 +1,137 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING, Final
 
 import click
 
 from hyprshade.cli.utils import ContextObject
-from hyprshade.config.core import Config
-
-from .auto import auto
-from .current import current
-from .install import install
-from .ls import ls
-from .off import off
-from .on import on
-from .toggle import toggle
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
 
-COMMANDS: Final = [
-    auto,
-    current,
-    install,
-    ls,
-    off,
-    on,
-    toggle,
-]
+LAZY_COMMANDS: Final = {
+    "auto": "hyprshade.cli.auto:auto",
+    "current": "hyprshade.cli.current:current",
+    "daemon": "hyprshade.cli.daemon:daemon",
+    "install": "hyprshade.cli.install:install",
+    "ls": "hyprshade.cli.ls:ls",
+    "off": "hyprshade.cli.off:off",
+    "on": "hyprshade.cli.on:on",
+    "toggle": "hyprshade.cli.toggle:toggle",
+}
+# Options whose value is optional, and may only be given as `--option=VALUE`.
+OPTIONAL_VALUE_OPTIONS: Final = frozenset({"--profile"})
 COMMON_DECORATORS: Final = [
     click.help_option(help="Show this message and exit"),
 ]
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Group which imports a command's module only when the command is used."""
+
+    lazy_commands: dict[str, str]
+
+    def __init__(self, *args, lazy_commands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self.lazy_commands[cmd_name].split(":")
+        # Unlike `importlib.import_module`, `__import__` is visible to
+        # `python -X importtime`.
+        command = getattr(__import__(module_name, fromlist=[attribute]), attribute)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"'{self.lazy_commands[cmd_name]}' is not a command")
+        return compose(*COMMON_DECORATORS)(command)
+
+
+class CliGroup(LazyGroup):
+    """`LazyGroup` where `hyprshade --profile on` does not profile to a file `on`."""
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        return super().parse_args(ctx, self._expand_optional_values(ctx, args))
+
+    def _expand_optional_values(self, ctx: click.Context, args: list[str]) -> list[str]:
+        takes_value = {
+            opt
+            for param in self.get_params(ctx)
+            if isinstance(param, click.Option) and not param.is_flag
+            for opt in param.opts
+        }
+        args = list(args)
+        i = 0
+        while i < len(args) and args[i].startswith("-") and args[i] != "--":
+            if args[i] in OPTIONAL_VALUE_OPTIONS:
+                args[i] += "="
+            elif args[i] in takes_value:
+                i += 1
+            i += 1
+        return args
+
+
+@click.group(cls=CliGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(help="Show the version and exit")
 @click.help_option(help="Show this message and exit")
 @click.option("-v", "--verbose", is_flag=True, help="Enable verbose output")
+@click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(dir_okay=False, writable=True),
+    metavar="FILE",
+    help="Write timing spans to FILE as Chrome trace-event JSON",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    metavar="[=PATH]",
+    help=(
+        "Profile the command; write pstats to PATH, or print the slowest"
+        " functions to stderr"
+    ),
+)
+@click.option(
+    "--record-hyprctl",
+    "record_path",
+    type=click.Path(dir_okay=False, writable=True),
+    metavar="FILE",
+    help="Write every hyprctl command and its reply to FILE",
+)
+@click.option(
+    "--replay-hyprctl",
+    "replay_path",
+    type=click.Path(exists=True, dir_okay=False),
+    metavar="FILE",
+    help="Answer hyprctl commands from a --record-hyprctl FILE",
+)
+@click.option(
+    "--replay-latency-scale",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    metavar="SCALE",
+    help="Multiply the recorded latency of replayed commands by SCALE",
+)
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool):
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    trace_path: str | None,
+    profile_path: str | None,
+    record_path: str | None,
+    replay_path: str | None,
+    replay_latency_scale: float,
+):
     """Improved UX for Hyprland shaders
 
     For more detailed documentation, visit the project's GitHub page:
@@ -49,11 +141,78 @@ def cli(ctx: click.Context, verbose: bool):
     level = logging.DEBUG if verbose else logging.WARNING
     logging.basicConfig(level=level)
 
+    if ctx.obj is None:
+        ctx.obj = ContextObject(ContextObject.load_config)
+
+    if record_path is not None and replay_path is not None:
+        raise click.BadOptionUsage(
+            "--record-hyprctl",
+            "--record-hyprctl and --replay-hyprctl cannot be used together",
+        )
+    if record_path is not None:
+        start_recording(ctx, record_path)
+    if replay_path is not None:
+        start_replay(ctx, replay_path, replay_latency_scale)
+    if trace_path is not None:
+        start_trace(ctx, trace_path)
+    if profile_path is not None:
+        start_profile(ctx, profile_path or None)
+
+
+def start_trace(ctx: click.Context, path: str) -> None:
+    from hyprshade.utils import trace
+
+    trace.enable()
+    span = trace.span(f"hyprshade {ctx.invoked_subcommand}").start()
+
+    def finish() -> None:
+        span.finish()
+        trace.dump(path, trace.disable())
+
+    ctx.call_on_close(finish)
+
+
+def start_recording(ctx: click.Context, path: str) -> None:
+    from hyprshade.shader import recording
+
+    recording.start_recording()
+    ctx.call_on_close(lambda: recording.dump(path, recording.stop_recording()))
+
+
+def start_replay(ctx: click.Context, path: str, latency_scale: float) -> None:
+    from hyprshade.shader import recording
+
     try:
-        config = Config()
-    except FileNotFoundError:
-        config = None
-    ctx.obj = ContextObject(config)
+        calls = recording.load(path)
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint="--replay-hyprctl") from e
+    recording.start_replay(calls, latency_scale=latency_scale)
+    ctx.call_on_close(recording.stop_replay)
+
+
+def start_profile(ctx: click.Context, path: str | None) -> None:
+    """Profile until `ctx` closes, reporting startup time separately."""
+
+    import cProfile
+
+    from hyprshade.utils import profiling
+
+    startup = profiling.process_uptime()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+
+    def finish() -> None:
+        profiler.disable()
+        command = time.perf_counter() - start
+        click.echo(profiling.format_timings(startup, command), err=True)
+        if path is None:
+            click.echo(profiling.format_stats(profiler), err=True)
+        else:
+            profiler.dump_stats(path)
+            click.echo(f"Wrote profile to {path}", err=True)
+
+    ctx.call_on_close(finish)
 
 
 def compose(*decorators: Callable):
@@ -65,23 +224,23 @@ def compose(*decorators: Callable):
     return decorator
 
 
-for command in COMMANDS:
-    cli.add_command(compose(*COMMON_DECORATORS)(command))
-
-
 def main():  # pragma: no cover
     try:
         return cli()
     except Exception as e:
         if logging.getLogger().getEffectiveLevel() <= logging.DEBUG:
             raise e
-        message = str(e) or repr(e)
-        click.echo(
-            f"{click.style('Error', fg='red')}: {click.style(message, bold=True)}",
-            err=True,
-        )
-        if getattr(e, "__notes__", None):
-            for note in e.__notes__:
-                click.echo(f"{click.style('Note', bold=True)}: {note}", err=True)
-        click.secho("Use --verbose to see the full traceback", fg="yellow", err=True)
-        return 1
+        return report_exception(e)
+
+
+def report_exception(e: Exception) -> int:
+    message = str(e) or repr(e)
+    click.echo(
+        f"{click.style('Error', fg='red')}: {click.style(message, bold=True)}",
+        err=True,
+    )
+    if getattr(e, "__notes__", None):
+        for note in e.__notes__:
+            click.echo(f"{click.style('Note', bold=True)}: {note}", err=True)
+    click.secho("Use --verbose to see the full traceback", fg="yellow", err=True)
+    return 1
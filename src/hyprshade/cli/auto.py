@@ -8,13 +8,16 @@ import click
 from hyprshade.config.schedule import Schedule
 from hyprshade.shader.core import Shader
 
+from .utils import all_instances_option, report_instance_results
+
 if TYPE_CHECKING:
     from hyprshade.cli.utils import ContextObject
 
 
 @click.command(short_help="Set screen shader on schedule")
+@all_instances_option()
 @click.pass_obj
-def auto(obj: ContextObject):
+def auto(obj: ContextObject, all_instances: bool):
     """Set screen shader based on schedule.
 
     Requires a schedule to be specified in hyprshade.toml.
@@ -24,7 +27,11 @@ def auto(obj: ContextObject):
     config = obj.get_config(raising=True)
     shader = Schedule(config).scheduled_shader(t)
 
-    if shader:
+    if all_instances:
+        report_instance_results(
+            shader.on_all_instances() if shader else Shader.off_all_instances()
+        )
+    elif shader:
         shader.on()
     else:
         Shader.off()
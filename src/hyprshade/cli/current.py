@@ -1,23 +1,65 @@
 from __future__ import annotations
 
+import json
+from typing import TYPE_CHECKING
+
 import click
 
+from hyprshade.shader import hyprctl
 from hyprshade.shader.core import Shader
 
+if TYPE_CHECKING:
+    from hyprshade.shader.core import PureShader
+
 
 @click.command(short_help="Print current screen shader")
 @click.option("-l", "--long", is_flag=True, help="Long listing format")
-def current(long: bool):
+@click.option("--json", "as_json", is_flag=True, help="Print a JSON object")
+@click.option(
+    "--follow",
+    is_flag=True,
+    help="Keep running and print again whenever the shader changes",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=hyprctl.WATCH_INTERVAL,
+    show_default=True,
+    metavar="SECONDS",
+    help="How often --follow re-checks the shader between Hyprland events",
+)
+def current(long: bool, as_json: bool, follow: bool, interval: float):
     """Print current screen shader.
 
-    If no shader is active, print nothing.
+    If no shader is active, print nothing, or an empty line with --follow.
+
+    --json prints an object with `text`, `alt`, `class` and `tooltip` keys,
+    which is the format expected by Waybar's custom modules.
     """
 
-    current = Shader.current()
-    if current is None:
+    if not follow:
+        current = Shader.current()
+        if current is not None or as_json:
+            click.echo(_format(current, long=long, as_json=as_json))
         return
 
+    for current in Shader.watch(interval):
+        click.echo(_format(current, long=long, as_json=as_json))
+
+
+def _format(current: PureShader | None, *, long: bool, as_json: bool) -> str:
+    if as_json:
+        state = "off" if current is None else "on"
+        return json.dumps(
+            {
+                "text": "" if current is None else str(current),
+                "alt": state,
+                "class": state,
+                "tooltip": "" if current is None else current.path(),
+            }
+        )
+    if current is None:
+        return ""
     if long:
-        click.echo(f"{current}  {current.path()}")
-        return
-    click.echo(current)
+        return f"{current}  {current.path()}"
+    return str(current)
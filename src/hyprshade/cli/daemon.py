@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import click
+
+from hyprshade.daemon.core import Daemon
+
+if TYPE_CHECKING:
+    from hyprshade.cli.utils import ContextObject
+
+
+@click.command(short_help="Set screen shader on schedule continuously")
+@click.pass_obj
+def daemon(obj: ContextObject):
+    """Set screen shader on schedule from a resident process.
+
+    Unlike `hyprshade auto`, the screen shader is kept in sync with the
+    schedule for as long as the process runs. The config file is reloaded
+    whenever it changes.
+
+    Requires a schedule to be specified in hyprshade.toml.
+    """
+
+    config = obj.get_config(raising=True)
+    Daemon(config).run()
@@ -17,15 +17,33 @@ if TYPE_CHECKING:
 
 @click.command(short_help="Install systemd user units")
 @click.option("--enable", is_flag=True, help="Enable the units after installation")
+@click.option(
+    "--daemon",
+    "use_daemon",
+    is_flag=True,
+    help="Install a service running `hyprshade daemon` instead of a timer",
+)
 @click.pass_obj
-def install(obj: ContextObject, enable: bool):
+def install(obj: ContextObject, enable: bool, use_daemon: bool):
     """Install systemd user units.
 
+    By default, a timer unit runs `hyprshade auto` at every time in the
+    schedule. With --daemon, a single service unit running `hyprshade daemon`
+    is installed instead.
+
     Requires a schedule to be specified in hyprshade.toml.
     """
 
     script_path = get_script_path()
     config = obj.get_config(raising=True)
+
+    if use_daemon:
+        install_daemon(script_path, enable=enable)
+        return
+
+    if is_daemon_service_installed():
+        disable_systemd_user_unit("service")
+
     schedule = Schedule(config)
     timer_config = "\n".join(
         sorted([f"OnCalendar=*-*-* {x}" for x in schedule.event_times()])
@@ -62,6 +80,35 @@ WantedBy=timers.target
         )
 
 
+def install_daemon(script_path: str, *, enable: bool) -> None:
+    if os.path.exists(systemd_user_unit_path("timer")):
+        disable_systemd_user_unit("timer")
+        remove_systemd_user_unit("timer")
+
+    write_systemd_user_unit(
+        "service",
+        f"""[Unit]
+Description=Apply screen filter on schedule
+PartOf=graphical-session.target
+After=graphical-session.target
+
+[Service]
+Type=simple
+ExecStart={shlex.quote(script_path)} daemon
+Restart=on-failure
+
+[Install]
+WantedBy=graphical-session.target
+""",
+    )
+
+    if enable:
+        subprocess.run(
+            ["systemctl", "--user", "enable", "--now", "hyprshade.service"],
+            check=True,
+        )
+
+
 SystemdUnitType: TypeAlias = Literal["service", "timer"]
 
 
@@ -69,10 +116,42 @@ def get_script_path() -> str:  # pragma: no cover
     return os.path.realpath(sys.argv[0], strict=True)
 
 
+def systemd_user_unit_path(unit_type: SystemdUnitType) -> str:
+    return os.path.join(user_config_dir("systemd/user"), f"hyprshade.{unit_type}")
+
+
 def write_systemd_user_unit(unit_type: SystemdUnitType, text: str) -> None:
-    dest_dir = user_config_dir("systemd/user")
-    os.makedirs(dest_dir, exist_ok=True)
-    path = os.path.join(dest_dir, f"hyprshade.{unit_type}")
+    path = systemd_user_unit_path(unit_type)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w") as f:
         f.write(text)
     click.echo(f"Wrote {unit_type} unit to {path}.", err=True)
+
+
+def is_daemon_service_installed() -> bool:
+    # Only the daemon's service is installed into a target; the oneshot
+    # service is started by the timer.
+    try:
+        with open(systemd_user_unit_path("service")) as f:
+            return "[Install]" in f.read()
+    except FileNotFoundError:
+        return False
+
+
+def disable_systemd_user_unit(unit_type: SystemdUnitType) -> None:
+    try:
+        subprocess.run(
+            ["systemctl", "--user", "disable", "--now", f"hyprshade.{unit_type}"],
+            check=False,
+        )
+    except FileNotFoundError:
+        return
+
+
+def remove_systemd_user_unit(unit_type: SystemdUnitType) -> None:
+    path = systemd_user_unit_path(unit_type)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    click.echo(f"Removed {unit_type} unit at {path}.", err=True)
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
-from bisect import bisect_left
-from itertools import islice
-from typing import final
+from itertools import groupby
+from typing import TYPE_CHECKING, final
 
 import click
 
 from hyprshade.shader.core import PureShader, Shader
 from hyprshade.utils.fs import ls_dirs
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 @click.command(short_help="List available screen shaders")
 @click.option("-l", "--long", is_flag=True, help="Long listing format")
 def ls(long: bool):
     """List available screen shaders."""
 
+    if not long:
+        for shader in ShaderWithMeta.iter_shaders():
+            c = "*" if shader.is_current else " "
+            if shader.is_current and not shader.is_in_shader_paths:
+                click.echo(f"{c} {shader!s}  ({shader.path()})")
+                continue
+            click.echo(f"{c} {shader!s}")
+        return
+
     shaders = ShaderWithMeta.get_shaders_list()
     if not shaders:
         return
@@ -22,13 +33,7 @@ def ls(long: bool):
 
     for shader in shaders:
         c = "*" if shader.is_current else " "
-        if long:
-            click.echo(f"{c} {shader!s:{width}} {shader.path()}")
-            continue
-        if shader.is_current and not shader.is_in_shader_paths:
-            click.echo(f"{c} {shader!s}  ({shader.path()})")
-            continue
-        click.echo(f"{c} {shader!s}")
+        click.echo(f"{c} {shader!s:{width}} {shader.path()}")
 
 
 @final
@@ -54,17 +59,42 @@ class ShaderWithMeta(PureShader):
 
     @classmethod
     def get_shaders_list(cls) -> list[ShaderWithMeta]:
+        return list(cls.iter_shaders())
+
+    @classmethod
+    def iter_shaders(cls) -> Iterator[ShaderWithMeta]:
+        """Yield the listed shaders, marking the current one or adding it if missing."""
+
+        shaders = map(
+            cls,
+            ls_dirs(
+                Shader.dirs.all(),
+                follow_symlinks=Shader.dirs.follow_symlinks(),
+                max_workers=Shader.dirs.scan_workers(),
+            ),
+        )
         current = cls._current()
-        shaders = list(map(cls, ls_dirs(Shader.dirs.all())))
-        if current:
-            i = cls._bisect(shaders, current)
-            if shaders[i] == current:
-                shaders[i]._is_current = True
-                shaders[i]._is_in_shader_paths = True
+        if current is None:
+            yield from shaders
+            return
+
+        for name, group in groupby(shaders, key=lambda s: s.name):
+            if current is not None and name >= current.name:
+                same_name = list(group)
+                if name == current.name and current in same_name:
+                    match = same_name[same_name.index(current)]
+                    match._is_current = True
+                    match._is_in_shader_paths = True
+                else:
+                    current._is_in_shader_paths = False
+                    yield current
+                current = None
+                yield from same_name
             else:
-                current._is_in_shader_paths = False
-                shaders.insert(i, current)
-        return shaders
+                yield from group
+        if current is not None:
+            current._is_in_shader_paths = False
+            yield current
 
     @classmethod
     def _current(cls) -> ShaderWithMeta | None:
@@ -74,14 +104,3 @@ class ShaderWithMeta(PureShader):
         shader_with_meta = cls(shader._resolve_path())
         shader_with_meta._is_current = True
         return shader_with_meta
-
-    @staticmethod
-    def _bisect(a: list[ShaderWithMeta], x: ShaderWithMeta) -> int:
-        first_index = bisect_left(a, x.name, key=lambda s: s.name)
-        a_prime = islice(a, first_index, None)
-        for i, y in enumerate(a_prime, first_index):
-            if y.name != x.name:
-                break
-            if y == x:
-                return i
-        return first_index
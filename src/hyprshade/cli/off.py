@@ -4,9 +4,15 @@ import click
 
 from hyprshade.shader.core import Shader
 
+from .utils import all_instances_option, report_instance_results
+
 
 @click.command(short_help="Turn off screen shader")
-def off():
+@all_instances_option()
+def off(all_instances: bool):
     """Turn off screen shader."""
 
+    if all_instances:
+        report_instance_results(Shader.off_all_instances())
+        return
     Shader.off()
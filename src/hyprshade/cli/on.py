@@ -7,6 +7,8 @@ import click
 from .utils import (
     MergedVarOption,
     ShaderParamType,
+    all_instances_option,
+    report_instance_results,
     variables_option,
 )
 
@@ -17,7 +19,11 @@ if TYPE_CHECKING:
 @click.command(short_help="Turn on screen shader")
 @click.argument("shader", type=ShaderParamType())
 @variables_option()
-def on(shader: Shader, variables: MergedVarOption):
+@all_instances_option()
+def on(shader: Shader, variables: MergedVarOption, all_instances: bool):
     """Turn on screen shader."""
 
+    if all_instances:
+        report_instance_results(shader.on_all_instances(variables))
+        return
     shader.on(variables)
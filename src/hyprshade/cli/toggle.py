@@ -63,7 +63,6 @@ def toggle(
     """
 
     t = datetime.now().time()
-    config = obj.get_config()
 
     fallback_opts = [fallback, fallback_default, fallback_auto]
     if quantify(fallback_opts) > 1:
@@ -71,6 +70,9 @@ def toggle(
             "--fallback", "Must not specify more than one --fallback* option"
         )
 
+    needs_schedule = shader is None or fallback_default or fallback_auto
+    config = obj.get_config() if needs_schedule else None
+
     if config is None:
         if shader is None:
             raise_from_config_not_found(
@@ -103,11 +105,7 @@ def toggle(
         fallback_default=fallback_default,
         fallback_auto=fallback_auto,
     )
-    shader_to_toggle = get_shader_to_toggle(shader, fallback)
-    if shader_to_toggle:
-        shader_to_toggle.on(variables)
-    else:
-        Shader.off()
+    Shader.toggle(shader, fallback, variables)
 
 
 def raise_from_config_not_found(e: Exception) -> Never:
@@ -130,12 +128,3 @@ def get_fallback(
     elif fallback_auto:
         return auto
     return None
-
-
-def get_shader_to_toggle(
-    shader: Shader | None, fallback: Shader | None
-) -> Shader | None:
-    current = Shader.current()
-    if shader != current:
-        return shader
-    return fallback
@@ -16,7 +16,7 @@ import click
 from more_itertools import unique_justseen
 
 from hyprshade.config.core import Config
-from hyprshade.shader.core import Shader
+from hyprshade.shader.core import PossiblyLazy, Shader
 from hyprshade.utils.fs import ls_dirs
 from hyprshade.utils.path import stripped_basename
 
@@ -25,6 +25,8 @@ if TYPE_CHECKING:
 
     from click.decorators import FC
 
+    from hyprshade.shader import hyprctl
+
 
 T = TypeVar("T", str, int, float, bool, click.ParamType)
 
@@ -75,10 +77,11 @@ class ShaderParamType(click.ParamType):
         ctx: click.Context | None,
     ):
         obj: ContextObject | None = ctx.obj if ctx is not None else None
-        config = obj.get_config() if obj is not None else None
-        lazy_variables = (
-            config.lazy_shader_variables(value) if config is not None else None
-        )
+
+        def lazy_variables() -> dict[str, Any] | None:
+            config = obj.get_config() if obj is not None else None
+            return config.shader_variables(value) if config is not None else None
+
         return Shader(value, lazy_variables)
 
     def shell_complete(
@@ -95,7 +98,16 @@ class ShaderParamType(click.ParamType):
     @staticmethod
     def _shader_names() -> Iterator[str]:
         return unique_justseen(
-            sorted(map(stripped_basename, ls_dirs(Shader.dirs.all())))
+            sorted(
+                map(
+                    stripped_basename,
+                    ls_dirs(
+                        Shader.dirs.all(),
+                        follow_symlinks=Shader.dirs.follow_symlinks(),
+                        max_workers=Shader.dirs.scan_workers(),
+                    ),
+                )
+            )
         )
 
 
@@ -179,17 +191,51 @@ def variables_option(
     )
 
 
+def all_instances_option() -> Callable[[FC], FC]:
+    return click.option(
+        "--all-instances",
+        is_flag=True,
+        help="Apply to every running Hyprland instance instead of the current one.",
+    )
+
+
+def report_instance_results(results: list[hyprctl.InstanceResult]) -> None:
+    if not results:
+        raise click.ClickException("No running Hyprland instances found")
+    for signature, error in results:
+        if error is None:
+            click.echo(f"{signature}: ok")
+        else:
+            message = str(error) or repr(error)
+            click.echo(
+                f"{signature}: {click.style('error', fg='red')}: {message}", err=True
+            )
+    if any(error is not None for _, error in results):
+        raise click.exceptions.Exit(1)
+
+
 class ContextObject:
-    _config: Config | None
+    """Object shared by all commands of an invocation, loading the config lazily."""
+
+    _config: PossiblyLazy[Config | None]
 
-    def __init__(self, config: Config | None):
+    def __init__(self, config: PossiblyLazy[Config | None]):
         self._config = config
 
+    @staticmethod
+    def load_config() -> Config | None:
+        try:
+            return Config()
+        except FileNotFoundError:
+            return None
+
     @overload
     def get_config(self, raising: Literal[True]) -> Config: ...
     @overload
     def get_config(self, raising: bool = False) -> Config | None: ...
     def get_config(self, raising: bool = False) -> Config | None:
+        if callable(self._config):
+            self._config = self._config()
         if self._config is None and raising:
             Config.raise_not_found()
         return self._config
@@ -0,0 +1,110 @@
+"""Forwards commands to `hyprshade daemon`; imported on every run, so keep it light."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Final
+
+FORWARDED_COMMANDS: Final = frozenset({"on", "off", "toggle", "current"})
+# Options which keep a command running; the daemon only serves commands that
+# finish quickly.
+UNFORWARDED_OPTIONS: Final = frozenset({"--follow"})
+FORWARDED_ENV: Final = (
+    "HOME",
+    "HYPRSHADE_CONFIG",
+    "HYPRSHADE_FOLLOW_SYMLINKS",
+    "HYPRSHADE_SHADERS_DIR",
+    "XDG_CONFIG_HOME",
+    "XDG_STATE_HOME",
+)
+CONNECT_TIMEOUT: Final = 0.5
+RESPONSE_TIMEOUT: Final = 30.0
+
+
+def socket_path() -> str | None:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    if not runtime_dir:
+        return None
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE") or "default"
+    return os.path.join(runtime_dir, "hyprshade", f"daemon-{signature}.sock")
+
+
+def make_request(argv: list[str]) -> dict[str, Any]:
+    return {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {key: os.environ.get(key) for key in FORWARDED_ENV},
+        "color": sys.stdout.isatty() and sys.stderr.isatty(),
+    }
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a command in the daemon, or return `None` to run it in this process."""
+
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return None
+    if not UNFORWARDED_OPTIONS.isdisjoint(argv):
+        return None
+    if (path := socket_path()) is None:
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+            sock.sendall(json.dumps(make_request(argv)).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            return None
+        sock.settimeout(RESPONSE_TIMEOUT)
+        try:
+            reply = recv_all(sock)
+        except ConnectionResetError:
+            reply = b""
+        except OSError as e:
+            return no_reply(e)
+
+    # The daemon closes the connection without replying when it cannot read
+    # the request, in which case it has not run the command.
+    if not reply:
+        return None
+    try:
+        response = json.loads(reply)
+        if response.get("fallback"):
+            return None
+        stdout, stderr = response["stdout"], response["stderr"]
+        exit_code = int(response["exit_code"])
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return no_reply(e)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return exit_code
+
+
+def no_reply(e: Exception) -> int:
+    # The command may already have run, so running it again here could apply
+    # it twice (e.g. `toggle`).
+    sys.stderr.write(
+        f"Error: hyprshade daemon did not reply ({str(e) or type(e).__name__});"
+        " the command may or may not have run\n"
+    )
+    return 1
+
+
+def recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def main():  # pragma: no cover
+    if (exit_code := forward(sys.argv[1:])) is not None:
+        return exit_code
+
+    from hyprshade.cli import main
+
+    return main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from datetime import date, datetime, time
+from typing import Any, Final
+
+from hyprshade import __version__
+from hyprshade.utils.fs import FileStamp, is_racy, read_json, remove_oldest, write_json
+from hyprshade.utils.xdg import user_state_dir
+
+from .model import RootConfig
+
+VERSION: Final = 3
+DIR_NAME: Final = ".config-cache"
+# Caches for config files other than the most recently cached ones are
+# deleted when a new one is written.
+MAX_ENTRIES: Final = 16
+
+# TOML values JSON has no type for are stored as `{tag: isoformat}`.
+# `datetime` is a `date`, so it comes first.
+VALUE_TAGS: Final[dict[str, type[date | time]]] = {
+    "$datetime": datetime,
+    "$date": date,
+    "$time": time,
+}
+
+
+def read(path: str, stamp: FileStamp) -> RootConfig | None:
+    """Return the model cached for `path` by this version, if `stamp` still matches."""
+
+    data = read_json(cache_path(path), VERSION, object_hook=decode_object)
+    if (
+        data is None
+        or data.get("hyprshade_version") != __version__
+        or data.get("path") != path
+        or data.get("stamp") != list(stamp)
+        or not isinstance(raw_data := data.get("raw_data"), dict)
+    ):
+        return None
+    return RootConfig(raw_data, path=path)
+
+
+def write(path: str, stamp: FileStamp, model: RootConfig) -> None:
+    """Cache the data of `model`, which must be fully validated, for `path`."""
+
+    *_, mtime_ns = stamp
+    if is_racy(mtime_ns):
+        return
+    data = {
+        "hyprshade_version": __version__,
+        "path": path,
+        "stamp": list(stamp),
+        "raw_data": encode(model.raw_data),
+    }
+    try:
+        write_json(cache_path(path), VERSION, data)
+    except (OSError, TypeError, ValueError) as e:
+        logging.debug(f"Failed to write config cache for '{path}': {e}")
+        return
+    prune()
+
+
+def encode(value: Any) -> Any:
+    """Convert parsed TOML to JSON-compatible data that `decode_object` restores."""
+
+    if isinstance(value, dict):
+        # TOML has no null, so `None` values are defaults that the model
+        # filled in, and fills in again.
+        table = {k: encode(v) for k, v in value.items() if v is not None}
+        if len(table) == 1 and (key := next(iter(table))).startswith("$"):
+            # Escape tables that would decode as a tagged value.
+            return {f"${key}": table[key]}
+        return table
+    if isinstance(value, list):
+        return [encode(v) for v in value]
+    for tag, value_type in VALUE_TAGS.items():
+        if isinstance(value, value_type):
+            return {tag: value.isoformat()}
+    return value
+
+
+def decode_object(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        [(key, value)] = obj.items()
+        if key in VALUE_TAGS and isinstance(value, str):
+            return VALUE_TAGS[key].fromisoformat(value)
+        if key.startswith("$$"):
+            return {key[1:]: value}
+    return obj
+
+
+def prune() -> None:
+    directory = os.path.join(user_state_dir("hyprshade"), DIR_NAME)
+    try:
+        with os.scandir(directory) as it:
+            # Temporary files of concurrent writers start with a dot.
+            paths = [entry.path for entry in it if not entry.name.startswith(".")]
+    except OSError:
+        return
+    remove_oldest(paths, keep=MAX_ENTRIES)
+
+
+def cache_path(path: str) -> str:
+    key = hashlib.sha256(os.fsencode(path)).hexdigest()[:16]
+    return os.path.join(user_state_dir("hyprshade"), DIR_NAME, f"{key}.json")
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import os
-import tomllib
 from typing import TYPE_CHECKING, Any, Never
 
 from more_itertools import first_true
 
+from hyprshade.utils import trace
+from hyprshade.utils.path import stripped_basename
 from hyprshade.utils.xdg import user_config_dir
 
-from .model import RootConfig, ShaderConfig
+from .model import ConfigError, RootConfig, ShaderConfig
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
 
 class Config:
@@ -21,18 +22,25 @@ class Config:
         path = path or Config._get_path()
         if path is None:
             self.raise_not_found()
-        self.model = RootConfig(Config._load(path), path=path)
+        self.model = Config._load_model(path)
 
     def shader_config(self, name_or_path: str) -> ShaderConfig | None:
-        from hyprshade.shader.core import Shader
-
-        name = Shader.path_to_name(name_or_path)
-        return first_true(self.model.shaders, pred=lambda s: s.name == name)
+        return self.model.shaders_by_name.get(stripped_basename(name_or_path))
 
     def shader_variables(self, name_or_path: str) -> dict[str, Any] | None:
         shader_config = self.shader_config(name_or_path)
         return shader_config.config if shader_config else None
 
+    def shader_variables_many(
+        self, names_or_paths: Iterable[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        shaders_by_name = self.model.shaders_by_name
+        result = {}
+        for name_or_path in names_or_paths:
+            shader_config = shaders_by_name.get(stripped_basename(name_or_path))
+            result[name_or_path] = shader_config.config if shader_config else None
+        return result
+
     def lazy_shader_variables(
         self, name_or_path: str
     ) -> Callable[[], dict[str, Any] | None]:
@@ -44,9 +52,33 @@ class Config:
             "Could not find a config file; see https://github.com/loqusion/hyprshade#scheduling"
         )
 
+    @staticmethod
+    def _load_model(path: str) -> RootConfig:
+        """Load the config at `path` through the cache, caching it only if valid."""
+
+        from hyprshade.utils.fs import file_stamp
+
+        from . import cache
+
+        with trace.span("config.load", path=path):
+            stamp = file_stamp(path)
+            if (model := cache.read(path, stamp)) is not None:
+                return model
+
+            model = RootConfig(Config._load(path), path=path)
+            try:
+                with trace.span("config.validate"):
+                    model.parse_fields()
+            except ConfigError:
+                return model
+            cache.write(path, stamp, model)
+            return model
+
     @staticmethod
     def _load(path: str) -> dict:
-        with open(path, "rb") as f:
+        import tomllib
+
+        with trace.span("config.parse"), open(path, "rb") as f:
             return tomllib.load(f)
 
     @staticmethod
@@ -58,6 +58,18 @@ class RootConfig(LazyConfig):
         super().__init__(*args, **kwargs)
 
         self._field_shaders = MISSING
+        self._shaders_by_name: dict[str, ShaderConfig] | None = None
+
+    @property
+    def shaders_by_name(self) -> dict[str, ShaderConfig]:
+        """The first entry of `shaders` with each name."""
+
+        if self._shaders_by_name is None:
+            shaders_by_name: dict[str, ShaderConfig] = {}
+            for shader in self.shaders:
+                shaders_by_name.setdefault(shader.name, shader)
+            self._shaders_by_name = shaders_by_name
+        return self._shaders_by_name
 
     @property
     def shaders(self) -> list[ShaderConfig]:
@@ -1,35 +1,74 @@
 from __future__ import annotations
 
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
+from datetime import time
+from functools import cached_property
 from itertools import chain, pairwise
-from typing import TYPE_CHECKING, Any, TypeGuard
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, TypeGuard
 
 from more_itertools import only
 
 from hyprshade.shader.core import Shader
-from hyprshade.utils.time import is_time_between
+from hyprshade.utils import trace
 
 from .model import ShaderConfig
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
-    from datetime import time
 
     from .core import Config
 
+MICROSECONDS_PER_DAY: Final = 24 * 60 * 60 * 1_000_000
+
+
+class ScheduleSlot(NamedTuple):
+    shader: Shader | None
+    """Shader scheduled at the queried time, or `None` for no shader."""
+
+    until: time | None
+    """Next time of day at which the scheduled shader changes, or `None` if
+    it never does. It may be earlier than the queried time, meaning the change
+    happens the next day."""
+
 
 class Schedule:
+    """Shaders scheduled by time of day, precomputed into a table of segments."""
+
     config: Config
 
     def __init__(self, config: Config):
         self.config = config
 
     def scheduled_shader(self, t: time) -> Shader | None:
-        for entry in self._resolved_entries():
-            if is_time_between(t, entry.start_time, entry.end_time):
-                return Shader(entry.name, self.config.lazy_shader_variables(entry.name))
-
-        return self.default_shader
+        return self.slot_at(t).shader
+
+    def slot_at(self, t: time) -> ScheduleSlot:
+        """Return the shader scheduled at `t` and when that changes next."""
+
+        with trace.span("schedule.slot_at", time=t.isoformat()):
+            starts, entries = self._table
+            i = bisect_right(starts, _to_microseconds(t)) - 1
+        entry = entries[i]
+        shader = (
+            Shader(entry.name, self.config.lazy_shader_variables(entry.name))
+            if entry is not None
+            else self.default_shader
+        )
+
+        if i + 1 < len(starts):
+            until: int | None = starts[i + 1]
+        elif len(starts) == 1:
+            until = None
+        else:
+            # Segments are merged, so only the last and first segment, which
+            # are adjacent across midnight, may schedule the same entry.
+            until = starts[1] if entries[0] is entry else starts[0]
+        return ScheduleSlot(
+            shader, _from_microseconds(until) if until is not None else None
+        )
 
     def event_times(self) -> Iterator[time]:
         yielded: set[time] = set()
@@ -48,6 +87,49 @@ class Schedule:
             return None
         return Shader(default.name, self.config.lazy_shader_variables(default.name))
 
+    @cached_property
+    def _table(self) -> tuple[list[int], list[ResolvedEntry | None]]:
+        """Segment start times, in microseconds, and the entry scheduled for each."""
+
+        starts_at: defaultdict[int, list[int]] = defaultdict(list)
+        ends_at: defaultdict[int, list[int]] = defaultdict(list)
+        entries = list(self._resolved_entries())
+        for i, entry in enumerate(entries):
+            start = _to_microseconds(entry.start_time)
+            end = _to_microseconds(entry.end_time)
+            if start < end:
+                intervals = [(start, end)]
+            elif end < start:
+                intervals = [(start, MICROSECONDS_PER_DAY), (0, end)]
+            else:
+                # An entry without `end_time` only ends where it starts when
+                # no entry starts at another time, so it lasts all day.
+                intervals = [(0, MICROSECONDS_PER_DAY)]
+            for a, b in intervals:
+                if a == b:
+                    continue
+                starts_at[a].append(i)
+                ends_at[b].append(i)
+
+        starts: list[int] = []
+        scheduled: list[ResolvedEntry | None] = []
+        active: list[int] = []
+        is_active: defaultdict[int, bool] = defaultdict(bool)
+        for boundary in sorted({0, *starts_at, *ends_at} - {MICROSECONDS_PER_DAY}):
+            for i in ends_at.get(boundary, []):
+                is_active[i] = False
+            for i in starts_at.get(boundary, []):
+                is_active[i] = True
+                heapq.heappush(active, i)
+            while active and not is_active[active[0]]:
+                heapq.heappop(active)
+
+            active_entry = entries[active[0]] if active else None
+            if not scheduled or scheduled[-1] is not active_entry:
+                starts.append(boundary)
+                scheduled.append(active_entry)
+        return starts, scheduled
+
     def _resolved_entries(self) -> Iterator[ResolvedEntry]:
         if not (entries := self._entries()):
             return
@@ -60,6 +142,10 @@ class Schedule:
             )
 
     def _entries(self) -> list[ScheduledShaderConfig]:
+        return list(self._sorted_entries)
+
+    @cached_property
+    def _sorted_entries(self) -> list[ScheduledShaderConfig]:
         def has_schedule(
             shader_config: ShaderConfig,
         ) -> TypeGuard[ScheduledShaderConfig]:
@@ -79,3 +165,14 @@ class ResolvedEntry:
     start_time: time
     end_time: time
     config: dict[str, Any] | None
+
+
+def _to_microseconds(t: time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+def _from_microseconds(microseconds: int) -> time:
+    seconds, microsecond = divmod(microseconds, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
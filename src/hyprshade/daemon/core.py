@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Final
+
+from hyprshade import client
+from hyprshade.cli.utils import ContextObject
+from hyprshade.config.core import Config
+from hyprshade.config.schedule import Schedule
+from hyprshade.shader.core import Shader
+from hyprshade.utils import inotify
+from hyprshade.utils.fs import FileStamp, file_stamp
+
+from .server import CommandServer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Daemon:
+    """Resident process applying the schedule and serving forwarded commands."""
+
+    # Waits use the monotonic clock, which stops during suspend and ignores
+    # wall-clock changes, so the deadline is re-checked at least this often.
+    MAX_WAIT: Final = 30.0
+
+    WATCH_MASK: Final = (
+        inotify.IN_CLOSE_WRITE
+        | inotify.IN_MOVED_TO
+        | inotify.IN_MOVED_FROM
+        | inotify.IN_CREATE
+        | inotify.IN_DELETE
+    )
+
+    config: Config
+    schedule: Schedule
+    selector: selectors.BaseSelector
+
+    _now: Callable[[], datetime]
+    _config_stamp: FileStamp | None
+    _deadline: datetime | None
+    _watcher: inotify.Inotify | None
+    _server: CommandServer | None
+
+    def __init__(self, config: Config, *, now: Callable[[], datetime] = datetime.now):
+        self._now = now
+        self.selector = selectors.DefaultSelector()
+        self._watcher = None
+        self._server = None
+        self._set_config(config)
+        self._deadline = None
+
+    def __enter__(self) -> Daemon:
+        self._watch_config()
+        self._serve()
+        self.apply()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.selector.close()
+        if self._watcher is not None:
+            self._watcher.close()
+        if self._server is not None:
+            self._server.close()
+
+    @property
+    def config_path(self) -> str:
+        return self.config.model.path
+
+    @property
+    def deadline(self) -> datetime | None:
+        return self._deadline
+
+    def run(self) -> None:
+        with self:
+            while True:
+                self.poll()
+
+    def poll(self, timeout: float | None = None) -> None:
+        wait = self._seconds_until_deadline()
+        if wait is not None:
+            wait = min(wait, self.MAX_WAIT)
+        if timeout is not None:
+            wait = timeout if wait is None else min(wait, timeout)
+        for key, _ in self.selector.select(wait):
+            key.data()
+
+        if self._deadline is not None and self._now() >= self._deadline:
+            # Watching misses changes, e.g. once a symlinked config is pointed
+            # at a file in another directory, so the config is checked here too.
+            self.reload_if_changed()
+            self.apply()
+
+    def apply(self) -> None:
+        now = self._now()
+        slot = self.schedule.slot_at(now.time())
+        logging.debug(f"Applying scheduled shader '{slot.shader}' at {now}")
+        try:
+            if slot.shader:
+                slot.shader.on()
+            else:
+                Shader.off()
+        except Exception as e:
+            logging.error(f"Failed to apply scheduled shader '{slot.shader}': {e}")
+        self._deadline = _next_datetime(now, slot.until)
+
+    def reload_if_changed(self) -> bool:
+        if _file_stamp(self.config_path) == self._config_stamp:
+            return False
+        try:
+            config = Config(self.config_path)
+        except Exception as e:
+            logging.error(f"Failed to reload config from '{self.config_path}': {e}")
+            return False
+        logging.debug(f"Reloaded config from '{self.config_path}'")
+        self._set_config(config)
+        return True
+
+    def _set_config(self, config: Config) -> None:
+        self.config = config
+        self.schedule = Schedule(config)
+        self._config_stamp = _file_stamp(config.model.path)
+
+    def _config_paths(self) -> set[str]:
+        """The config path, and the file it links to if it is a symlink."""
+
+        return {self.config_path, os.path.realpath(self.config_path)}
+
+    def _watch_config(self) -> None:
+        try:
+            watcher = inotify.Inotify()
+            for directory in {os.path.dirname(p) for p in self._config_paths()}:
+                watcher.add_watch(directory, self.WATCH_MASK)
+        except OSError as e:
+            logging.warning(
+                f"Cannot watch config file, changes are applied on schedule: {e}"
+            )
+            return
+        self._watcher = watcher
+        self.selector.register(watcher, selectors.EVENT_READ, self._on_config_event)
+
+    def _serve(self) -> None:
+        if (path := client.socket_path()) is None:
+            logging.warning("XDG_RUNTIME_DIR is not set, not serving commands")
+            return
+        self._server = CommandServer(path)
+        self.selector.register(self._server, selectors.EVENT_READ, self._on_command)
+
+    def _on_command(self) -> None:
+        assert self._server is not None
+        self._server.handle(ContextObject(self.config))
+
+    def _on_config_event(self) -> None:
+        assert self._watcher is not None
+        names = {os.path.basename(p) for p in self._config_paths()}
+        events = self._watcher.read()
+        if any(e.name in names for e in events) and self.reload_if_changed():
+            self.apply()
+
+    def _seconds_until_deadline(self) -> float | None:
+        if self._deadline is None:
+            return None
+        return max(0.0, (self._deadline - self._now()).total_seconds())
+
+
+def _next_datetime(now: datetime, t: time | None) -> datetime | None:
+    if t is None:
+        return None
+    if t > now.time():
+        return datetime.combine(now.date(), t)
+    return datetime.combine(now.date() + timedelta(days=1), t)
+
+
+def _file_stamp(path: str) -> FileStamp | None:
+    try:
+        return file_stamp(path)
+    except OSError:
+        return None
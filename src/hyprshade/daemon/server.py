@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import socket
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from typing import TYPE_CHECKING, Any, Final
+
+from hyprshade import client
+
+if TYPE_CHECKING:
+    from hyprshade.cli.utils import ContextObject
+
+
+class CommandServer:
+    """UNIX socket server running commands forwarded by `hyprshade.client`."""
+
+    REQUEST_TIMEOUT: Final = 1.0
+
+    path: str
+    sock: socket.socket
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sock = self._bind(path)
+
+    def close(self) -> None:
+        self.sock.close()
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def handle(self, obj: ContextObject) -> None:
+        conn, _ = self.sock.accept()
+        with conn:
+            conn.settimeout(self.REQUEST_TIMEOUT)
+            try:
+                request = json.loads(client.recv_all(conn))
+                response = self.respond(request, obj)
+                conn.sendall(json.dumps(response).encode("utf-8"))
+            except (OSError, ValueError) as e:
+                logging.warning(f"Failed to handle forwarded command: {e}")
+
+    def respond(self, request: dict[str, Any], obj: ContextObject) -> dict[str, Any]:
+        env = {key: os.environ.get(key) for key in client.FORWARDED_ENV}
+        if request.get("env") != env or not os.path.isdir(request.get("cwd", "")):
+            return {"fallback": True}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(request["cwd"])
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code = run_command(
+                    request["argv"], obj=obj, color=bool(request.get("color"))
+                )
+        finally:
+            os.chdir(old_cwd)
+
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    @staticmethod
+    def _bind(path: str) -> socket.socket:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except ConnectionRefusedError:
+                    os.unlink(path)
+                else:
+                    raise RuntimeError(f"A daemon is already listening at '{path}'")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(path)
+            sock.listen()
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+
+def run_command(argv: list[str], *, obj: ContextObject, color: bool) -> int:
+    import click
+
+    from hyprshade.cli import cli, report_exception
+
+    try:
+        result = cli.main(
+            argv,
+            prog_name="hyprshade",
+            standalone_mode=False,
+            obj=obj,
+            color=color,
+        )
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception as e:
+        logging.debug(f"Forwarded command {argv!r} failed", exc_info=True)
+        return report_exception(e)
+    return result if isinstance(result, int) else 0
@@ -1,34 +1,40 @@
 from __future__ import annotations
 
+import io
 import logging
 import os
-from collections.abc import Callable
+from collections.abc import Callable, Generator
+from contextlib import suppress
 from dataclasses import KW_ONLY, asdict, dataclass
 from functools import cached_property
 from typing import Any, ClassVar, Final, TextIO, TypeAlias, TypeVar
 
-from more_itertools import flatten
-
+from hyprshade import __version__
 from hyprshade.template import mustache
 from hyprshade.template.constants import TEMPLATE_EXTENSIONS
+from hyprshade.utils import trace
 from hyprshade.utils.dictionary import deep_merge
-from hyprshade.utils.fs import scandir_recursive
-from hyprshade.utils.path import strip_all_extensions, stripped_basename
+from hyprshade.utils.fs import remove_oldest, write_file_atomic
+from hyprshade.utils.path import stripped_basename
 from hyprshade.utils.xdg import user_state_dir
 
 from . import hyprctl
 from .dirs import ShaderDirs
+from .index import ShaderIndex
+from .instances import InstanceEntry, InstanceIndex
 
 T = TypeVar("T")
 PossiblyLazy: TypeAlias = T | Callable[[], T]
 
 ShaderVariables = dict[str, Any]
+FileId = tuple[int, int]
 
 
 class PureShader:
     _name: str
     _given_path: str | None
     _template_instance_path: str | None
+    _identity: tuple[str, FileId] | None
 
     def __init__(
         self, shader_name_or_path: str, *, template_instance_path: str | None = None
@@ -44,15 +50,15 @@ class PureShader:
             self._name = shader_name_or_path
             self._given_path = None
         self._template_instance_path = template_instance_path
+        self._identity = None
 
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, PureShader):
             return False
         try:
-            s1, s2 = self._resolve_path(), __value._resolve_path()
+            return self._resolve_identity()[1] == __value._resolve_identity()[1]
         except FileNotFoundError:
             return False
-        return os.path.samefile(s1, s2)
 
     def __str__(self) -> str:
         return self._name
@@ -75,19 +81,36 @@ class PureShader:
     def path_to_name(path: str) -> str:
         return stripped_basename(path)
 
+    def invalidate(self) -> None:
+        """Forget the resolved path and file identity, so they are resolved again."""
+
+        self._identity = None
+
     def _resolve_path(self) -> str:
-        if self._given_path:
-            if not os.path.exists(self._given_path):
-                raise FileNotFoundError(f"No file found at '{self._given_path}'")
-            return self._given_path
-        return self._resolve_path_from_shader_dirs()
+        return self._resolve_identity()[0]
+
+    def _resolve_identity(self) -> tuple[str, FileId]:
+        if self._identity is None:
+            with trace.span("resolve_path", shader=self._name):
+                path = self._given_path or self._resolve_path_from_shader_dirs()
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError as e:
+                    if self._given_path:
+                        raise FileNotFoundError(f"No file found at '{path}'") from e
+                    raise
+            self._identity = (path, (st.st_dev, st.st_ino))
+        return self._identity
 
     def _resolve_path_from_shader_dirs(self) -> str:
         dirs = Shader.dirs.all()
-        all_files = flatten(scandir_recursive(d, max_depth=5) for d in dirs)
-        for file in all_files:
-            if strip_all_extensions(file.name) == self._name:
-                return file.path
+        index = ShaderIndex.load(
+            dirs,
+            follow_symlinks=Shader.dirs.follow_symlinks(),
+            max_workers=Shader.dirs.scan_workers(),
+        )
+        if (path := index.lookup(self._name)) is not None:
+            return path
 
         raise FileNotFoundError(
             f"Shader '{self._name}' could not be found in any of the following"
@@ -101,6 +124,12 @@ class Shader(PureShader):
     _variables: PossiblyLazy[ShaderVariables | None]
 
     TEMPLATE_METADATA_PREFIX: Final = "// META:"
+    TEMPLATE_INSTANCE_KEY_LENGTH: Final = 16
+    # Instances of a template beyond the most recently used ones are deleted
+    # when a new one is rendered, unless they were used less than this many
+    # seconds ago or are the current screen shader.
+    TEMPLATE_INSTANCES_KEPT: Final = 8
+    TEMPLATE_INSTANCE_MIN_AGE: Final = 24 * 60 * 60
 
     def __init__(
         self,
@@ -115,31 +144,66 @@ class Shader(PureShader):
         self._variables = variables
 
     def on(self, extra_variables: ShaderVariables | None = None) -> None:
-        source_path = self._resolve_path()
-        _, source_path_extension = os.path.splitext(os.path.basename(source_path))
-        if source_path_extension.strip(".") in TEMPLATE_EXTENSIONS:
-            rendered_path = self._render_template(source_path, extra_variables)
-        else:
-            rendered_path = source_path
+        rendered_path = self._rendered_path(extra_variables)
         logging.debug(f"Turning on shader '{self._name}' at '{rendered_path}'")
         hyprctl.set_screen_shader(rendered_path)
 
+    def on_all_instances(
+        self, extra_variables: ShaderVariables | None = None
+    ) -> list[hyprctl.InstanceResult]:
+        """Turn on the shader in every running Hyprland instance, rendering it once."""
+
+        rendered_path = self._rendered_path(extra_variables)
+        logging.debug(
+            f"Turning on shader '{self._name}' at '{rendered_path}' in all instances"
+        )
+        return hyprctl.set_screen_shader_all_instances(rendered_path)
+
     @staticmethod
     def off() -> None:
         hyprctl.clear_screen_shader()
 
+    @staticmethod
+    def off_all_instances() -> list[hyprctl.InstanceResult]:
+        return hyprctl.set_screen_shader_all_instances(None)
+
+    @staticmethod
+    def toggle(
+        shader: Shader | None,
+        fallback: Shader | None,
+        extra_variables: ShaderVariables | None = None,
+    ) -> None:
+        """Turn on `shader`, or `fallback` (`None` for off) if `shader` is current."""
+
+        # Hyprland has no conditional requests, so doing this in one batch would
+        # mean setting `shader` speculatively and recompiling it when current.
+        previous = Shader.current()
+        if shader != previous:
+            target = shader
+        elif fallback is None:
+            target = None
+        else:
+            target = fallback
+        logging.debug(f"Toggling screen shader to '{target}'")
+        if target is None:
+            Shader.off()
+        else:
+            target.on(extra_variables)
+
     @staticmethod
     def current() -> PureShader | None:
-        path = hyprctl.get_screen_shader()
-        if path is not None and (
-            os.path.commonpath([path, user_state_dir("hyprshade")])
-            == user_state_dir("hyprshade")
-        ):
-            return PureShader(
-                Shader._extract_template_instance_metadata(path).source,
-                template_instance_path=path,
-            )
-        return None if path is None else PureShader(path)
+        return Shader._from_screen_shader_path(hyprctl.get_screen_shader())
+
+    @staticmethod
+    def watch(
+        interval: float = hyprctl.WATCH_INTERVAL,
+    ) -> Generator[PureShader | None, None, None]:
+        paths = hyprctl.watch_screen_shader(interval)
+        try:
+            for path in paths:
+                yield Shader._from_screen_shader_path(path)
+        finally:
+            paths.close()
 
     @cached_property
     def variables(self) -> ShaderVariables | None:
@@ -147,27 +211,132 @@ class Shader(PureShader):
             return self._variables()
         return self._variables
 
+    def _rendered_path(self, extra_variables: ShaderVariables | None = None) -> str:
+        source_path = self._resolve_path()
+        _, source_path_extension = os.path.splitext(os.path.basename(source_path))
+        if source_path_extension.strip(".") in TEMPLATE_EXTENSIONS:
+            return self._render_template(source_path, extra_variables)
+        return source_path
+
+    @staticmethod
+    def _from_screen_shader_path(path: str | None) -> PureShader | None:
+        if path is not None and (
+            os.path.commonpath([path, user_state_dir("hyprshade")])
+            == user_state_dir("hyprshade")
+        ):
+            if (entry := InstanceIndex.load().lookup(path)) is not None:
+                return PureShader(entry.source, template_instance_path=path)
+            source = Shader._extract_template_instance_metadata(path).source
+            InstanceIndex.record(
+                path,
+                InstanceEntry(source, PureShader.path_to_name(source), variables=None),
+            )
+            return PureShader(source, template_instance_path=path)
+        return None if path is None else PureShader(path)
+
     def _render_template(
         self, path: str, extra_variables: ShaderVariables | None = None
     ) -> str:
-        with open(path) as f:
-            variables = deep_merge({}, self.variables or {}, extra_variables or {})
-            content = mustache.render(f, variables)
+        with open(path, "rb") as f:
+            source = f.read()
+        variables = deep_merge({}, self.variables or {}, extra_variables or {})
+        out_path = Shader._template_instance_path_from_source_path(
+            path, Shader._template_instance_key(path, source, variables)
+        )
+        entry = InstanceEntry(
+            path,
+            PureShader.path_to_name(path),
+            variables=Shader._variables_hash(variables),
+        )
+        if os.path.exists(out_path):
+            logging.debug(f"Reusing template instance at '{out_path}'")
+            InstanceIndex.record(out_path, entry)
+            return out_path
+
+        content = mustache.render(source.decode("utf-8"), variables)
         metadata = TemplateInstanceMetadata(source=path)
-        out_path = Shader._template_instance_path_from_source_path(path)
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        with open(out_path, "w") as f:
+        with io.StringIO() as f:
             Shader._write_template_instance_metadata(f, metadata)
             f.write("// This file was generated by Hyprshade.\n")
             f.write("// Do not edit it directly.\n")
             f.write("\n")
             f.write(content)
+            data = f.getvalue().encode("utf-8")
+        # Instances are reused above, so the file only exists here if another
+        # process rendered it concurrently; skip_identical then leaves its
+        # mtime alone instead of replacing it with the same content.
+        with trace.span("write_template_instance", path=out_path):
+            written = write_file_atomic(out_path, data, skip_identical=True)
+        if written:
+            Shader._prune_template_instances(out_path)
+        else:
+            logging.debug(f"Template instance at '{out_path}' is up to date")
+        InstanceIndex.record(out_path, entry)
         return out_path
 
     @staticmethod
-    def _template_instance_path_from_source_path(path: str) -> str:
+    def _template_instance_key(
+        path: str, source: bytes, variables: ShaderVariables
+    ) -> str:
+        """Hash of everything the instance of template `path` depends on."""
+
+        return Shader._hash(
+            __version__.encode("utf-8"),
+            path.encode("utf-8"),
+            source,
+            Shader._encode_variables(variables),
+        )
+
+    @staticmethod
+    def _variables_hash(variables: ShaderVariables) -> str:
+        return Shader._hash(Shader._encode_variables(variables))
+
+    @staticmethod
+    def _encode_variables(variables: ShaderVariables) -> bytes:
+        import json
+
+        return json.dumps(variables, sort_keys=True, default=str).encode("utf-8")
+
+    @staticmethod
+    def _hash(*parts: bytes) -> str:
+        import hashlib
+
+        digest = hashlib.sha256(b"\0".join(parts)).hexdigest()
+        return digest[: Shader.TEMPLATE_INSTANCE_KEY_LENGTH]
+
+    @staticmethod
+    def _prune_template_instances(instance_path: str) -> None:
+        """Delete unused instances of templates sharing the name of `instance_path`."""
+
+        import re
+
+        directory, file_name = os.path.split(instance_path)
+        stem_and_key, extension = os.path.splitext(file_name)
+        stem, _ = os.path.splitext(stem_and_key)
+        pattern = re.compile(
+            rf"{re.escape(stem)}\.[0-9a-f]{{{Shader.TEMPLATE_INSTANCE_KEY_LENGTH}}}"
+            + re.escape(extension)
+        )
+        try:
+            with os.scandir(directory) as it:
+                paths = [entry.path for entry in it if pattern.fullmatch(entry.name)]
+        except OSError:
+            return
+        current = None
+        with suppress(hyprctl.HyprctlError, hyprctl.HyprctlJSONError, OSError):
+            current = hyprctl.get_screen_shader()
+        remove_oldest(
+            [p for p in paths if p != current],
+            keep=Shader.TEMPLATE_INSTANCES_KEPT,
+            min_age=Shader.TEMPLATE_INSTANCE_MIN_AGE,
+            last_used=InstanceIndex.load().last_used(),
+        )
+
+    @staticmethod
+    def _template_instance_path_from_source_path(path: str, key: str) -> str:
         file_name, _ = os.path.splitext(os.path.basename(path))
-        return os.path.join(user_state_dir("hyprshade"), file_name)
+        stem, extension = os.path.splitext(file_name)
+        return os.path.join(user_state_dir("hyprshade"), f"{stem}.{key}{extension}")
 
     @staticmethod
     def _write_template_instance_metadata(
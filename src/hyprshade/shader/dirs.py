@@ -10,6 +10,9 @@ from hyprshade.utils.xdg import user_config_dir
 
 class ShaderDirs:
     ENV_VAR_NAME: Final = "HYPRSHADE_SHADERS_DIR"
+    FOLLOW_SYMLINKS_ENV_VAR_NAME: Final = "HYPRSHADE_FOLLOW_SYMLINKS"
+    SCAN_WORKERS_ENV_VAR_NAME: Final = "HYPRSHADE_SCAN_WORKERS"
+    DEFAULT_SCAN_WORKERS: Final = 1
     SYSTEM_DIR: Final = "/usr/share/hyprshade/shaders"
 
     @staticmethod
@@ -36,6 +39,23 @@ class ShaderDirs:
             default=ShaderDirs.SYSTEM_DIR,
         )
 
+    @staticmethod
+    def follow_symlinks() -> bool:
+        """Whether to walk directory symlinks; off if `HYPRSHADE_FOLLOW_SYMLINKS=0`."""
+
+        value = os.environ.get(ShaderDirs.FOLLOW_SYMLINKS_ENV_VAR_NAME, "")
+        return value.strip().lower() not in ("0", "false", "no", "off")
+
+    @staticmethod
+    def scan_workers() -> int:
+        """How many shader dirs are scanned at once, set by `HYPRSHADE_SCAN_WORKERS`."""
+
+        value = os.environ.get(ShaderDirs.SCAN_WORKERS_ENV_VAR_NAME, "").strip()
+        try:
+            return max(1, int(value)) if value else ShaderDirs.DEFAULT_SCAN_WORKERS
+        except ValueError:
+            return ShaderDirs.DEFAULT_SCAN_WORKERS
+
     @staticmethod
     def all() -> list[str]:
         return [
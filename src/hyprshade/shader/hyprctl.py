@@ -1,14 +1,30 @@
 from __future__ import annotations
 
 import json
+import logging
 import subprocess
 import textwrap
+import time
 from json import JSONDecodeError
-from typing import Final
+from typing import TYPE_CHECKING, Final, NamedTuple
 
 import click
 
+from hyprshade.utils import trace
+from hyprshade.utils.threads import map_threaded
+
+from . import ipc, recording
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+    from hyprshade.utils.threads import Result
+
 EMPTY_STR: Final = "[[EMPTY]]"
+# Setting an option with `keyword` emits no event, so watching also polls.
+WATCH_EVENTS: Final = frozenset({"configreloaded", "custom"})
+WATCH_INTERVAL: Final = 1.0
+MAX_INSTANCE_WORKERS: Final = 8
 
 
 class HyprctlError(Exception):
@@ -54,33 +70,120 @@ def hyprctl_error_context(*, command: str, stdout: str, stderr: str) -> str:
 {textwrap.indent(stderr, " " * 4)}""".strip()
 
 
+def hyprctl(
+    *args: str, signature: str | None = None
+) -> subprocess.CompletedProcess[str]:
+    """Run a hyprctl command unchecked, over the request socket when possible."""
+
+    with trace.span("hyprctl", args=" ".join(args), signature=signature):
+        return recording.run(_send, args, signature)
+
+
+def _send(
+    args: Sequence[str], signature: str | None
+) -> subprocess.CompletedProcess[str]:
+    command = ["hyprctl", *args]
+    if (path := ipc.socket_path(signature)) is not None:
+        try:
+            return ipc.run(command, path)
+        except OSError as e:
+            logging.debug(f"Hyprland socket request failed, using hyprctl: {e}")
+    if signature is not None:
+        command = ["hyprctl", "--instance", signature, *args]
+    return subprocess.run(command, capture_output=True, encoding="utf-8")
+
+
+GET_SCREEN_SHADER_ARGS: Final = ["-j", "getoption", "decoration:screen_shader"]
+
+
+def _set_screen_shader_args(shader_path: str | None) -> list[str]:
+    return ["keyword", "decoration:screen_shader", shader_path or EMPTY_STR]
+
+
 def set_screen_shader(shader_path: str) -> None:
-    try:
-        subprocess.run(
-            ["hyprctl", "keyword", "decoration:screen_shader", shader_path],
-            capture_output=True,
-            check=True,
-            encoding="utf-8",
-        )
-    except subprocess.CalledProcessError as e:
-        raise HyprctlError(e) from e
+    _check(hyprctl(*_set_screen_shader_args(shader_path)))
 
 
 def clear_screen_shader() -> None:
     set_screen_shader(EMPTY_STR)
 
 
+class InstanceResult(NamedTuple):
+    signature: str
+    error: Exception | None
+
+
+def set_screen_shader_all_instances(shader_path: str | None) -> list[InstanceResult]:
+    """Set the screen shader of every running Hyprland instance concurrently."""
+
+    signatures = ipc.instance_signatures()
+    args = _set_screen_shader_args(shader_path)
+    results = map_threaded(
+        lambda signature: _check(hyprctl(*args, signature=signature)),
+        signatures,
+        MAX_INSTANCE_WORKERS,
+    )
+    return [
+        InstanceResult(signature, _exception(result))
+        for signature, result in zip(signatures, results, strict=True)
+    ]
+
+
+def _exception(result: Result[None]) -> Exception | None:
+    try:
+        result.result()
+    except Exception as e:
+        return e
+    return None
+
+
 def get_screen_shader() -> str | None:
+    return _parse_screen_shader(hyprctl(*GET_SCREEN_SHADER_ARGS))
+
+
+def watch_screen_shader(
+    interval: float = WATCH_INTERVAL,
+) -> Generator[str | None, None, None]:
+    """Yield the screen shader, then again on each change until Hyprland exits."""
+
     try:
-        hyprctl_pipe = subprocess.run(
-            ["hyprctl", "-j", "getoption", "decoration:screen_shader"],
-            capture_output=True,
-            check=True,
-            encoding="utf-8",
-        )
-        shader_json = json.loads(hyprctl_pipe.stdout)
+        path = ipc.event_socket_path()
+        events = ipc.EventSocket(path) if path is not None else None
+    except OSError as e:
+        logging.debug(f"Cannot connect to Hyprland event socket, polling: {e}")
+        events = None
+
+    try:
+        previous = current = get_screen_shader()
+        yield current
+        while True:
+            if events is None:
+                time.sleep(interval)
+            else:
+                try:
+                    events.wait(WATCH_EVENTS, interval)
+                except EOFError:
+                    return
+            current = get_screen_shader()
+            if current != previous:
+                previous = current
+                yield current
+    finally:
+        if events is not None:
+            events.close()
+
+
+def _check(result: subprocess.CompletedProcess[str]) -> None:
+    try:
+        result.check_returncode()
     except subprocess.CalledProcessError as e:
         raise HyprctlError(e) from e
+
+
+def _parse_screen_shader(hyprctl_pipe: subprocess.CompletedProcess[str]) -> str | None:
+    _check(hyprctl_pipe)
+    try:
+        shader_json = json.loads(hyprctl_pipe.stdout)
     except JSONDecodeError as e:
         raise HyprctlJSONError(
             "hyprctl returned invalid JSON.", completed_process=hyprctl_pipe
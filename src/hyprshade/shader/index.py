@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, ClassVar, Final
+
+from hyprshade.utils.fs import is_racy, read_json, scandir_forest, write_json
+from hyprshade.utils.path import strip_all_extensions
+from hyprshade.utils.xdg import user_state_dir
+
+DirectoryStamp = tuple[str, int, int, int]
+
+
+class ShaderIndex:
+    """Shader name to path mapping, valid while the walked directories are unchanged."""
+
+    VERSION: Final = 2
+    MAX_DEPTH: Final = 5
+    FILE_NAME: Final = ".shader-index.json"
+
+    roots: list[str]
+    follow_symlinks: bool
+    stamps: list[DirectoryStamp]
+    names: dict[str, str]
+
+    # Index last loaded by this process, keyed by its path, so that resident
+    # processes only need to check the stamps.
+    _loaded: ClassVar[tuple[str, ShaderIndex] | None] = None
+
+    def __init__(
+        self,
+        roots: list[str],
+        stamps: list[DirectoryStamp],
+        names: dict[str, str],
+        *,
+        follow_symlinks: bool = True,
+    ):
+        self.roots = roots
+        self.follow_symlinks = follow_symlinks
+        self.stamps = stamps
+        self.names = names
+
+    def lookup(self, name: str) -> str | None:
+        return self.names.get(name)
+
+    @classmethod
+    def load(
+        cls, roots: list[str], *, follow_symlinks: bool = True, max_workers: int = 1
+    ) -> ShaderIndex:
+        path = cls.path()
+        if cls._loaded is not None and cls._loaded[0] == path:
+            index: ShaderIndex | None = cls._loaded[1]
+        else:
+            index = cls.read()
+
+        if index is None or not index.is_fresh(roots, follow_symlinks=follow_symlinks):
+            index = cls.build(
+                roots, follow_symlinks=follow_symlinks, max_workers=max_workers
+            )
+            if index.is_racy():
+                cls._loaded = None
+                return index
+            index.write()
+        cls._loaded = (path, index)
+        return index
+
+    @classmethod
+    def build(
+        cls, roots: list[str], *, follow_symlinks: bool = True, max_workers: int = 1
+    ) -> ShaderIndex:
+        stamps: list[DirectoryStamp] = []
+        names: dict[str, str] = {}
+        for directory, files in scandir_forest(
+            roots,
+            max_depth=cls.MAX_DEPTH,
+            follow_symlinks=follow_symlinks,
+            max_workers=max_workers,
+        ):
+            stamps.append(_stamp(os.fspath(directory)))
+            for file in files:
+                names.setdefault(strip_all_extensions(file.name), file.path)
+        return cls(list(roots), stamps, names, follow_symlinks=follow_symlinks)
+
+    def is_fresh(self, roots: list[str], *, follow_symlinks: bool = True) -> bool:
+        if self.roots != roots or self.follow_symlinks != follow_symlinks:
+            return False
+        try:
+            return all(_stamp(stamp[0]) == stamp for stamp in self.stamps)
+        except OSError:
+            return False
+
+    def is_racy(self) -> bool:
+        return any(is_racy(mtime_ns) for *_, mtime_ns in self.stamps)
+
+    @classmethod
+    def path(cls) -> str:
+        return os.path.join(user_state_dir("hyprshade"), cls.FILE_NAME)
+
+    @classmethod
+    def read(cls) -> ShaderIndex | None:
+        if (data := read_json(cls.path(), cls.VERSION)) is None:
+            return None
+        return cls.decode(data)
+
+    def write(self) -> None:
+        try:
+            write_json(self.path(), self.VERSION, self.encode())
+        except OSError as e:
+            logging.debug(f"Failed to write shader index: {e}")
+
+    @classmethod
+    def decode(cls, data: dict[str, Any]) -> ShaderIndex | None:
+        try:
+            return cls(
+                list(data["roots"]),
+                [tuple(stamp) for stamp in data["stamps"]],
+                dict(data["names"]),
+                follow_symlinks=bool(data["follow_symlinks"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def encode(self) -> dict[str, Any]:
+        return {
+            "roots": self.roots,
+            "follow_symlinks": self.follow_symlinks,
+            "stamps": self.stamps,
+            "names": self.names,
+        }
+
+
+def _stamp(directory: str) -> DirectoryStamp:
+    st = os.stat(directory)
+    return (directory, st.st_dev, st.st_ino, st.st_mtime_ns)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, ClassVar, Final, NamedTuple
+
+from hyprshade.utils.fs import FileStamp, file_stamp, read_json, write_json
+from hyprshade.utils.xdg import user_state_dir
+
+
+class InstanceEntry(NamedTuple):
+    source: str
+    name: str
+    # Hash of the variables the instance was rendered with, if known.
+    variables: str | None
+    # When the instance was last rendered or reused, in seconds since the epoch.
+    used: float = 0.0
+
+
+class InstanceIndex:
+    """Persistent mapping from template instance paths to their sources."""
+
+    VERSION: Final = 1
+    FILE_NAME: Final = ".instance-index.json"
+    # Reusing an instance only rewrites the index once its last use is older
+    # than this many seconds.
+    USE_RESOLUTION: Final = 60 * 60
+
+    entries: dict[str, InstanceEntry]
+
+    # Index last read by this process, keyed by its path and file stamp, so
+    # that resident processes only need to stat it.
+    _loaded: ClassVar[tuple[str, FileStamp, InstanceIndex] | None] = None
+
+    def __init__(self, entries: dict[str, InstanceEntry]):
+        self.entries = entries
+
+    def lookup(self, instance_path: str) -> InstanceEntry | None:
+        return self.entries.get(instance_path)
+
+    @classmethod
+    def load(cls) -> InstanceIndex:
+        path = cls.path()
+        try:
+            stamp = file_stamp(path)
+        except OSError:
+            return cls({})
+        if cls._loaded is not None and cls._loaded[:2] == (path, stamp):
+            return cls._loaded[2]
+
+        index = cls.read() or cls({})
+        cls._loaded = (path, stamp, index)
+        return index
+
+    def last_used(self) -> dict[str, float]:
+        return {path: entry.used for path, entry in self.entries.items()}
+
+    @classmethod
+    def record(cls, instance_path: str, entry: InstanceEntry) -> None:
+        """Add or refresh an entry, dropping entries for missing instances."""
+
+        now = time.time()
+        entry = entry._replace(used=now)
+        previous = cls.load().lookup(instance_path)
+        if (
+            previous is not None
+            and previous._replace(used=now) == entry
+            and now - previous.used < cls.USE_RESOLUTION
+        ):
+            return
+        index = cls.read() or cls({})
+        entries = {p: e for p, e in index.entries.items() if os.path.exists(p)}
+        entries[instance_path] = entry
+        cls(entries).write()
+
+    @classmethod
+    def path(cls) -> str:
+        return os.path.join(user_state_dir("hyprshade"), cls.FILE_NAME)
+
+    @classmethod
+    def read(cls) -> InstanceIndex | None:
+        if (data := read_json(cls.path(), cls.VERSION)) is None:
+            return None
+        return cls.decode(data)
+
+    def write(self) -> None:
+        try:
+            write_json(self.path(), self.VERSION, self.encode())
+        except OSError as e:
+            logging.debug(f"Failed to write template instance index: {e}")
+
+    @classmethod
+    def decode(cls, data: dict[str, Any]) -> InstanceIndex | None:
+        try:
+            return cls(
+                {
+                    str(path): InstanceEntry(**entry)
+                    for path, entry in data["instances"].items()
+                }
+            )
+        except (AttributeError, KeyError, TypeError):
+            return None
+
+    def encode(self) -> dict[str, Any]:
+        return {
+            "instances": {
+                path: entry._asdict() for path, entry in self.entries.items()
+            },
+        }
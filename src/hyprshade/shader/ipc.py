@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import selectors
+import socket
+import subprocess
+import time
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+
+SOCKET_NAME: Final = ".socket.sock"
+EVENT_SOCKET_NAME: Final = ".socket2.sock"
+EVENT_DELIMITER: Final = ">>"
+LEGACY_INSTANCES_DIR: Final = "/tmp/hypr"
+RECV_BUFFER_SIZE: Final = 8192
+TIMEOUT: Final = 5.0
+
+
+def instances_dirs() -> list[str]:
+    """Where Hyprland keeps instance runtime dirs, since and before v0.40.0."""
+
+    dirs = []
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR", "").strip():
+        dirs.append(os.path.join(runtime_dir, "hypr"))
+    dirs.append(LEGACY_INSTANCES_DIR)
+    return dirs
+
+
+def socket_path(signature: str | None = None, name: str = SOCKET_NAME) -> str | None:
+    signature = signature or os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return None
+    for instances_dir in instances_dirs():
+        path = os.path.join(instances_dir, signature, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def instance_signatures() -> list[str]:
+    """Signatures of the running Hyprland instances."""
+
+    signatures: list[str] = []
+    for instances_dir in instances_dirs():
+        try:
+            names = sorted(os.listdir(instances_dir))
+        except OSError:
+            continue
+        for name in names:
+            if name not in signatures and is_running(os.path.join(instances_dir, name)):
+                signatures.append(name)
+    return signatures
+
+
+def is_running(instance_dir: str) -> bool:
+    """Whether the instance in `instance_dir` accepts connections."""
+
+    if not os.path.exists(os.path.join(instance_dir, SOCKET_NAME)):
+        return False
+    # Probe the event socket, since Hyprland waits for a request on each
+    # connection to the request socket. Sockets left behind by a crashed
+    # instance refuse connections, and other users' sockets deny them.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(TIMEOUT)
+        try:
+            sock.connect(os.path.join(instance_dir, EVENT_SOCKET_NAME))
+        except TimeoutError:
+            return True
+        except OSError:
+            return False
+    return True
+
+
+def event_socket_path(signature: str | None = None) -> str | None:
+    return socket_path(signature, EVENT_SOCKET_NAME)
+
+
+def request(path: str, command: str) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(TIMEOUT)
+        sock.connect(path)
+        sock.sendall(command.encode("utf-8"))
+        chunks = []
+        while chunk := sock.recv(RECV_BUFFER_SIZE):
+            chunks.append(chunk)
+    return b"".join(chunks).decode("utf-8")
+
+
+def command_from_args(args: list[str]) -> str:
+    if not args or args[0] != "hyprctl":
+        raise ValueError(f"Not a hyprctl command: {args!r}")
+
+    flags = ""
+    rest = args[1:]
+    while rest and rest[0].startswith("-"):
+        match rest.pop(0):
+            case "-j":
+                flags += "j"
+            case option:
+                raise ValueError(f"Unsupported hyprctl option: {option}")
+
+    command = " ".join(rest)
+    return f"{flags}/{command}" if flags else command
+
+
+def run(args: list[str], path: str) -> subprocess.CompletedProcess[str]:
+    """Run a `hyprctl` command over the request socket, as `subprocess.run` would."""
+
+    reply = request(path, command_from_args(args))
+    returncode = 0 if is_success(args, reply) else 1
+    return subprocess.CompletedProcess(args, returncode, stdout=reply, stderr="")
+
+
+def is_success(args: list[str], reply: str) -> bool:
+    if "keyword" in args:
+        return reply.strip() == "ok"
+    return True
+
+
+class EventSocket:
+    """Connection to Hyprland's event socket, which sends `EVENT>>DATA` lines."""
+
+    sock: socket.socket
+
+    def __init__(self, path: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+        except BaseException:
+            self.sock.close()
+            raise
+        self._buffer = b""
+
+    def __enter__(self) -> EventSocket:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def wait(self, names: Container[str], timeout: float) -> bool:
+        """Wait up to `timeout` seconds for an event in `names`, discarding others."""
+
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.sock, selectors.EVENT_READ)
+            while (remaining := deadline - time.monotonic()) > 0:
+                if not selector.select(remaining):
+                    break
+                if any(name in names for name, _ in self.read()):
+                    return True
+        return False
+
+    def read(self) -> list[tuple[str, str]]:
+        chunk = self.sock.recv(RECV_BUFFER_SIZE)
+        if not chunk:
+            raise EOFError("Hyprland closed the event socket")
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        events = []
+        for line in lines:
+            name, _, data = line.decode("utf-8", "replace").partition(EVENT_DELIMITER)
+            events.append((name, data))
+        return events
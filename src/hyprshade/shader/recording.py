@@ -0,0 +1,147 @@
+"""Recording and replay of hyprctl traffic for `--record-hyprctl`/`--replay-hyprctl`."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+VERSION: Final = 1
+
+CallKey = tuple[tuple[str, ...], str | None]
+
+
+class RecordedCall(NamedTuple):
+    args: list[str]
+    signature: str | None
+    stdout: str
+    stderr: str
+    returncode: int
+    # Seconds from sending the command to receiving its reply.
+    latency: float
+
+
+class ReplayError(Exception):
+    pass
+
+
+class Replayer:
+    """Serves recorded calls in place of Hyprland, cycling through repeated replies."""
+
+    latency_scale: float
+
+    def __init__(self, calls: Sequence[RecordedCall], *, latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self._replies: dict[CallKey, list[RecordedCall]] = {}
+        self._next: dict[CallKey, int] = {}
+        self._lock = threading.Lock()
+        for call in calls:
+            self._replies.setdefault((tuple(call.args), call.signature), []).append(
+                call
+            )
+
+    def replay(
+        self, args: Sequence[str], signature: str | None
+    ) -> subprocess.CompletedProcess[str]:
+        key = (tuple(args), signature)
+        with self._lock:
+            if (replies := self._replies.get(key)) is None:
+                raise ReplayError(
+                    f"No recorded reply for `hyprctl {' '.join(args)}`"
+                    + (f" on instance {signature}" if signature else "")
+                )
+            i = self._next.get(key, 0)
+            self._next[key] = (i + 1) % len(replies)
+        call = replies[i]
+        if self.latency_scale > 0:
+            time.sleep(call.latency * self.latency_scale)
+        return subprocess.CompletedProcess(
+            ["hyprctl", *args], call.returncode, call.stdout, call.stderr
+        )
+
+
+_recorded: list[RecordedCall] | None = None
+_replayer: Replayer | None = None
+
+
+def run(
+    send: Callable[[Sequence[str], str | None], subprocess.CompletedProcess[str]],
+    args: Sequence[str],
+    signature: str | None,
+) -> subprocess.CompletedProcess[str]:
+    """Run a hyprctl command with `send`, or replay it, recording it if enabled."""
+
+    if _replayer is not None:
+        result = _replayer.replay(args, signature)
+    else:
+        start = time.perf_counter()
+        result = send(args, signature)
+        latency = time.perf_counter() - start
+        if _recorded is not None:
+            _recorded.append(
+                RecordedCall(
+                    list(args),
+                    signature,
+                    result.stdout,
+                    result.stderr,
+                    result.returncode,
+                    latency,
+                )
+            )
+    return result
+
+
+def is_recording() -> bool:
+    return _recorded is not None
+
+
+def start_recording() -> None:
+    global _recorded
+    if _recorded is None:
+        _recorded = []
+
+
+def stop_recording() -> list[RecordedCall]:
+    global _recorded
+    calls, _recorded = _recorded or [], None
+    return calls
+
+
+def start_replay(calls: Sequence[RecordedCall], *, latency_scale: float = 1.0) -> None:
+    global _replayer
+    _replayer = Replayer(calls, latency_scale=latency_scale)
+
+
+def stop_replay() -> None:
+    global _replayer
+    _replayer = None
+
+
+def dump(path: str, calls: Sequence[RecordedCall]) -> None:
+    with open(path, "w") as f:
+        json.dump(encode(calls), f, indent=2)
+
+
+def load(path: str) -> list[RecordedCall]:
+    """Read calls written by `dump`, raising `ValueError` if they are invalid."""
+
+    with open(path, "rb") as f:
+        return decode(json.load(f))
+
+
+def encode(calls: Sequence[RecordedCall]) -> dict[str, Any]:
+    return {"version": VERSION, "calls": [call._asdict() for call in calls]}
+
+
+def decode(data: Any) -> list[RecordedCall]:
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        raise ValueError(f"Not a version {VERSION} hyprctl recording")
+    try:
+        return [RecordedCall(**call) for call in data["calls"]]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid hyprctl recording: {e}") from e
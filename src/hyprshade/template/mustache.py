@@ -1,25 +1,73 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Final
 
-if TYPE_CHECKING:
-    from collections.abc import Callable
+from hyprshade.utils import trace
+
+from .renderer import (
+    NULLISH_COALESCE_LAMBDA_NAME,
+    Node,
+    UnsupportedTemplateError,
+    compile_nodes,
+    nullish_coalesce,
+)
+from .renderer import render as render_nodes
 
+if TYPE_CHECKING:
     from _typeshed import SupportsRead
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Template parsed into nodes, or `None` if only chevron can render it."""
+
+    source: str
+    nodes: list[Node] | None
+
+
 def render(
-    template: SupportsRead[str] | str,
+    template: SupportsRead[str] | str | CompiledTemplate,
     data: dict[str, Any] | None = None,
 ) -> str:
-    import chevron
+    with trace.span("mustache.render"):
+        if data is not None:
+            raise_if_reserved_keys(data)
+            data = normalize_data(data)
+
+        if isinstance(template, str):
+            template = compile_template(template)
+        elif not isinstance(template, CompiledTemplate):
+            template = compile_template(template.read())
+
+        scope = DEFAULT_RENDER_DATA | (data or {})
+        if template.nodes is not None:
+            try:
+                return render_nodes(template.nodes, scope)
+            except UnsupportedTemplateError:
+                pass
+
+        import chevron
 
-    if data is not None:
-        raise_if_reserved_keys(data)
-        data = normalize_data(data)
+        return chevron.render(template.source, scope)
 
-    return chevron.render(template, DEFAULT_RENDER_DATA | (data or {}))
+
+# Resident processes, such as the daemon, render templates as they change, so
+# only this many compiled templates are kept.
+COMPILED_TEMPLATES_KEPT: Final = 32
+
+
+@lru_cache(maxsize=COMPILED_TEMPLATES_KEPT)
+def compile_template(template: str) -> CompiledTemplate:
+    """Parse `template` for `render`, memoizing recently parsed templates."""
+
+    try:
+        nodes = compile_nodes(template)
+    except UnsupportedTemplateError:
+        nodes = None
+    return CompiledTemplate(template, nodes)
 
 
 def normalize_data(data: dict[str, Any]) -> dict[str, Any]:
@@ -35,27 +83,6 @@ def normalize_string(data: str) -> str:
     return NORMALIZE_STRING_REPLACEMENT_PATTERN.sub("", data.upper())
 
 
-NULLISH_COALESCE_OPERATOR_PATTERN: Final = re.compile(r"\s*\?\s*")
-
-
-def nullish_coalesce(text: str, render: Callable[[str], str]):
-    match NULLISH_COALESCE_OPERATOR_PATTERN.split(text):
-        case [_]:
-            raise ValueError(
-                "Mustache nullish coalesce operator requires a default value."
-            )
-        case [lhs, rhs]:
-            rendered_lhs = render(lhs)
-            return rendered_lhs if rendered_lhs.strip() else render(rhs)
-        case [_, _, _, *_]:
-            raise ValueError(
-                "Mustache nullish coalesce operator must occur only once in an expression."
-            )
-        case _:
-            raise ValueError("Mustache nullish coalesce operator is not valid.")
-
-
-NULLISH_COALESCE_LAMBDA_NAME: Final = "nc"
 DEFAULT_RENDER_DATA: Final = {NULLISH_COALESCE_LAMBDA_NAME: nullish_coalesce}
 
 
@@ -0,0 +1,270 @@
+"""Renderer matching chevron's output for the mustache used by Hyprshade's shaders."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Final, TypeAlias
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# A node is either a literal string or a list starting with its kind and key.
+# Sections are followed by their children and, for `SECTION` only, `nc`: `None`
+# for sections other than `nc`, the compiled left- and right-hand side for
+# valid `nc` sections, or an error message.
+Node: TypeAlias = str | list[Any]
+
+VARIABLE: Final = 0
+NO_ESCAPE: Final = 1
+SECTION: Final = 2
+INVERTED_SECTION: Final = 3
+
+LEFT_DELIMITER: Final = "{{"
+RIGHT_DELIMITER: Final = "}}"
+TAG_TYPES: Final = {
+    "!": "comment",
+    "#": "section",
+    "^": "inverted section",
+    "/": "end",
+    ">": "partial",
+    "=": "set delimiter",
+    "{": "no escape?",
+    "&": "no escape",
+}
+TAG_SIGILS: Final = {
+    "section": "#",
+    "inverted section": "^",
+    "end": "/",
+    "variable": "",
+}
+
+NULLISH_COALESCE_LAMBDA_NAME: Final = "nc"
+NULLISH_COALESCE_OPERATOR_PATTERN: Final = re.compile(r"\s*\?\s*")
+
+
+class UnsupportedTemplateError(Exception):
+    pass
+
+
+def split_nullish_coalesce(text: str) -> tuple[str, str]:
+    match NULLISH_COALESCE_OPERATOR_PATTERN.split(text):
+        case [_]:
+            raise ValueError(
+                "Mustache nullish coalesce operator requires a default value."
+            )
+        case [lhs, rhs]:
+            return lhs, rhs
+        case [_, _, _, *_]:
+            raise ValueError(
+                "Mustache nullish coalesce operator must occur only once in an expression."
+            )
+        case _:
+            raise ValueError("Mustache nullish coalesce operator is not valid.")
+
+
+def nullish_coalesce(text: str, render: Callable[[str], str]) -> str:
+    lhs, rhs = split_nullish_coalesce(text)
+    rendered_lhs = render(lhs)
+    return rendered_lhs if rendered_lhs.strip() else render(rhs)
+
+
+def tokenize(template: str) -> list[tuple[str, str]]:
+    """Split `template` into `(tag_type, key)` tokens the way chevron does."""
+
+    tokens = []
+    open_sections = []
+    is_standalone: bool | None = True
+    pos = 0
+
+    while pos < len(template):
+        start = template.find(LEFT_DELIMITER, pos)
+        if start == -1:
+            tokens.append(("literal", template[pos:]))
+            break
+        literal = template[pos:start]
+        pos = start + len(LEFT_DELIMITER)
+        if pos >= len(template):
+            tokens.append(("literal", literal))
+            break
+
+        if "\n" in literal or is_standalone:
+            padding = literal.rpartition("\n")[2]
+            is_standalone = padding.isspace() or padding == ""
+        else:
+            is_standalone = None
+
+        end = template.find(RIGHT_DELIMITER, pos)
+        if end == -1:
+            raise UnsupportedTemplateError("Unclosed tag")
+        tag = template[pos:end]
+        pos = end + len(RIGHT_DELIMITER)
+        if not tag:
+            raise UnsupportedTemplateError("Empty tag")
+
+        tag_type = TAG_TYPES.get(tag[0], "variable")
+        if tag_type != "variable":
+            tag = tag[1:]
+        if tag_type == "no escape?" and template.startswith("}", pos):
+            pos += 1
+            tag_type = "no escape"
+        if tag_type in ("partial", "set delimiter", "no escape?"):
+            raise UnsupportedTemplateError(f"Unsupported tag type: {tag_type}")
+        key = tag.strip()
+
+        if tag_type in ("section", "inverted section"):
+            open_sections.append(key)
+        elif tag_type == "end" and (not open_sections or open_sections.pop() != key):
+            raise UnsupportedTemplateError(f"Unexpected closing tag: {key}")
+
+        if is_standalone and tag_type not in ("variable", "no escape"):
+            newline = template.find("\n", pos)
+            rest_of_line = template[pos:] if newline == -1 else template[pos:newline]
+            is_standalone = rest_of_line.isspace() or not rest_of_line
+            if is_standalone:
+                if newline != -1:
+                    pos = newline + 1
+                literal = literal.rstrip(" ")
+        else:
+            is_standalone = False
+
+        if literal:
+            tokens.append(("literal", literal))
+        if tag_type != "comment":
+            tokens.append((tag_type, key))
+
+    if open_sections:
+        raise UnsupportedTemplateError(f"Unclosed section: {open_sections[-1]}")
+    return tokens
+
+
+def compile_nodes(template: str) -> list[Node]:
+    tokens = tokenize(template)
+    root: list[Node] = []
+    stack: list[tuple[list[Any], int]] = []
+    children = root
+
+    for i, (tag_type, key) in enumerate(tokens):
+        match tag_type:
+            case "literal":
+                children.append(key)
+            case "variable":
+                children.append([VARIABLE, key])
+            case "no escape":
+                children.append([NO_ESCAPE, key])
+            case "section" | "inverted section":
+                node: list[Any] = [
+                    SECTION if tag_type == "section" else INVERTED_SECTION,
+                    key,
+                    [],
+                ]
+                if tag_type == "section":
+                    node.append(None)
+                children.append(node)
+                stack.append((node, i))
+                children = node[2]
+            case "end":
+                node, start = stack.pop()
+                if node[0] == SECTION and key == NULLISH_COALESCE_LAMBDA_NAME:
+                    node[3] = _compile_nullish_coalesce(tokens[start + 1 : i])
+                children = stack[-1][0][2] if stack else root
+
+    return root
+
+
+def _compile_nullish_coalesce(tokens: list[tuple[str, str]]) -> list[Any] | str:
+    # chevron passes the section's text to lambdas, rebuilt from its tokens.
+    if ("section", NULLISH_COALESCE_LAMBDA_NAME) in tokens:
+        raise UnsupportedTemplateError("Nested nullish coalesce sections")
+    text = "".join(
+        key
+        if tag_type == "literal"
+        else f"{LEFT_DELIMITER}& {key} {RIGHT_DELIMITER}"
+        if tag_type == "no escape"
+        else f"{LEFT_DELIMITER}{TAG_SIGILS[tag_type]} {key}{RIGHT_DELIMITER}"
+        for tag_type, key in tokens
+    )
+    try:
+        lhs, rhs = split_nullish_coalesce(text)
+    except ValueError as e:
+        return str(e)
+    return [compile_nodes(lhs), compile_nodes(rhs)]
+
+
+def render(nodes: list[Node], data: dict[str, Any]) -> str:
+    out: list[str] = []
+    _render(nodes, [data], out)
+    return "".join(out)
+
+
+def _render(nodes: list[Node], scopes: list[Any], out: list[str]) -> None:
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+            continue
+
+        kind, key = node[0], node[1]
+        value = _lookup(key, scopes)
+        if kind in (VARIABLE, NO_ESCAPE):
+            if kind == VARIABLE and value is True and key == ".":
+                value = scopes[1]
+            text = value if isinstance(value, str) else str(value)
+            out.append(_html_escape(text) if kind == VARIABLE else text)
+        elif kind == INVERTED_SECTION:
+            if not value:
+                _render(node[2], [True, *scopes], out)
+        elif callable(value):
+            if value is not nullish_coalesce or node[3] is None:
+                raise UnsupportedTemplateError(f"Unsupported lambda: {key}")
+            if isinstance(node[3], str):
+                raise ValueError(node[3])
+            lhs, rhs = node[3]
+            start = len(out)
+            _render(lhs, scopes, out)
+            if not "".join(out[start:]).strip():
+                del out[start:]
+                _render(rhs, scopes, out)
+        elif isinstance(value, Sequence | Iterator) and not isinstance(value, str):
+            for item in value:
+                if item:
+                    _render(node[2], [item, *scopes], out)
+        elif value:
+            _render(node[2], [value, *scopes], out)
+
+
+def _lookup(key: str, scopes: list[Any]) -> Any:
+    if key == ".":
+        return scopes[0]
+
+    names = key.split(".")
+    for scope in scopes:
+        try:
+            for name in names:
+                try:
+                    scope = scope[name]
+                except (TypeError, AttributeError):
+                    try:
+                        scope = getattr(scope, name)
+                    except (TypeError, AttributeError):
+                        scope = scope[int(name)]
+
+            if scope in (0, False):
+                return scope
+            try:
+                if scope._CHEVRON_return_scope_when_falsy:
+                    return scope
+            except AttributeError:
+                return scope or ""
+        except (AttributeError, KeyError, IndexError, ValueError):
+            pass
+
+    return ""
+
+
+def _html_escape(text: str) -> str:
+    return (
+        text.replace("&", "&amp;")
+        .replace('"', "&quot;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+    )
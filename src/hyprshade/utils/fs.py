@@ -1,35 +1,269 @@
 from __future__ import annotations
 
+import heapq
+import json
 import os
+import tempfile
+import time
+from contextlib import suppress
 from os import PathLike
-from typing import TYPE_CHECKING, AnyStr
+from typing import TYPE_CHECKING, Any, AnyStr, Final, Generic, NamedTuple
 
-from more_itertools import flatten
+from hyprshade.utils.threads import map_threaded
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 
     from _typeshed import GenericPath
 
 
-def scandir_recursive(
-    path: GenericPath[AnyStr], *, max_depth: int
-) -> Iterator[os.DirEntry[AnyStr]]:
+DirectoryId = tuple[int, int]
+FileStamp = tuple[int, int, int, int]
+
+# Files modified this recently may be modified again within the same mtime
+# tick without their stamp changing, so nothing derived from them is cached.
+RACY_THRESHOLD_NS: Final = 2_000_000_000
+
+
+def scandir_tree(
+    path: GenericPath[AnyStr],
+    *,
+    max_depth: int,
+    follow_symlinks: bool = True,
+    visited: set[DirectoryId] | None = None,
+) -> Iterator[tuple[GenericPath[AnyStr], list[os.DirEntry[AnyStr]]]]:
+    """Walk `path`, yielding each directory once, along with its files."""
+
     assert max_depth >= 0
 
-    dir_stack = []
+    if visited is None:
+        visited = set()
+    return (
+        (directory.path, directory.files)
+        for directory in _scandir_tree(path, max_depth, follow_symlinks, visited)
+    )
+
+
+def scandir_forest(
+    roots: Sequence[str | PathLike[str]],
+    *,
+    max_depth: int,
+    follow_symlinks: bool = True,
+    max_workers: int = 1,
+) -> Iterator[tuple[str | PathLike[str], list[os.DirEntry[str]]]]:
+    """Walk each of `roots` as `scandir_tree` does, on up to `max_workers` threads."""
+
+    assert max_depth >= 0
+
+    listings: dict[str, _Listing[str]] = {}
+    if max_workers > 1 and len(roots) > 1:
+        # Threads only list directories ahead of time. Which directories are
+        # walked, through which paths and how deep, is decided below exactly
+        # as without them.
+        prefetched = map_threaded(
+            lambda root: _prefetch(root, max_depth, follow_symlinks),
+            roots,
+            max_workers,
+        )
+        for result in prefetched:
+            listings.update(result.result())
+
+    visited: set[DirectoryId] = set()
+    for root in roots:
+        for directory in _scandir_tree(
+            root, max_depth, follow_symlinks, visited, listings=listings
+        ):
+            yield directory.path, directory.files
+
 
+def _prefetch(
+    root: str | PathLike[str], max_depth: int, follow_symlinks: bool
+) -> dict[str, _Listing[str]]:
+    listings = {}
+    # Errors are left for the walk to raise, in order.
+    with suppress(OSError):
+        for directory in _scandir_tree(root, max_depth, follow_symlinks, set()):
+            listings[os.fspath(directory.path)] = directory.listing
+    return listings
+
+
+class _Listing(NamedTuple, Generic[AnyStr]):
+    files: list[os.DirEntry[AnyStr]]
+    dirs: list[os.DirEntry[AnyStr]]
+
+
+class _Directory(NamedTuple, Generic[AnyStr]):
+    path: GenericPath[AnyStr]
+    id: DirectoryId
+    listing: _Listing[AnyStr]
+
+    @property
+    def files(self) -> list[os.DirEntry[AnyStr]]:
+        return self.listing.files
+
+
+def _scandir(path: GenericPath[AnyStr]) -> _Listing[AnyStr]:
+    listing: _Listing[AnyStr] = _Listing([], [])
     with os.scandir(path) as it:
         for direntry in it:
-            if not direntry.is_dir():
-                yield direntry
-            elif max_depth > 0:
-                dir_stack.append(direntry)
+            if direntry.is_dir():
+                listing.dirs.append(direntry)
+            else:
+                listing.files.append(direntry)
+    return listing
+
+
+def _scandir_tree(
+    path: GenericPath[AnyStr],
+    max_depth: int,
+    follow_symlinks: bool,
+    visited: set[DirectoryId],
+    st: os.stat_result | None = None,
+    *,
+    listings: dict[AnyStr, _Listing[AnyStr]] | None = None,
+) -> Iterator[_Directory[AnyStr]]:
+    if st is None:
+        st = os.stat(path)
+    directory_id = (st.st_dev, st.st_ino)
+    if directory_id in visited:
+        return
+    visited.add(directory_id)
+
+    listing = listings.pop(os.fspath(path), None) if listings else None
+    if listing is None:
+        listing = _scandir(path)
+
+    yield _Directory(path, directory_id, listing)
 
+    if max_depth <= 0:
+        return
+    dir_stack = [
+        direntry
+        for direntry in listing.dirs
+        if follow_symlinks or not direntry.is_symlink()
+    ]
     while dir_stack:
-        yield from scandir_recursive(dir_stack.pop(), max_depth=max_depth - 1)
+        direntry = dir_stack.pop()
+        try:
+            st = direntry.stat()
+        except OSError:
+            continue
+        yield from _scandir_tree(
+            direntry, max_depth - 1, follow_symlinks, visited, st, listings=listings
+        )
+
+
+def ls_dirs(
+    dirs: Sequence[str | PathLike[str]],
+    *,
+    follow_symlinks: bool = True,
+    max_workers: int = 1,
+) -> Iterator[str]:
+    """Yield the paths of the files in `dirs`, sorted by file name."""
+
+    sorted_files = [
+        sorted(files, key=_direntry_name)
+        for _, files in scandir_forest(
+            dirs,
+            max_depth=5,
+            follow_symlinks=follow_symlinks,
+            max_workers=max_workers,
+        )
+        if files
+    ]
+    return (f.path for f in heapq.merge(*sorted_files, key=_direntry_name))
+
+
+def _direntry_name(direntry: os.DirEntry[str]) -> str:
+    return direntry.name
+
+
+def file_stamp(path: str) -> FileStamp:
+    """Device, inode, size and mtime of `path`, which change with its contents."""
+
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def is_racy(mtime_ns: int) -> bool:
+    return mtime_ns >= time.time_ns() - RACY_THRESHOLD_NS
+
+
+def read_json(
+    path: str,
+    version: int,
+    *,
+    object_hook: Callable[[dict[str, Any]], Any] | None = None,
+) -> dict[str, Any] | None:
+    """Read an object written by `write_json` with `version`, or return `None`."""
+
+    try:
+        with open(path, "rb") as f:
+            data = json.load(f, object_hook=object_hook)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def write_json(path: str, version: int, data: dict[str, Any]) -> None:
+    write_file_atomic(
+        path, json.dumps({"version": version, **data}).encode(), skip_identical=True
+    )
+
+
+def write_file_atomic(path: str, data: bytes, *, skip_identical: bool = False) -> bool:
+    """Atomically write `data` to `path`, unless `skip_identical` and it holds it."""
+
+    if skip_identical and _has_content(path, data):
+        return False
+
+    dirname = os.path.dirname(path)
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+def remove_oldest(
+    paths: Iterable[str],
+    *,
+    keep: int,
+    min_age: float = 0,
+    last_used: Mapping[str, float] | None = None,
+) -> None:
+    """Delete all but the `keep` newest of `paths`, sparing any under `min_age`."""
+
+    # A path is as new as its mtime, or its time in `last_used` if later.
+    stamped = []
+    for path in paths:
+        with suppress(OSError):
+            mtime = os.stat(path).st_mtime_ns
+            if last_used is not None and path in last_used:
+                mtime = max(mtime, int(last_used[path] * 1_000_000_000))
+            stamped.append((mtime, path))
+    cutoff = time.time_ns() - min_age * 1_000_000_000
+    for mtime, path in sorted(stamped, reverse=True)[keep:]:
+        if mtime < cutoff:
+            with suppress(OSError):
+                os.unlink(path)
 
 
-def ls_dirs(dirs: Iterable[str | PathLike[str]]) -> Iterator[str]:
-    all_files = flatten(scandir_recursive(d, max_depth=5) for d in dirs)
-    return (f.path for f in sorted(all_files, key=lambda f: f.name))
+def _has_content(path: str, data: bytes) -> bool:
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != len(data):
+                return False
+            return f.read() == data
+    except OSError:
+        return False
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import struct
+from typing import Final, NamedTuple
+
+IN_MODIFY: Final = 0x00000002
+IN_CLOSE_WRITE: Final = 0x00000008
+IN_MOVED_FROM: Final = 0x00000040
+IN_MOVED_TO: Final = 0x00000080
+IN_CREATE: Final = 0x00000100
+IN_DELETE: Final = 0x00000200
+IN_NONBLOCK: Final = 0o4000
+IN_CLOEXEC: Final = 0o2000000
+
+EVENT_HEADER: Final = struct.Struct("iIII")
+READ_SIZE: Final = 64 * 1024
+
+
+class InotifyEvent(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+class Inotify:
+    """Minimal, selectable wrapper around Linux's inotify API."""
+
+    _fd: int
+
+    def __init__(self):
+        libc = _libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise _errno_error("inotify_init1")
+        self._fd = fd
+
+    def __enter__(self) -> Inotify:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = _libc().inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise _errno_error("inotify_add_watch", path)
+        return wd
+
+    def read(self) -> list[InotifyEvent]:
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+
+def _libc():
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("inotify is not available on this platform")
+    return libc
+
+
+def _errno_error(function: str, path: str | None = None) -> OSError:
+    import ctypes
+
+    errno = ctypes.get_errno()
+    return OSError(errno, f"{function}: {os.strerror(errno)}", path)
@@ -0,0 +1,46 @@
+"""Helpers for `hyprshade --profile`."""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    import cProfile
+
+TOP: Final = 30
+SORT_KEY: Final = "cumulative"
+
+
+def process_uptime() -> float | None:
+    """Seconds since this process started, or `None` if it is unknown."""
+
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        # The command name (field 2) is in parentheses and may contain spaces,
+        # so fields are counted from its closing parenthesis; the start time
+        # is field 22.
+        start_ticks = int(stat[stat.rindex(b")") + 2 :].split()[19])
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+    return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / ticks_per_second
+
+
+def format_timings(startup: float | None, command: float) -> str:
+    startup_ms = "unknown" if startup is None else f"{startup * 1e3:.1f}ms"
+    return (
+        f"startup: {startup_ms} (interpreter start to command dispatch)\n"
+        f"command: {command * 1e3:.1f}ms"
+    )
+
+
+def format_stats(profiler: cProfile.Profile, top: int = TOP) -> str:
+    import io
+    import pstats
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(SORT_KEY).print_stats(top)
+    return stream.getvalue()
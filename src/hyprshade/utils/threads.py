@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+class Result(Generic[T]):
+    """Outcome of a call made by `map_threaded`: a value or an exception."""
+
+    value: T
+    error: BaseException | None = None
+
+    def result(self) -> T:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def map_threaded(
+    f: Callable[[U], T], items: Sequence[U], max_workers: int
+) -> list[Result[T]]:
+    """Call `f` on each of `items` on up to `max_workers` threads."""
+
+    results = [Result[T]() for _ in items]
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+
+    def work() -> None:
+        while True:
+            with lock:
+                i, item = next(pending, (None, None))
+            if i is None:
+                return
+            try:
+                results[i].value = f(item)  # type: ignore[arg-type]
+            except BaseException as e:
+                results[i].error = e
+
+    threads = [
+        threading.Thread(target=work, daemon=True)
+        for _ in range(min(max_workers, len(items)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
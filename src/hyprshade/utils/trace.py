@@ -0,0 +1,106 @@
+"""Timing spans, written as Chrome trace-event JSON by `hyprshade --trace`."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Final
+
+CATEGORY: Final = "hyprshade"
+
+_events: list[dict[str, Any]] | None = None
+
+
+class Span:
+    """Context manager recording a complete (`X`) event when it exits."""
+
+    __slots__ = ("name", "args", "start_ns")
+
+    name: str
+    args: dict[str, Any]
+    start_ns: int
+
+    def __init__(self, name: str, args: dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> Span:
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.finish()
+
+    def start(self) -> Span:
+        return self.__enter__()
+
+    def finish(self) -> None:
+        end_ns = time.perf_counter_ns()
+        if _events is None:
+            return
+        _events.append(
+            {
+                "name": self.name,
+                "cat": CATEGORY,
+                "ph": "X",
+                "ts": self.start_ns / 1000,
+                "dur": (end_ns - self.start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            }
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def start(self) -> _NullSpan:
+        return self
+
+    def finish(self) -> None:
+        pass
+
+
+_NULL_SPAN: Final = _NullSpan()
+
+
+def span(name: str, **args: Any) -> Span | _NullSpan:
+    """Time the enclosed block as a span named `name`, with JSON-serializable `args`."""
+
+    if _events is None:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def enable() -> None:
+    global _events
+    if _events is None:
+        _events = []
+
+
+def disable() -> list[dict[str, Any]]:
+    global _events
+    events, _events = _events or [], None
+    return events
+
+
+def dump(path: str, events: list[dict[str, Any]]) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {"traceEvents": events, "displayTimeUnit": "ms"},
+            f,
+            default=str,
+        )
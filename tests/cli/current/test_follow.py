@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner, Result
+
+from hyprshade.cli import cli
+from tests.helpers import FakeHyprland
+from tests.types import ShaderPathFactory
+
+
+def test_json_empty(runner: CliRunner, fake_hyprland: FakeHyprland):
+    result = runner.invoke(cli, ["current", "--json"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {
+        "text": "",
+        "alt": "off",
+        "class": "off",
+        "tooltip": "",
+    }
+
+
+def test_json(
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+):
+    shader_path = shader_path_factory("foo")
+    fake_hyprland.options["decoration:screen_shader"] = str(shader_path)
+    result = runner.invoke(cli, ["current", "--json"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {
+        "text": "foo",
+        "alt": "on",
+        "class": "on",
+        "tooltip": str(shader_path),
+    }
+
+
+def _emit_and_wait(fake_hyprland: FakeHyprland, requests: int) -> None:
+    fake_hyprland.events.emit("configreloaded")
+    _wait_for_requests(fake_hyprland, requests)
+
+
+def _wait_for_requests(fake_hyprland: FakeHyprland, requests: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(fake_hyprland.requests) < requests:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ([], ["", "foo", ""]),
+        (["--json"], ['"text": ""', '"text": "foo"', '"text": ""']),
+    ],
+)
+def test_follow(
+    args: list[str],
+    expected: list[str],
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+):
+    shader_path = shader_path_factory("foo")
+    results: list[Result] = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            runner.invoke(cli, ["current", "--follow", "--interval", "60", *args])
+        )
+    )
+    thread.start()
+    fake_hyprland.events.wait_for_clients()
+    _wait_for_requests(fake_hyprland, 1)
+
+    for i, shader in enumerate([str(shader_path), str(shader_path), "[[EMPTY]]"]):
+        fake_hyprland.options["decoration:screen_shader"] = shader
+        _emit_and_wait(fake_hyprland, i + 2)
+    fake_hyprland.events.disconnect()
+    thread.join(timeout=5)
+
+    [result] = results
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == len(expected)
+    for line, text in zip(lines, expected, strict=True):
+        assert text in line if args else line == text
@@ -0,0 +1,10 @@
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+
+
+def test_no_config(runner: CliRunner):
+    result = runner.invoke(cli, ["daemon"])
+
+    assert result.exit_code != 0
+    assert isinstance(result.exception, FileNotFoundError)
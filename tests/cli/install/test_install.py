@@ -20,6 +20,15 @@ def parse_unit(path: Path) -> dict[str, SectionProxy]:
     return dict(unit.items())
 
 
+@pytest.fixture()
+def systemctl_calls(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    from hyprshade.cli.install import subprocess
+
+    calls: list[list[str]] = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **kwargs: calls.append(args))
+    return calls
+
+
 def test_no_entries(
     runner: CliRunner, isolation: Isolation, config_factory: ConfigFactory
 ):
@@ -175,3 +184,89 @@ def test_write_systemd_user_unit(isolation: Isolation):
 
     write_systemd_user_unit("timer", "bar")
     assert (isolation.config_dir / "systemd/user/hyprshade.timer").read_text() == "bar"
+
+
+def test_option_daemon(
+    runner: CliRunner,
+    isolation: Isolation,
+    config_factory: ConfigFactory,
+    systemctl_calls: list[list[str]],
+):
+    config_factory.write(
+        {"shaders": [{"name": "foo", "start_time": time.fromisoformat("12:00")}]}
+    )
+    result = runner.invoke(cli, ["install", "--daemon"])
+
+    assert result.exit_code == 0
+
+    service_config = parse_unit(isolation.systemd_service_path)
+    assert service_config["Service"]["Type"] == "simple"
+    assert service_config["Service"]["ExecStart"].endswith(" daemon")
+    assert service_config["Install"]["WantedBy"] == "graphical-session.target"
+    assert not isolation.systemd_timer_path.exists()
+    assert systemctl_calls == []
+
+
+def test_option_daemon_enable(
+    runner: CliRunner,
+    config_factory: ConfigFactory,
+    systemctl_calls: list[list[str]],
+):
+    config_factory.write({"shaders": []})
+    result = runner.invoke(cli, ["install", "--daemon", "--enable"])
+
+    assert result.exit_code == 0
+    assert systemctl_calls == [
+        ["systemctl", "--user", "enable", "--now", "hyprshade.service"]
+    ]
+
+
+def test_timer_to_daemon(
+    runner: CliRunner,
+    isolation: Isolation,
+    config_factory: ConfigFactory,
+    systemctl_calls: list[list[str]],
+):
+    config_factory.write({"shaders": []})
+    assert runner.invoke(cli, ["install"]).exit_code == 0
+    assert isolation.systemd_timer_path.exists()
+
+    result = runner.invoke(cli, ["install", "--daemon", "--enable"])
+
+    assert result.exit_code == 0
+    assert not isolation.systemd_timer_path.exists()
+    assert systemctl_calls == [
+        ["systemctl", "--user", "disable", "--now", "hyprshade.timer"],
+        ["systemctl", "--user", "enable", "--now", "hyprshade.service"],
+    ]
+
+
+def test_daemon_to_timer(
+    runner: CliRunner,
+    isolation: Isolation,
+    config_factory: ConfigFactory,
+    systemctl_calls: list[list[str]],
+):
+    config_factory.write({"shaders": []})
+    assert runner.invoke(cli, ["install", "--daemon"]).exit_code == 0
+
+    result = runner.invoke(cli, ["install", "--enable"])
+
+    assert result.exit_code == 0
+    assert "Install" not in parse_unit(isolation.systemd_service_path)
+    assert systemctl_calls == [
+        ["systemctl", "--user", "disable", "--now", "hyprshade.service"],
+        ["systemctl", "--user", "enable", "--now", "hyprshade.timer"],
+    ]
+
+
+def test_reinstall_timer(
+    runner: CliRunner,
+    config_factory: ConfigFactory,
+    systemctl_calls: list[list[str]],
+):
+    config_factory.write({"shaders": []})
+    assert runner.invoke(cli, ["install"]).exit_code == 0
+    assert runner.invoke(cli, ["install"]).exit_code == 0
+
+    assert systemctl_calls == []
@@ -0,0 +1,50 @@
+import pytest
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from tests.helpers import FakeHyprland
+from tests.types import ShaderPathFactory
+
+
+@pytest.fixture()
+def _shaders(shader_path_factory: ShaderPathFactory) -> None:
+    for name in ["bar", "foo"]:
+        shader_path_factory(name)
+
+
+@pytest.mark.usefixtures("_shaders")
+def test_in_shader_dirs(
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+):
+    fake_hyprland.options["decoration:screen_shader"] = str(shader_path_factory("foo"))
+    result = runner.invoke(cli, ["ls"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["  bar", "* foo"]
+
+
+@pytest.mark.usefixtures("_shaders")
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("aaa", ["* aaa  ({})", "  bar", "  foo"]),
+        ("baz", ["  bar", "* baz  ({})", "  foo"]),
+        ("foo", ["  bar", "* foo  ({})", "  foo"]),
+        ("zzz", ["  bar", "  foo", "* zzz  ({})"]),
+    ],
+)
+def test_outside_shader_dirs(
+    name: str,
+    expected: list[str],
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    tmp_path_factory: pytest.TempPathFactory,
+):
+    (path := tmp_path_factory.mktemp("outside") / f"{name}.glsl").touch()
+    fake_hyprland.options["decoration:screen_shader"] = str(path)
+    result = runner.invoke(cli, ["ls"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [line.format(path) for line in expected]
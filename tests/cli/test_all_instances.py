@@ -0,0 +1,78 @@
+import socket
+
+import pytest
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from hyprshade.shader import ipc
+from tests.helpers import FakeHyprland
+from tests.types import ConfigFactory, ShaderPathFactory
+
+
+def test_on(
+    runner: CliRunner,
+    fake_hyprland_instances: list[FakeHyprland],
+    shader_path_factory: ShaderPathFactory,
+):
+    shader_path_factory("foo", extension="glsl.mustache", text="float x = {{x}};")
+    result = runner.invoke(cli, ["on", "foo", "--var", "x=1", "--all-instances"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        f"{f.signature}: ok" for f in fake_hyprland_instances
+    ]
+    [path] = {f.screen_shader for f in fake_hyprland_instances}
+    assert path is not None
+    assert path.endswith(".glsl")
+
+
+def test_off(runner: CliRunner, fake_hyprland_instances: list[FakeHyprland]):
+    for f in fake_hyprland_instances:
+        f.options["decoration:screen_shader"] = "foo"
+    result = runner.invoke(cli, ["off", "--all-instances"])
+
+    assert result.exit_code == 0
+    assert [f.screen_shader for f in fake_hyprland_instances] == [None] * 3
+
+
+def test_auto(
+    runner: CliRunner,
+    fake_hyprland_instances: list[FakeHyprland],
+    shader_path_factory: ShaderPathFactory,
+    config_factory: ConfigFactory,
+):
+    shader_path = shader_path_factory("foo")
+    config_factory.write({"shaders": [{"name": "foo", "default": True}]})
+    result = runner.invoke(cli, ["auto", "--all-instances"])
+
+    assert result.exit_code == 0
+    assert [f.screen_shader for f in fake_hyprland_instances] == [str(shader_path)] * 3
+
+
+def test_failure(runner: CliRunner, fake_hyprland_instances: list[FakeHyprland]):
+    del fake_hyprland_instances[0].options["decoration:screen_shader"]
+    result = runner.invoke(cli, ["off", "--all-instances"])
+
+    assert result.exit_code == 1
+    assert f"{fake_hyprland_instances[0].signature}: error:" in result.stderr
+    assert f"{fake_hyprland_instances[1].signature}: ok" in result.output
+
+
+def test_stale_instance(runner: CliRunner, fake_hyprland_instances: list[FakeHyprland]):
+    stale = fake_hyprland_instances[0].socket_path.parent.parent / "stale"
+    stale.mkdir()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(stale / ipc.SOCKET_NAME))
+    result = runner.invoke(cli, ["off", "--all-instances"])
+
+    assert result.exit_code == 0
+    assert "stale" not in result.output + result.stderr
+
+
+@pytest.mark.usefixtures("fake_hyprland")
+def test_no_instances(runner: CliRunner, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(ipc, "instance_signatures", list)
+    result = runner.invoke(cli, ["off", "--all-instances"])
+
+    assert result.exit_code == 1
+    assert "No running Hyprland instances found" in result.stderr
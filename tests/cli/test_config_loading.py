@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from hyprshade.config.core import Config
+from tests.types import ConfigFactory
+
+
+@pytest.fixture()
+def _forbid_config(config_factory: ConfigFactory, monkeypatch: pytest.MonkeyPatch):
+    config_factory.path.write_text("not toml")
+
+    def get_path():
+        pytest.fail("config should not be looked up")
+
+    monkeypatch.setattr(Config, "_get_path", get_path)
+
+
+@pytest.mark.usefixtures("fake_hyprland", "_forbid_config")
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["off"],
+        ["current"],
+        ["ls"],
+        ["on", "{shader_path}"],
+        ["toggle", "{shader_path}"],
+    ],
+)
+def test_config_not_loaded(runner: CliRunner, shader_path: Path, args: list[str]):
+    args = [arg.format(shader_path=shader_path) for arg in args]
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.usefixtures("fake_hyprland")
+def test_config_loaded_for_template(
+    runner: CliRunner, config_factory: ConfigFactory, tmp_path: Path
+):
+    shader_path = tmp_path / "foo.glsl.mustache"
+    shader_path.write_text("void main() {}")
+    config_factory.path.write_text("not toml")
+    result = runner.invoke(cli, ["on", str(shader_path)])
+
+    assert result.exit_code != 0
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+from typing import NamedTuple
+
+import pytest
+
+from hyprshade.cli import LAZY_COMMANDS
+
+# Modules imported when dispatching a command, on top of importing
+# `hyprshade.cli`. How long they take is tracked by `benchmarks.suite`.
+BUDGETS = {
+    "auto": 5,
+    "current": 3,
+    "daemon": 12,
+    "install": 6,
+    "ls": 3,
+    "off": 3,
+    "on": 3,
+    "toggle": 5,
+}
+KEYBIND_COMMANDS = ["current", "ls", "off", "on"]
+HEAVY_MODULES = ["hyprshade.config.schedule", "hyprshade.daemon", "shlex"]
+
+
+class Import(NamedTuple):
+    module: str
+    depth: int
+
+
+def dispatch_imports(command: str) -> list[Import]:
+    """Return the imports done by dispatching `command`, per `-X importtime`."""
+
+    code = f"from hyprshade.cli import cli; cli.main([{command!r}, '--help'], standalone_mode=False)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        *_, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(Import(name.strip(), depth))
+
+    cli_index = imports.index(
+        next(i for i in imports if i.module == "hyprshade.cli" and i.depth == 0)
+    )
+    return imports[cli_index + 1 :]
+
+
+def test_budgets_cover_commands():
+    assert BUDGETS.keys() == LAZY_COMMANDS.keys()
+
+
+@pytest.mark.parametrize("command", BUDGETS.keys())
+def test_import_budget(command: str):
+    imports = dispatch_imports(command)
+    modules = {i.module for i in imports}
+
+    assert f"hyprshade.cli.{command}" in modules
+    assert not modules & {f"hyprshade.cli.{c}" for c in BUDGETS if c != command}
+    assert len(imports) <= BUDGETS[command], sorted(modules)
+
+
+@pytest.mark.parametrize("command", KEYBIND_COMMANDS)
+def test_no_heavy_imports(command: str):
+    modules = {i.module for i in dispatch_imports(command)}
+    assert not modules & set(HEAVY_MODULES)
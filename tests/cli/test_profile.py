@@ -0,0 +1,58 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from hyprshade.utils.profiling import process_uptime
+from tests.helpers import FakeHyprland
+from tests.types import ShaderPathFactory
+
+
+@pytest.fixture()
+def _shaders(shader_path_factory: ShaderPathFactory):
+    shader_path_factory("foo")
+
+
+@pytest.mark.usefixtures("_shaders")
+def test_profile_prints_stats(runner: CliRunner, fake_hyprland: FakeHyprland):
+    result = runner.invoke(cli, ["--profile", "on", "foo"])
+
+    assert result.exit_code == 0
+    assert fake_hyprland.options["decoration:screen_shader"].endswith("foo.glsl")
+    assert "startup: " in result.stderr
+    assert "command: " in result.stderr
+    assert "cumulative" in result.stderr
+
+
+@pytest.mark.usefixtures("_shaders")
+def test_profile_to_path(
+    runner: CliRunner, fake_hyprland: FakeHyprland, tmp_path: Path
+):
+    path = tmp_path / "on.prof"
+    result = runner.invoke(cli, [f"--profile={path}", "-v", "on", "foo"])
+
+    assert result.exit_code == 0
+    assert f"Wrote profile to {path}" in result.stderr
+    stats = pstats.Stats(str(path))
+    assert any(name == "on" for _, _, name in stats.stats)  # type: ignore[attr-defined]
+
+
+@pytest.mark.usefixtures("_shaders")
+def test_profile_after_option_with_value(
+    runner: CliRunner, fake_hyprland: FakeHyprland, tmp_path: Path
+):
+    trace_path = tmp_path / "trace.json"
+    result = runner.invoke(cli, ["--trace", str(trace_path), "--profile", "on", "foo"])
+
+    assert result.exit_code == 0
+    assert trace_path.exists()
+    assert "command: " in result.stderr
+
+
+def test_process_uptime():
+    uptime = process_uptime()
+    if uptime is None:
+        pytest.skip("process start time is unavailable")
+    assert 0 <= uptime < 24 * 60 * 60
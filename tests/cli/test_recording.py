@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from tests.helpers import FakeHyprland
+from tests.types import ShaderPathFactory
+
+
+def test_record_and_replay(
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+    tmp_path: Path,
+):
+    shader_path_factory("foo")
+    path = tmp_path / "hyprctl.json"
+    assert runner.invoke(cli, ["on", "foo"]).exit_code == 0
+
+    result = runner.invoke(cli, ["--record-hyprctl", str(path), "current"])
+    assert result.exit_code == 0
+    assert result.stdout == "foo\n"
+    calls = json.loads(path.read_text())["calls"]
+    assert [c["args"] for c in calls] == [
+        ["-j", "getoption", "decoration:screen_shader"]
+    ]
+
+    fake_hyprland.options["decoration:screen_shader"] = "[[EMPTY]]"
+    requests = len(fake_hyprland.requests)
+    result = runner.invoke(
+        cli,
+        ["--replay-hyprctl", str(path), "--replay-latency-scale", "0", "current"],
+    )
+    assert result.exit_code == 0
+    assert result.stdout == "foo\n"
+    assert len(fake_hyprland.requests) == requests
+
+
+def test_record_and_replay_exclusive(runner: CliRunner, tmp_path: Path):
+    path = tmp_path / "hyprctl.json"
+    path.write_text(json.dumps({"version": 1, "calls": []}))
+    result = runner.invoke(
+        cli, ["--record-hyprctl", str(path), "--replay-hyprctl", str(path), "current"]
+    )
+
+    assert result.exit_code != 0
+    assert "cannot be used together" in result.stderr
+
+
+def test_replay_invalid(runner: CliRunner, tmp_path: Path):
+    path = tmp_path / "hyprctl.json"
+    path.write_text("{}")
+    result = runner.invoke(cli, ["--replay-hyprctl", str(path), "current"])
+
+    assert result.exit_code != 0
+    assert "Not a version 1 hyprctl recording" in result.stderr
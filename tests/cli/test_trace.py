@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from hyprshade.cli import cli
+from hyprshade.utils import trace
+from tests.helpers import FakeHyprland
+from tests.types import ConfigFactory, ShaderPathFactory
+
+
+def test_trace(
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+    tmp_path: Path,
+):
+    shader_path_factory("foo", extension="glsl.mustache", text="float x = {{x}};")
+    path = tmp_path / "trace.json"
+    result = runner.invoke(cli, ["--trace", str(path), "on", "foo", "--var", "x=1"])
+
+    assert result.exit_code == 0
+    assert not trace.is_enabled()
+    events = json.loads(path.read_text())["traceEvents"]
+    names = [e["name"] for e in events]
+    assert names[-1] == "hyprshade on"
+    for name in [
+        "resolve_path",
+        "mustache.render",
+        "write_template_instance",
+        "hyprctl",
+    ]:
+        assert name in names
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_trace_config(
+    runner: CliRunner,
+    fake_hyprland: FakeHyprland,
+    shader_path_factory: ShaderPathFactory,
+    config_factory: ConfigFactory,
+    tmp_path: Path,
+):
+    shader_path_factory("foo")
+    config_factory.write({"shaders": [{"name": "foo", "default": True}]})
+    path = tmp_path / "trace.json"
+    result = runner.invoke(cli, ["--trace", str(path), "auto"])
+
+    assert result.exit_code == 0
+    names = {e["name"] for e in json.loads(path.read_text())["traceEvents"]}
+    assert {"config.load", "config.parse", "schedule.slot_at"} <= names
@@ -19,6 +19,29 @@ class TestContextObject:
         with pytest.raises(FileNotFoundError):
             obj.get_config(raising=True)
 
+    def test_get_config_lazy(self, config_factory: ConfigFactory):
+        config_factory.write({})
+        calls: list[None] = []
+
+        def load_config():
+            calls.append(None)
+            return config_factory.get_config()
+
+        obj = ContextObject(load_config)
+        assert calls == []
+
+        config = obj.get_config(raising=True)
+        assert obj.get_config() is config
+        assert len(calls) == 1
+
+    def test_load_config(self, config_factory: ConfigFactory):
+        assert ContextObject.load_config() is None
+
+        config_factory.write({})
+        config = ContextObject.load_config()
+        assert config is not None
+        assert config.model.path == str(config_factory.path)
+
 
 class TestConvertValue:
     def test(self):
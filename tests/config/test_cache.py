@@ -0,0 +1,125 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from hyprshade.config import cache
+from hyprshade.config.core import Config
+from hyprshade.config.model import ConfigError
+from tests.types import ConfigFactory
+
+CONFIG = {
+    "shaders": [
+        {
+            "name": "foo",
+            "start_time": time.fromisoformat("12:00"),
+            "end_time": time.fromisoformat("13:00"),
+            "config": {"strength": 0.5},
+        },
+        {"name": "bar", "default": True},
+    ]
+}
+
+
+def write_settled(config_factory: ConfigFactory, data: dict, mtime: int = 1000):
+    config_factory.write(data)
+    os.utime(config_factory.path, (mtime, mtime))
+
+
+def forbid_parsing(monkeypatch: pytest.MonkeyPatch):
+    def _load(path: str):
+        pytest.fail("config should have been loaded from the cache")
+
+    monkeypatch.setattr(Config, "_load", _load)
+
+
+class TestConfigCache:
+    def test_warm(self, config_factory: ConfigFactory, monkeypatch: pytest.MonkeyPatch):
+        write_settled(config_factory, CONFIG)
+        cold = Config(str(config_factory.path))
+        assert os.path.exists(cache.cache_path(str(config_factory.path)))
+
+        forbid_parsing(monkeypatch)
+        warm = Config(str(config_factory.path))
+        warm.model.parse_fields()
+        assert warm.model.raw_data == cold.model.raw_data
+        assert warm.shader_variables("foo") == {"strength": 0.5}
+        assert [s.name for s in warm.model.shaders] == ["foo", "bar"]
+
+    def test_invalidated(self, config_factory: ConfigFactory):
+        write_settled(config_factory, CONFIG)
+        Config(str(config_factory.path))
+
+        write_settled(config_factory, {"shaders": [{"name": "baz"}]}, mtime=2000)
+        config = Config(str(config_factory.path))
+        assert [s.name for s in config.model.shaders] == ["baz"]
+
+    def test_toml_values(
+        self, config_factory: ConfigFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        variables = {
+            "datetime": datetime(
+                2024, 4, 8, 12, 30, tzinfo=timezone(timedelta(hours=2))
+            ),
+            "local_datetime": datetime(2024, 4, 8, 12, 30),
+            "date": date(2024, 4, 8),
+            "time": time(12, 30, 15, 500),
+            "tagged": {"$time": "not a time"},
+            "escaped": {"$$time": [1.5, True, "s"]},
+            "nested": [{"$date": {"a": time(1)}}],
+        }
+        write_settled(
+            config_factory,
+            {"shaders": [{"name": "foo", "default": True, "config": variables}]},
+        )
+        Config(str(config_factory.path))
+
+        forbid_parsing(monkeypatch)
+        assert Config(str(config_factory.path)).shader_variables("foo") == variables
+
+    def test_racy(self, config_factory: ConfigFactory):
+        config_factory.write(CONFIG)
+        Config(str(config_factory.path))
+
+        assert not os.path.exists(cache.cache_path(str(config_factory.path)))
+
+    def test_invalid_config(self, config_factory: ConfigFactory):
+        write_settled(config_factory, {"shaders": [{"name": 3}]})
+        config = Config(str(config_factory.path))
+
+        assert not os.path.exists(cache.cache_path(str(config_factory.path)))
+        with pytest.raises(ConfigError, match="must be a string"):
+            _ = config.model.shaders[0].name
+
+    @pytest.mark.parametrize(
+        "contents", [b"", b"not json", b"[]", b'{"version": 3}', b"\x80\x05N."]
+    )
+    def test_corrupt_cache(self, config_factory: ConfigFactory, contents: bytes):
+        write_settled(config_factory, CONFIG)
+        Config(str(config_factory.path))
+        with open(cache.cache_path(str(config_factory.path)), "wb") as f:
+            f.write(contents)
+
+        config = Config(str(config_factory.path))
+        assert [s.name for s in config.model.shaders] == ["foo", "bar"]
+
+    def test_pruned(
+        self, config_factory: ConfigFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(cache, "MAX_ENTRIES", 2)
+        write_settled(config_factory, CONFIG)
+        paths = [str(config_factory.path)]
+        for i in range(2):
+            other = config_factory.path.with_name(f"other-{i}.toml")
+            other.write_text('[[shaders]]\nname = "foo"\n')
+            os.utime(other, (1000, 1000))
+            paths.append(str(other))
+        for i, path in enumerate(paths):
+            Config(path)
+            os.utime(cache.cache_path(path), (2000 + i, 2000 + i))
+
+        assert [os.path.exists(cache.cache_path(p)) for p in paths] == [
+            False,
+            True,
+            True,
+        ]
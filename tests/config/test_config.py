@@ -96,6 +96,21 @@ class TestShaderConfig:
         shader_config = config.shader_config("not-found")
         assert shader_config is None
 
+    def test_duplicate_name(self, config_factory: ConfigFactory):
+        config_factory.write(
+            {
+                "shaders": [
+                    {"name": "test", "config": {"key": 1}},
+                    {"name": "test", "config": {"key": 2}},
+                ]
+            }
+        )
+        config = config_factory.get_config()
+
+        shader_config = config.shader_config("test")
+        assert shader_config is not None
+        assert shader_config.config == {"key": 1}
+
 
 class TestShaderVariables:
     def test_name(self, config_factory: ConfigFactory):
@@ -207,3 +222,33 @@ class TestLazyShaderVariables:
 
         shader_config = config.shader_config("not-found")
         assert shader_config is None
+
+
+class TestShaderVariablesMany:
+    def test(
+        self, config_factory: ConfigFactory, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory("test2")
+        config_factory.write(
+            {
+                "shaders": [
+                    {"name": "test1", "config": {"key": 1}},
+                    {"name": "test2", "config": {"key": 2}},
+                    {"name": "test3"},
+                ]
+            }
+        )
+        config = config_factory.get_config()
+
+        assert config.shader_variables_many(
+            ["test1", str(shader_path), "test3", "not-found"]
+        ) == {
+            "test1": {"key": 1},
+            str(shader_path): {"key": 2},
+            "test3": None,
+            "not-found": None,
+        }
+
+    def test_empty(self, config_factory: ConfigFactory):
+        config_factory.write({})
+        assert config_factory.get_config().shader_variables_many([]) == {}
@@ -1,9 +1,12 @@
+import random
 from datetime import datetime, time
+from itertools import chain
 
 import pytest
 
 from hyprshade.config.model import ConfigError
 from hyprshade.config.schedule import Schedule
+from hyprshade.utils.time import is_time_between
 from tests.helpers import freeze_time
 from tests.types import ConfigFactory
 
@@ -85,6 +88,174 @@ class TestScheduledShader:
             assert shader is None
 
 
+class TestSlotAt:
+    @pytest.fixture()
+    def schedule(self, config_factory: ConfigFactory) -> Schedule:
+        config_factory.write(
+            {
+                "shaders": [
+                    {
+                        "name": "test1",
+                        "start_time": time.fromisoformat("20:00"),
+                        "end_time": time.fromisoformat("21:00"),
+                    },
+                    {
+                        "name": "test2",
+                        "start_time": time.fromisoformat("21:00"),
+                    },
+                    {
+                        "name": "test3",
+                        "start_time": time.fromisoformat("23:00"),
+                        "end_time": time.fromisoformat("01:00"),
+                    },
+                    {
+                        "name": "default",
+                        "default": True,
+                    },
+                ]
+            }
+        )
+        return Schedule(config_factory.get_config())
+
+    @pytest.mark.parametrize(
+        ("time_str", "expected", "until"),
+        [
+            ("00:00", "test3", "01:00"),
+            ("00:59:59.999999", "test3", "01:00"),
+            ("01:00", "default", "20:00"),
+            ("20:00", "test1", "21:00"),
+            ("21:00", "test2", "23:00"),
+            ("23:00", "test3", "01:00"),
+            ("23:59:59", "test3", "01:00"),
+        ],
+    )
+    def test(self, time_str: str, expected: str, until: str, schedule: Schedule):
+        slot = schedule.slot_at(time.fromisoformat(time_str))
+
+        assert slot.shader is not None
+        assert slot.shader.name == expected
+        assert slot.until == time.fromisoformat(until)
+
+    def test_merges_across_midnight(self, config_factory: ConfigFactory):
+        config_factory.write(
+            {
+                "shaders": [
+                    {
+                        "name": "test",
+                        "start_time": time.fromisoformat("12:00"),
+                        "end_time": time.fromisoformat("13:00"),
+                    },
+                ]
+            }
+        )
+        schedule = Schedule(config_factory.get_config())
+
+        assert schedule.slot_at(time.fromisoformat("23:00")) == (
+            None,
+            time.fromisoformat("12:00"),
+        )
+        assert schedule.slot_at(time.fromisoformat("13:00")).until == time(12)
+        assert schedule.slot_at(time.fromisoformat("00:00")).until == time(12)
+
+    def test_never_changes(self, config_factory: ConfigFactory):
+        config_factory.write({"shaders": [{"name": "default", "default": True}]})
+        slot = Schedule(config_factory.get_config()).slot_at(time(12))
+
+        assert slot.shader is not None
+        assert slot.shader.name == "default"
+        assert slot.until is None
+
+    def test_lone_entry_without_end_time(self, config_factory: ConfigFactory):
+        config_factory.write(
+            {
+                "shaders": [
+                    {"name": "lone", "start_time": time.fromisoformat("20:00")},
+                    {"name": "default", "default": True},
+                ]
+            }
+        )
+        schedule = Schedule(config_factory.get_config())
+
+        for t in [time(0), time(12), time(20), time(23, 59)]:
+            slot = schedule.slot_at(t)
+            assert slot.shader is not None
+            assert slot.shader.name == "lone"
+            assert slot.until is None
+
+    def test_overlapping(self, config_factory: ConfigFactory):
+        config_factory.write(
+            {
+                "shaders": [
+                    {
+                        "name": "inner",
+                        "start_time": time.fromisoformat("11:00"),
+                        "end_time": time.fromisoformat("12:00"),
+                    },
+                    {
+                        "name": "outer",
+                        "start_time": time.fromisoformat("10:00"),
+                        "end_time": time.fromisoformat("14:00"),
+                    },
+                ]
+            }
+        )
+        schedule = Schedule(config_factory.get_config())
+
+        assert [
+            (slot.shader and slot.shader.name, slot.until)
+            for slot in map(schedule.slot_at, [time(9), time(10), time(11), time(12)])
+        ] == [
+            (None, time(10)),
+            ("outer", time(14)),
+            ("outer", time(14)),
+            ("outer", time(14)),
+        ]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_same_as_linear_scan(self, seed: int, config_factory: ConfigFactory):
+        rng = random.Random(seed)
+        shaders: list[dict] = [{"name": "default", "default": True}]
+        for i in range(rng.randint(1, 12)):
+            start, end = rng.sample(range(24 * 4), 2)
+            shader = {"name": f"test{i}", "start_time": quarter(start)}
+            if rng.random() < 0.7:
+                shader["end_time"] = quarter(end)
+            shaders.append(shader)
+        rng.shuffle(shaders)
+        config_factory.write({"shaders": shaders})
+        schedule = Schedule(config_factory.get_config())
+
+        for minute in chain(range(0, 24 * 60, 15), range(7, 24 * 60, 15)):
+            t = time(*divmod(minute, 60))
+            expected = linear_scan(schedule, t)
+            slot = schedule.slot_at(t)
+            assert (slot.shader and slot.shader.name) == expected
+            if slot.until is not None:
+                assert linear_scan(schedule, slot.until) != expected
+                assert all(
+                    linear_scan(schedule, time(*divmod(m, 60))) == expected
+                    for m in minutes_between(t, slot.until)
+                )
+
+
+def quarter(n: int) -> time:
+    return time(*divmod(n * 15, 60))
+
+
+def minutes_between(start: time, end: time) -> list[int]:
+    a, b = start.hour * 60 + start.minute, end.hour * 60 + end.minute
+    return [m % (24 * 60) for m in range(a, b if b > a else b + 24 * 60, 15)]
+
+
+def linear_scan(schedule: Schedule, t: time) -> str | None:
+    for entry in schedule._resolved_entries():
+        start, end = entry.start_time, entry.end_time
+        if start == end or is_time_between(t, start, end):
+            return entry.name
+    default = schedule.default_shader
+    return default.name if default is not None else None
+
+
 class TestEventTimes:
     def test(self, config_factory: ConfigFactory):
         config_factory.write(
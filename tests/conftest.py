@@ -1,13 +1,14 @@
 import os
 import sysconfig
-from contextlib import suppress
+from contextlib import ExitStack, suppress
 from functools import lru_cache
 from pathlib import Path
 
 import pytest
 
-from hyprshade.shader import hyprctl
+from hyprshade.shader import hyprctl, ipc
 from hyprshade.shader.core import Shader
+from tests.helpers import FakeHyprland
 from tests.types import ConfigFactory, HyprshadeDirectoryName, ShaderPathFactory
 
 
@@ -32,9 +33,16 @@ def _save_and_restore_shader():
 
 
 class Isolation:
-    def __init__(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    def __init__(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        *,
+        hyprland: bool = False,
+    ):
         self.state_dir = tmp_path / "_state"
         self.config_dir = tmp_path / "_config"
+        self.runtime_dir = tmp_path / "_run"
 
         self.usr_dir = tmp_path / "_usr"
 
@@ -48,6 +56,7 @@ class Isolation:
         self.systemd_timer_path = self.systemd_user_dir / "hyprshade.timer"
 
         self._monkeypatch = monkeypatch
+        self._hyprland = hyprland
 
         self._old_cwd = os.getcwd()
         self.cwd = str(tmp_path)
@@ -62,6 +71,13 @@ class Isolation:
         }
         for key, value in env.items():
             self._monkeypatch.setenv(key, value)
+        if not self._hyprland:
+            # Keep tests that don't require Hyprland off a live instance socket
+            self._monkeypatch.setenv("XDG_RUNTIME_DIR", str(self.runtime_dir))
+            self._monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE", raising=False)
+            self._monkeypatch.setattr(
+                ipc, "LEGACY_INSTANCES_DIR", str(self.runtime_dir / "legacy")
+            )
 
         def _sysconfig_get_path(name: str) -> str:
             match name:
@@ -106,12 +122,37 @@ class Isolation:
 
 @pytest.fixture(autouse=True)
 def isolation(
-    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
 ):
-    with Isolation(tmp_path_factory.mktemp("isolation"), monkeypatch) as i:
+    hyprland = request.node.get_closest_marker("requires_hyprland") is not None
+    with Isolation(
+        tmp_path_factory.mktemp("isolation"), monkeypatch, hyprland=hyprland
+    ) as i:
         yield i
 
 
+@pytest.fixture()
+def fake_hyprland(isolation: Isolation, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+    with FakeHyprland(isolation.runtime_dir / "hypr") as fake:
+        monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", fake.signature)
+        yield fake
+
+
+@pytest.fixture()
+def fake_hyprland_instances(isolation: Isolation, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+    with ExitStack() as stack:
+        fakes = [
+            stack.enter_context(FakeHyprland(isolation.runtime_dir / "hypr", name))
+            for name in ["fake-a", "fake-b", "fake-c"]
+        ]
+        monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", fakes[0].signature)
+        yield fakes
+
+
 @pytest.fixture()
 def _clear_screen_shader():
     with suppress(hyprctl.HyprctlError, FileNotFoundError):
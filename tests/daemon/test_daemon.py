@@ -0,0 +1,198 @@
+from datetime import datetime, time
+from pathlib import Path
+
+import pytest
+
+from hyprshade.daemon.core import Daemon
+from tests.helpers import FakeHyprland
+from tests.types import ConfigFactory, ShaderPathFactory
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> Clock:
+    return Clock(datetime.fromisoformat("2024-04-08 10:00"))
+
+
+@pytest.fixture()
+def schedule_config(
+    config_factory: ConfigFactory, shader_path_factory: ShaderPathFactory
+) -> ConfigFactory:
+    for name in ["foo", "bar", "baz"]:
+        shader_path_factory(name)
+    config_factory.write(
+        {
+            "shaders": [
+                {
+                    "name": "foo",
+                    "start_time": time.fromisoformat("12:00"),
+                    "end_time": time.fromisoformat("13:00"),
+                },
+                {"name": "bar", "default": True},
+            ]
+        }
+    )
+    return config_factory
+
+
+@pytest.mark.usefixtures("fake_hyprland")
+class TestDeadline:
+    @pytest.mark.parametrize(
+        ("now", "expected"),
+        [
+            ("2024-04-08 10:00", "2024-04-08 12:00"),
+            ("2024-04-08 12:00", "2024-04-08 13:00"),
+            ("2024-04-08 12:30", "2024-04-08 13:00"),
+            ("2024-04-08 13:00", "2024-04-09 12:00"),
+            ("2024-04-08 23:59", "2024-04-09 12:00"),
+        ],
+    )
+    def test_it(self, now: str, expected: str, schedule_config: ConfigFactory):
+        daemon = Daemon(
+            schedule_config.get_config(), now=Clock(datetime.fromisoformat(now))
+        )
+        daemon.apply()
+        assert daemon.deadline == datetime.fromisoformat(expected)
+
+    def test_no_entries(
+        self, config_factory: ConfigFactory, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path_factory("foo")
+        config_factory.write({"shaders": [{"name": "foo", "default": True}]})
+        daemon = Daemon(config_factory.get_config())
+        daemon.apply()
+        assert daemon.deadline is None
+
+
+@pytest.mark.usefixtures("fake_hyprland")
+class TestDaemon:
+    def test_applies_on_enter(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("bar.glsl")
+            assert daemon.deadline == datetime.fromisoformat("2024-04-08 12:00")
+
+    def test_applies_at_deadline(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            clock.now = datetime.fromisoformat("2024-04-08 12:00")
+            daemon.poll(timeout=0)
+
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("foo.glsl")
+            assert daemon.deadline == datetime.fromisoformat("2024-04-08 13:00")
+
+    def test_idle_before_deadline(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            requests = len(fake_hyprland.requests)
+            daemon.poll(timeout=0)
+
+            assert len(fake_hyprland.requests) == requests
+
+    def test_wall_clock_jump(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            waits: list[float | None] = []
+
+            def select(timeout: float | None = None):
+                waits.append(timeout)
+                # Resume from suspend past the deadline.
+                clock.now = datetime.fromisoformat("2024-04-08 12:30")
+                return []
+
+            monkeypatch.setattr(daemon.selector, "select", select)
+            daemon.poll()
+
+            assert waits == [Daemon.MAX_WAIT]
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("foo.glsl")
+
+    def test_reloads_config(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            schedule_config.write({"shaders": [{"name": "baz", "default": True}]})
+            daemon.poll(timeout=5)
+
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("baz.glsl")
+            assert daemon.deadline is None
+
+    def test_reloads_symlinked_config(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+        tmp_path: Path,
+    ):
+        (dotfiles := tmp_path / "dotfiles").mkdir()
+        target = dotfiles / "hyprshade.toml"
+        schedule_config.path.rename(target)
+        schedule_config.path.symlink_to(target)
+
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            schedule_config.write({"shaders": [{"name": "baz", "default": True}]})
+            daemon.poll(timeout=5)
+
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("baz.glsl")
+
+    def test_reloads_config_at_deadline(
+        self,
+        fake_hyprland: FakeHyprland,
+        schedule_config: ConfigFactory,
+        clock: Clock,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        with Daemon(schedule_config.get_config(), now=clock) as daemon:
+            monkeypatch.setattr(daemon.selector, "select", lambda timeout=None: [])
+            schedule_config.write({"shaders": [{"name": "baz", "default": True}]})
+            clock.now = datetime.fromisoformat("2024-04-08 12:00")
+            daemon.poll()
+
+            assert fake_hyprland.screen_shader is not None
+            assert fake_hyprland.screen_shader.endswith("baz.glsl")
+
+    def test_reload_if_changed(self, schedule_config: ConfigFactory):
+        daemon = Daemon(schedule_config.get_config())
+        assert not daemon.reload_if_changed()
+
+        schedule_config.path.write_text(schedule_config.path.read_text() + "\n\n")
+        assert daemon.reload_if_changed()
+
+    def test_reload_invalid_config(self, schedule_config: ConfigFactory):
+        daemon = Daemon(schedule_config.get_config())
+        config = daemon.config
+        schedule_config.path.write_text("not toml")
+
+        assert not daemon.reload_if_changed()
+        assert daemon.config is config
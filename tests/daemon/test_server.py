@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hyprshade import client
+from hyprshade.cli.utils import ContextObject
+from hyprshade.daemon.server import CommandServer
+from tests.conftest import Isolation
+
+
+@pytest.fixture()
+def server(isolation: Isolation):
+    server = CommandServer(str(isolation.runtime_dir / "hyprshade" / "test.sock"))
+    yield server
+    server.close()
+
+
+class TestRespond:
+    @pytest.mark.usefixtures("fake_hyprland")
+    def test_runs_command(self, server: CommandServer):
+        response = server.respond(client.make_request(["current"]), ContextObject(None))
+        assert response == {"exit_code": 0, "stdout": "", "stderr": ""}
+
+    def test_env_mismatch(self, server: CommandServer):
+        request = client.make_request(["off"])
+        request["env"]["HYPRSHADE_SHADERS_DIR"] = "/doesnotexist"
+        assert server.respond(request, ContextObject(None)) == {"fallback": True}
+
+    def test_cwd_missing(self, server: CommandServer, tmp_path: Path):
+        request = client.make_request(["off"])
+        request["cwd"] = str(tmp_path / "doesnotexist")
+        assert server.respond(request, ContextObject(None)) == {"fallback": True}
+
+    @pytest.mark.usefixtures("fake_hyprland")
+    def test_restores_cwd(self, server: CommandServer, tmp_path: Path):
+        cwd = os.getcwd()
+        request = client.make_request(["off"])
+        request["cwd"] = str(tmp_path)
+        server.respond(request, ContextObject(None))
+        assert os.getcwd() == cwd
+
+
+class TestBind:
+    def test_stale_socket(self, server: CommandServer):
+        server.sock.close()
+        CommandServer(server.path).close()
+
+    def test_already_running(self, server: CommandServer):
+        with pytest.raises(RuntimeError, match="already listening"):
+            CommandServer(server.path)
+
+    def test_close_removes_socket(self, server: CommandServer):
+        server.close()
+        assert not os.path.exists(server.path)
@@ -1,4 +1,5 @@
+from .fake_hyprland import FakeHyprland
 from .freeze_time import freeze_time
 from .systemd_unit_parser import SystemdUnitParser
 
-__all__ = ["freeze_time", "SystemdUnitParser"]
+__all__ = ["FakeHyprland", "freeze_time", "SystemdUnitParser"]
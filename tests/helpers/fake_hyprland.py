@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from hyprshade.shader import hyprctl, ipc
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class FakeHyprland:
+    """Stand-in for a Hyprland instance's request socket.
+
+    Understands the subset of requests Hyprshade makes: `keyword` and
+    `getoption` (with or without the `j` flag). Every request is recorded in
+    `requests` once its reply is ready. `latency` delays each reply, which is
+    useful for benchmarking. `events` is the instance's event socket.
+    """
+
+    def __init__(
+        self, instances_dir: Path, signature: str = "fake", *, latency: float = 0.0
+    ):
+        self.signature = signature
+        self.socket_path = instances_dir / signature / ipc.SOCKET_NAME
+        self.latency = latency
+        self.options: dict[str, str] = {"decoration:screen_shader": hyprctl.EMPTY_STR}
+        self.requests: list[str] = []
+        self.events = FakeEventSocket(instances_dir / signature / ipc.EVENT_SOCKET_NAME)
+        self._server: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> FakeHyprland:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        server.listen()
+        self._server = server
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self.events.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.events.__exit__(*exc)
+        assert self._server is not None
+        assert self._thread is not None
+        self._server.shutdown(socket.SHUT_RDWR)
+        self._server.close()
+        self._thread.join()
+        os.unlink(self.socket_path)
+
+    @property
+    def screen_shader(self) -> str | None:
+        shader = self.options["decoration:screen_shader"]
+        return None if shader == hyprctl.EMPTY_STR else shader
+
+    def _serve(self) -> None:
+        assert self._server is not None
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            with conn:
+                command = conn.recv(65536).decode("utf-8")
+                if self.latency:
+                    time.sleep(self.latency)
+                reply = self.reply(command)
+                self.requests.append(command)
+                conn.sendall(reply.encode("utf-8"))
+
+    def reply(self, command: str) -> str:
+        flags, sep, rest = command.partition("/")
+        if not sep or " " in flags:
+            flags, rest = "", command
+        name, _, args = rest.partition(" ")
+        match name:
+            case "keyword":
+                option, _, value = args.partition(" ")
+                if option not in self.options:
+                    return f"config option <{option}> does not exist."
+                self.options[option] = value
+                return "ok"
+            case "getoption":
+                if args not in self.options:
+                    return "no such option"
+                if "j" in flags:
+                    return json.dumps(
+                        {"option": args, "str": self.options[args], "set": True}
+                    )
+                return f"str: {self.options[args]}\nset: true"
+            case _:
+                return "unknown request"
+
+
+class FakeEventSocket:
+    """Stand-in for a Hyprland instance's event socket.
+
+    `emit` writes an event to every connected client; exiting the context
+    closes their connections, as Hyprland does when it exits.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._clients: list[socket.socket] = []
+        self._connected = threading.Condition()
+        self._server: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> FakeEventSocket:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.path))
+        server.listen()
+        self._server = server
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        assert self._server is not None
+        assert self._thread is not None
+        self._server.shutdown(socket.SHUT_RDWR)
+        self._server.close()
+        self._thread.join()
+        self.disconnect()
+        os.unlink(self.path)
+
+    def emit(self, name: str, data: str = "") -> None:
+        line = f"{name}{ipc.EVENT_DELIMITER}{data}\n".encode()
+        with self._connected:
+            for client in self._clients:
+                client.sendall(line)
+
+    def disconnect(self) -> None:
+        with self._connected:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+
+    def wait_for_clients(self, count: int = 1, timeout: float = 5.0) -> None:
+        with self._connected:
+            if not self._connected.wait_for(
+                lambda: len(self._clients) >= count, timeout
+            ):
+                raise TimeoutError(f"Expected {count} event socket client(s)")
+
+    def _accept(self) -> None:
+        assert self._server is not None
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            with self._connected:
+                self._clients.append(conn)
+                self._connected.notify_all()
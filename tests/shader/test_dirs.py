@@ -1,3 +1,5 @@
+import pytest
+
 from hyprshade.shader.core import Shader
 from tests.conftest import Isolation
 
@@ -29,3 +31,29 @@ class TestDirs:
             (isolation.hyprshade_system_dir / "shaders"),
         ]
         assert list(map(str, dirs)) == Shader.dirs.all()
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [(None, True), ("1", True), ("0", False), ("False", False), ("off", False)],
+    )
+    def test_follow_symlinks(
+        self, value: str | None, expected: bool, monkeypatch: pytest.MonkeyPatch
+    ):
+        if value is None:
+            monkeypatch.delenv(Shader.dirs.FOLLOW_SYMLINKS_ENV_VAR_NAME, raising=False)
+        else:
+            monkeypatch.setenv(Shader.dirs.FOLLOW_SYMLINKS_ENV_VAR_NAME, value)
+        assert Shader.dirs.follow_symlinks() is expected
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [(None, 1), ("4", 4), ("8", 8), ("0", 1), ("nope", 1)],
+    )
+    def test_scan_workers(
+        self, value: str | None, expected: int, monkeypatch: pytest.MonkeyPatch
+    ):
+        if value is None:
+            monkeypatch.delenv(Shader.dirs.SCAN_WORKERS_ENV_VAR_NAME, raising=False)
+        else:
+            monkeypatch.setenv(Shader.dirs.SCAN_WORKERS_ENV_VAR_NAME, value)
+        assert Shader.dirs.scan_workers() == expected
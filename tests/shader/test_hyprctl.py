@@ -3,7 +3,8 @@ from pathlib import Path
 
 import pytest
 
-from hyprshade.shader import hyprctl
+from hyprshade.shader import hyprctl, ipc
+from tests.helpers import FakeHyprland
 
 
 @pytest.mark.requires_hyprland()
@@ -36,12 +37,19 @@ def test_json_no_str():
         hyprctl.get_screen_shader()
 
 
+def mock_subprocess_run(monkeypatch: pytest.MonkeyPatch, run) -> None:
+    # Without a socket path, hyprctl is always run as a subprocess, even when
+    # the tests run inside a Hyprland session.
+    monkeypatch.setattr(ipc, "socket_path", lambda *args, **kwargs: None)
+    monkeypatch.setattr(hyprctl.subprocess, "run", run)
+
+
 @pytest.fixture()
 def _mock_hyprctl_failure(monkeypatch: pytest.MonkeyPatch):
     def _subprocess_run_failure(args, **kwargs) -> subprocess.CompletedProcess:
-        raise subprocess.CalledProcessError(1, args)
+        return subprocess.CompletedProcess(args, 1, stdout="", stderr="error")
 
-    monkeypatch.setattr(hyprctl.subprocess, "run", _subprocess_run_failure)
+    mock_subprocess_run(monkeypatch, _subprocess_run_failure)
 
 
 @pytest.fixture()
@@ -54,7 +62,7 @@ def _mock_hyprctl_invalid_json(monkeypatch: pytest.MonkeyPatch):
             stderr="",
         )
 
-    monkeypatch.setattr(hyprctl.subprocess, "run", _subprocess_run_invalid_json)
+    mock_subprocess_run(monkeypatch, _subprocess_run_invalid_json)
 
 
 @pytest.fixture()
@@ -64,4 +72,67 @@ def _mock_hyprctl_json_no_str(monkeypatch: pytest.MonkeyPatch):
             args=args, returncode=0, stdout='{"int": 1}', stderr=""
         )
 
-    monkeypatch.setattr(hyprctl.subprocess, "run", _subprocess_run_no_str)
+    mock_subprocess_run(monkeypatch, _subprocess_run_no_str)
+
+
+class TestWatchScreenShader:
+    def test_event(self, fake_hyprland: FakeHyprland):
+        watch = hyprctl.watch_screen_shader(interval=60)
+        assert next(watch) is None
+        fake_hyprland.events.wait_for_clients()
+
+        fake_hyprland.options["decoration:screen_shader"] = "foo"
+        fake_hyprland.events.emit("configreloaded")
+        assert next(watch) == "foo"
+        watch.close()
+
+    def test_interval(self, fake_hyprland: FakeHyprland):
+        watch = hyprctl.watch_screen_shader(interval=0.01)
+        assert next(watch) is None
+
+        hyprctl.set_screen_shader("foo")
+        assert next(watch) == "foo"
+        hyprctl.clear_screen_shader()
+        assert next(watch) is None
+        watch.close()
+
+    def test_unchanged(self, fake_hyprland: FakeHyprland):
+        watch = hyprctl.watch_screen_shader(interval=0.01)
+        assert next(watch) is None
+        fake_hyprland.events.wait_for_clients()
+
+        fake_hyprland.events.emit("configreloaded")
+        fake_hyprland.events.disconnect()
+        assert list(watch) == []
+
+    def test_no_event_socket(
+        self, fake_hyprland: FakeHyprland, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(hyprctl.ipc, "event_socket_path", lambda: None)
+        watch = hyprctl.watch_screen_shader(interval=0.01)
+        assert next(watch) is None
+
+        fake_hyprland.options["decoration:screen_shader"] = "foo"
+        assert next(watch) == "foo"
+        watch.close()
+
+
+class TestSetScreenShaderAllInstances:
+    def test_all(self, fake_hyprland_instances: list[FakeHyprland]):
+        results = hyprctl.set_screen_shader_all_instances("foo")
+
+        assert results == [
+            hyprctl.InstanceResult(f.signature, None) for f in fake_hyprland_instances
+        ]
+        assert [f.screen_shader for f in fake_hyprland_instances] == ["foo"] * 3
+
+        hyprctl.set_screen_shader_all_instances(None)
+        assert [f.screen_shader for f in fake_hyprland_instances] == [None] * 3
+
+    def test_failure(self, fake_hyprland_instances: list[FakeHyprland]):
+        del fake_hyprland_instances[1].options["decoration:screen_shader"]
+        results = hyprctl.set_screen_shader_all_instances("foo")
+
+        assert [r.error is None for r in results] == [True, False, True]
+        assert isinstance(results[1].error, hyprctl.HyprctlError)
+        assert fake_hyprland_instances[2].screen_shader == "foo"
@@ -0,0 +1,139 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hyprshade.shader.core import PureShader, Shader
+from hyprshade.shader.index import ShaderIndex
+from tests.types import ShaderPathFactory
+
+
+def backdate(*paths: Path, seconds: int = 60) -> None:
+    for path in paths:
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class TestBuild:
+    def test_names(self, shader_path_factory: ShaderPathFactory):
+        foo = shader_path_factory("foo", "env")
+        bar = shader_path_factory("bar", "system", extension="glsl.mustache")
+        index = ShaderIndex.build(Shader.dirs.all())
+
+        assert index.lookup("foo") == str(foo)
+        assert index.lookup("bar") == str(bar)
+        assert index.lookup("baz") is None
+
+    def test_priority(self, shader_path_factory: ShaderPathFactory):
+        priority = shader_path_factory("foo", "user_hypr")
+        _other = shader_path_factory("foo", "system")
+        index = ShaderIndex.build(Shader.dirs.all())
+
+        assert index.lookup("foo") == str(priority)
+
+    def test_nested(self, tmp_path: Path):
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (nested := tmp_path / "a" / "b" / "foo.glsl").touch()
+        index = ShaderIndex.build([str(tmp_path)])
+
+        assert index.lookup("foo") == str(nested)
+        assert [s[0] for s in index.stamps] == [
+            str(tmp_path),
+            str(tmp_path / "a"),
+            str(tmp_path / "a" / "b"),
+        ]
+
+    def test_symlinked_root(self, tmp_path: Path):
+        (hyprshade := tmp_path / "hyprshade").mkdir()
+        (hyprshade / "foo.glsl").touch()
+        (hypr := tmp_path / "hypr").symlink_to(hyprshade)
+        (hyprshade / "loop").symlink_to(tmp_path)
+        index = ShaderIndex.build([str(hypr), str(hyprshade)])
+
+        assert index.lookup("foo") == str(hypr / "foo.glsl")
+        assert [s[0] for s in index.stamps] == [str(hypr), str(hypr / "loop")]
+
+
+class TestLoad:
+    def test_persists(self, tmp_path: Path):
+        (tmp_path / "foo.glsl").touch()
+        backdate(tmp_path)
+        ShaderIndex.load([str(tmp_path)])
+
+        assert os.path.isfile(ShaderIndex.path())
+        assert ShaderIndex.read() is not None
+
+    def test_does_not_persist_racy(self, tmp_path: Path):
+        (tmp_path / "foo.glsl").touch()
+        ShaderIndex.load([str(tmp_path)])
+
+        assert not os.path.exists(ShaderIndex.path())
+
+    def test_uses_persisted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        (tmp_path / "foo.glsl").touch()
+        backdate(tmp_path)
+        ShaderIndex.load([str(tmp_path)])
+
+        def _build(*args, **kwargs):
+            pytest.fail("index should not be rebuilt")
+
+        monkeypatch.setattr(ShaderIndex, "build", _build)
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") is not None
+
+    def test_invalidated_by_new_file(self, tmp_path: Path):
+        (tmp_path / "sub").mkdir()
+        backdate(tmp_path, tmp_path / "sub")
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") is None
+
+        (foo := tmp_path / "sub" / "foo.glsl").touch()
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") == str(foo)
+
+    def test_invalidated_by_removed_directory(self, tmp_path: Path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "foo.glsl").touch()
+        backdate(tmp_path, tmp_path / "sub")
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") is not None
+
+        (tmp_path / "sub" / "foo.glsl").unlink()
+        (tmp_path / "sub").rmdir()
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") is None
+
+    def test_invalidated_by_roots(self, tmp_path_factory: pytest.TempPathFactory):
+        root1 = tmp_path_factory.mktemp("root1")
+        root2 = tmp_path_factory.mktemp("root2")
+        (foo := root2 / "foo.glsl").touch()
+        backdate(root1, root2)
+        assert ShaderIndex.load([str(root1)]).lookup("foo") is None
+        assert ShaderIndex.load([str(root1), str(root2)]).lookup("foo") == str(foo)
+
+    def test_invalidated_by_follow_symlinks(self, tmp_path: Path):
+        (target := tmp_path / "target").mkdir()
+        (target / "foo.glsl").touch()
+        (root := tmp_path / "root").mkdir()
+        (root / "link").symlink_to(target)
+        backdate(target, root)
+        ShaderIndex.load([str(root)])
+
+        assert (
+            ShaderIndex.load([str(root)], follow_symlinks=False).lookup("foo") is None
+        )
+        assert ShaderIndex.load([str(root)]).lookup("foo") is not None
+
+    @pytest.mark.parametrize(
+        "content", ["", "not json", "[]", '{"version": 0}', '{"version": 1}']
+    )
+    def test_corrupt(self, content: str, tmp_path: Path):
+        (foo := tmp_path / "foo.glsl").touch()
+        os.makedirs(os.path.dirname(ShaderIndex.path()), exist_ok=True)
+        Path(ShaderIndex.path()).write_text(content)
+
+        assert ShaderIndex.load([str(tmp_path)]).lookup("foo") == str(foo)
+
+
+def test_pure_shader_uses_index(shader_path_factory: ShaderPathFactory):
+    shader_path = shader_path_factory("foo")
+    assert PureShader("foo")._resolve_path() == str(shader_path)
+
+    shader_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        PureShader("foo")._resolve_path()
@@ -0,0 +1,91 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hyprshade.shader.core import PureShader, Shader
+from hyprshade.shader.instances import InstanceEntry, InstanceIndex
+from tests.helpers import FakeHyprland
+from tests.types import ShaderPathFactory
+
+TEMPLATE = "float x = {{x}};"
+
+
+@pytest.fixture()
+def template_path(shader_path_factory: ShaderPathFactory) -> Path:
+    return shader_path_factory("foo", extension="glsl.mustache", text=TEMPLATE)
+
+
+class TestInstanceIndex:
+    def test_recorded_at_render(self, template_path: Path):
+        path = Shader("foo", {"x": 1.0})._rendered_path()
+        entry = InstanceIndex.load().lookup(path)
+
+        assert entry is not None
+        assert entry.source == str(template_path)
+        assert entry.name == "foo"
+        assert entry.variables == Shader._variables_hash({"x": 1.0})
+
+    def test_distinct_variables(self, template_path: Path):
+        path1 = Shader("foo", {"x": 1.0})._rendered_path()
+        path2 = Shader("foo", {"x": 2.0})._rendered_path()
+        entry1, entry2 = map(InstanceIndex.load().lookup, [path1, path2])
+
+        assert entry1 is not None
+        assert entry2 is not None
+        assert entry1.variables != entry2.variables
+
+    def test_drops_missing_instances(self, template_path: Path):
+        path1 = Shader("foo", {"x": 1.0})._rendered_path()
+        os.unlink(path1)
+        path2 = Shader("foo", {"x": 2.0})._rendered_path()
+
+        assert InstanceIndex.load().lookup(path1) is None
+        assert InstanceIndex.load().lookup(path2) is not None
+
+    def test_load_memoized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        InstanceIndex.record(str(tmp_path), InstanceEntry("src", "name", None))
+        index = InstanceIndex.load()
+
+        monkeypatch.setattr(InstanceIndex, "read", lambda: pytest.fail("reread"))
+        assert InstanceIndex.load() is index
+
+    @pytest.mark.parametrize(
+        "content", ["", "not json", "[]", '{"version": 1}', '{"version": 0}']
+    )
+    def test_corrupt(self, content: str):
+        os.makedirs(os.path.dirname(InstanceIndex.path()), exist_ok=True)
+        Path(InstanceIndex.path()).write_text(content)
+        assert InstanceIndex.load().entries == {}
+
+
+class TestCurrent:
+    def test_uses_index(
+        self,
+        fake_hyprland: FakeHyprland,
+        template_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        Shader("foo", {"x": 1.0}).on()
+
+        def extract(path: str):
+            pytest.fail("instance metadata should not be read")
+
+        monkeypatch.setattr(Shader, "_extract_template_instance_metadata", extract)
+        assert Shader.current() == PureShader(str(template_path))
+
+    def test_falls_back_to_metadata(
+        self, fake_hyprland: FakeHyprland, template_path: Path
+    ):
+        Shader("foo", {"x": 1.0}).on()
+        os.unlink(InstanceIndex.path())
+
+        current = Shader.current()
+        assert current == PureShader(str(template_path))
+        assert current is not None
+        assert current.template_instance_path is not None
+        entry = InstanceIndex.load().lookup(current.template_instance_path)
+        assert entry is not None
+        assert entry._replace(used=0.0) == InstanceEntry(
+            str(template_path), "foo", None
+        )
@@ -0,0 +1,193 @@
+import socket
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from hyprshade.shader import hyprctl, ipc
+from tests.conftest import Isolation
+from tests.helpers import FakeHyprland
+
+
+class TestSocketPath:
+    def test_no_signature(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE", raising=False)
+        assert ipc.socket_path() is None
+
+    def test_not_running(self, isolation: Isolation, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+        assert ipc.socket_path("doesnotexist") is None
+
+    def test_runtime_dir(self, fake_hyprland: FakeHyprland):
+        assert ipc.socket_path() == str(fake_hyprland.socket_path)
+        assert ipc.socket_path(fake_hyprland.signature) == str(
+            fake_hyprland.socket_path
+        )
+
+
+class TestCommandFromArgs:
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            (
+                ["hyprctl", "keyword", "decoration:screen_shader", "/foo bar.glsl"],
+                "keyword decoration:screen_shader /foo bar.glsl",
+            ),
+            (
+                ["hyprctl", "-j", "getoption", "decoration:screen_shader"],
+                "j/getoption decoration:screen_shader",
+            ),
+        ],
+    )
+    def test_translate(self, args: list[str], expected: str):
+        assert ipc.command_from_args(args) == expected
+
+    def test_not_hyprctl(self):
+        with pytest.raises(ValueError, match="Not a hyprctl command"):
+            ipc.command_from_args(["ls"])
+
+    def test_unsupported_option(self):
+        with pytest.raises(ValueError, match="Unsupported hyprctl option"):
+            ipc.command_from_args(["hyprctl", "--foo", "getoption"])
+
+
+class TestRun:
+    def test_keyword(self, fake_hyprland: FakeHyprland):
+        path = str(fake_hyprland.socket_path)
+        result = ipc.run(["hyprctl", "keyword", "decoration:screen_shader", "x"], path)
+
+        assert result.returncode == 0
+        assert result.stdout == "ok"
+        assert fake_hyprland.screen_shader == "x"
+
+    def test_keyword_error(self, fake_hyprland: FakeHyprland):
+        path = str(fake_hyprland.socket_path)
+        result = ipc.run(["hyprctl", "keyword", "foo:bar", "x"], path)
+
+        assert result.returncode == 1
+        with pytest.raises(subprocess.CalledProcessError):
+            result.check_returncode()
+
+
+@pytest.mark.usefixtures("_fail_on_subprocess")
+class TestHyprctlOverSocket:
+    def test_set_get_clear(self, fake_hyprland: FakeHyprland, shader_path: Path):
+        hyprctl.set_screen_shader(str(shader_path))
+        assert hyprctl.get_screen_shader() == str(shader_path)
+
+        hyprctl.clear_screen_shader()
+        assert hyprctl.get_screen_shader() is None
+        assert fake_hyprland.requests == [
+            f"keyword decoration:screen_shader {shader_path}",
+            "j/getoption decoration:screen_shader",
+            f"keyword decoration:screen_shader {hyprctl.EMPTY_STR}",
+            "j/getoption decoration:screen_shader",
+        ]
+
+    @pytest.mark.usefixtures("fake_hyprland")
+    def test_error(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(FakeHyprland, "reply", lambda self, command: "error")
+        with pytest.raises(hyprctl.HyprctlError):
+            hyprctl.set_screen_shader("foo")
+
+    @pytest.mark.usefixtures("fake_hyprland")
+    def test_json_error(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(FakeHyprland, "reply", lambda self, command: "{")
+        with pytest.raises(hyprctl.HyprctlJSONError):
+            hyprctl.get_screen_shader()
+
+
+def test_falls_back_to_subprocess(
+    fake_hyprland: FakeHyprland, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+
+    def _request(path: str, command: str) -> str:
+        raise ConnectionRefusedError
+
+    def _subprocess_run(args, **kwargs) -> subprocess.CompletedProcess:
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout="ok", stderr="")
+
+    monkeypatch.setattr(ipc, "request", _request)
+    monkeypatch.setattr(hyprctl.subprocess, "run", _subprocess_run)
+    hyprctl.set_screen_shader("foo")
+
+    assert calls == [["hyprctl", "keyword", "decoration:screen_shader", "foo"]]
+
+
+@pytest.fixture()
+def _fail_on_subprocess(monkeypatch: pytest.MonkeyPatch):
+    def _subprocess_run(args, **kwargs):
+        pytest.fail(f"unexpected subprocess: {args!r}")
+
+    monkeypatch.setattr(hyprctl.subprocess, "run", _subprocess_run)
+
+
+class TestEventSocket:
+    def test_path(self, fake_hyprland: FakeHyprland):
+        assert ipc.event_socket_path() == str(fake_hyprland.events.path)
+
+    def test_read(self, fake_hyprland: FakeHyprland):
+        with ipc.EventSocket(str(fake_hyprland.events.path)) as events:
+            fake_hyprland.events.wait_for_clients()
+            fake_hyprland.events.emit("configreloaded")
+            fake_hyprland.events.emit("activewindow", "kitty,>>title")
+
+            received: list[tuple[str, str]] = []
+            while len(received) < 2:
+                received.extend(events.read())
+
+        assert received == [("configreloaded", ""), ("activewindow", "kitty,>>title")]
+
+    def test_wait(self, fake_hyprland: FakeHyprland):
+        with ipc.EventSocket(str(fake_hyprland.events.path)) as events:
+            fake_hyprland.events.wait_for_clients()
+            fake_hyprland.events.emit("activewindow", "kitty,title")
+            assert not events.wait({"configreloaded"}, 0.1)
+
+            fake_hyprland.events.emit("configreloaded")
+            assert events.wait({"configreloaded"}, 5)
+
+    def test_closed(self, fake_hyprland: FakeHyprland):
+        with ipc.EventSocket(str(fake_hyprland.events.path)) as events:
+            fake_hyprland.events.wait_for_clients()
+            fake_hyprland.events.disconnect()
+            with pytest.raises(EOFError):
+                events.wait({"configreloaded"}, 5)
+
+
+class TestInstanceSignatures:
+    def test_none(self, isolation: Isolation, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+        monkeypatch.setattr(ipc, "LEGACY_INSTANCES_DIR", str(isolation.runtime_dir))
+        assert ipc.instance_signatures() == []
+
+    def test_instances(
+        self,
+        fake_hyprland_instances: list[FakeHyprland],
+        isolation: Isolation,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(ipc, "LEGACY_INSTANCES_DIR", str(isolation.runtime_dir))
+        (isolation.runtime_dir / "hypr" / "stopped").mkdir()
+        assert ipc.instance_signatures() == [
+            f.signature for f in fake_hyprland_instances
+        ]
+
+    def test_stale(
+        self,
+        fake_hyprland_instances: list[FakeHyprland],
+        isolation: Isolation,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(ipc, "LEGACY_INSTANCES_DIR", str(isolation.runtime_dir))
+        (stale := isolation.runtime_dir / "hypr" / "stale").mkdir()
+        for name in [ipc.SOCKET_NAME, ipc.EVENT_SOCKET_NAME]:
+            # Closing a bound socket leaves its file behind, as a crash does.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.bind(str(stale / name))
+
+        assert ipc.instance_signatures() == [
+            f.signature for f in fake_hyprland_instances
+        ]
@@ -0,0 +1,107 @@
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from hyprshade.shader import hyprctl, recording
+from hyprshade.shader.recording import RecordedCall, Replayer, ReplayError
+from tests.helpers import FakeHyprland
+
+
+@pytest.fixture()
+def _recording() -> Iterator[None]:
+    recording.start_recording()
+    yield
+    recording.stop_recording()
+
+
+@pytest.fixture()
+def _replay() -> Iterator[None]:
+    yield
+    recording.stop_replay()
+
+
+def _call(args: list[str], stdout: str, latency: float = 0.0) -> RecordedCall:
+    return RecordedCall(args, None, stdout, "", 0, latency)
+
+
+@pytest.mark.usefixtures("_recording")
+def test_record(fake_hyprland: FakeHyprland, shader_path: Path):
+    hyprctl.set_screen_shader(str(shader_path))
+    assert hyprctl.get_screen_shader() == str(shader_path)
+    keyword, getoption = recording.stop_recording()
+
+    assert keyword.args == hyprctl._set_screen_shader_args(str(shader_path))
+    assert (keyword.stdout, keyword.returncode) == ("ok", 0)
+    assert getoption.args == hyprctl.GET_SCREEN_SHADER_ARGS
+    assert str(shader_path) in getoption.stdout
+    assert getoption.latency >= 0
+    assert not recording.is_recording()
+
+
+@pytest.mark.usefixtures("_replay")
+def test_replay(fake_hyprland: FakeHyprland, shader_path: Path):
+    recording.start_recording()
+    hyprctl.set_screen_shader(str(shader_path))
+    shader = hyprctl.get_screen_shader()
+    hyprctl.clear_screen_shader()
+    calls = recording.stop_recording()
+    requests = len(fake_hyprland.requests)
+
+    recording.start_replay(calls, latency_scale=0)
+    hyprctl.set_screen_shader(str(shader_path))
+    assert hyprctl.get_screen_shader() == shader
+    assert len(fake_hyprland.requests) == requests
+
+
+class TestReplayer:
+    def test_cycles_replies(self):
+        replayer = Replayer(
+            [_call(["getoption", "x"], "1"), _call(["getoption", "x"], "2")],
+            latency_scale=0,
+        )
+
+        replies = [replayer.replay(["getoption", "x"], None).stdout for _ in range(3)]
+        assert replies == ["1", "2", "1"]
+
+    def test_matches_signature(self):
+        replayer = Replayer([_call(["getoption", "x"], "1")], latency_scale=0)
+
+        with pytest.raises(ReplayError, match="on instance other"):
+            replayer.replay(["getoption", "x"], "other")
+
+    def test_unrecorded(self):
+        replayer = Replayer([], latency_scale=0)
+
+        with pytest.raises(ReplayError, match="No recorded reply"):
+            replayer.replay(["getoption", "x"], None)
+
+    @pytest.mark.parametrize("latency_scale", [0.5, 2.0])
+    def test_latency_scale(self, latency_scale: float):
+        replayer = Replayer(
+            [_call(["getoption", "x"], "1", latency=0.05)], latency_scale=latency_scale
+        )
+
+        start = time.perf_counter()
+        replayer.replay(["getoption", "x"], None)
+        assert time.perf_counter() - start >= 0.05 * latency_scale
+
+
+def test_dump_load(tmp_path: Path):
+    path = str(tmp_path / "hyprctl.json")
+    calls = [
+        RecordedCall(["keyword", "a", "b"], "sig", "ok", "", 0, 0.001),
+        RecordedCall(["-j", "getoption", "a"], None, "{}", "err", 1, 0.002),
+    ]
+    recording.dump(path, calls)
+
+    assert recording.load(path) == calls
+
+
+@pytest.mark.parametrize(
+    "data", [[], {"version": 0, "calls": []}, {"version": 1, "calls": [{}]}]
+)
+def test_decode_invalid(data: object):
+    with pytest.raises(ValueError, match="hyprctl recording"):
+        recording.decode(data)
@@ -1,9 +1,16 @@
+import itertools
+import os
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from hyprshade.shader import hyprctl
+from hyprshade.shader import core, hyprctl
 from hyprshade.shader.core import PureShader, Shader
+from hyprshade.shader.instances import InstanceIndex
+from hyprshade.template import mustache
+from tests.helpers import FakeHyprland
 from tests.types import HyprshadeDirectoryName, ShaderPathFactory
 
 
@@ -50,6 +57,42 @@ class TestPureShaderEq:
         assert PureShader("foo") != PureShader(str(shader_path2))
         assert PureShader(str(shader_path1)) != PureShader("bar")
 
+    def test_memoized(
+        self,
+        shader_path_factory: ShaderPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        shader_path_factory("foo")
+        shader1, shader2 = PureShader("foo"), PureShader("foo")
+        assert shader1 == shader2
+
+        stats: list[tuple] = []
+        stat = os.stat
+
+        def counting_stat(*args, **kwargs):
+            stats.append(args)
+            return stat(*args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", counting_stat)
+        assert shader1 == shader2
+        assert stats == []
+
+    def test_invalidate(self, shader_path_factory: ShaderPathFactory):
+        shader_path = shader_path_factory("foo")
+        shader = PureShader("foo")
+        other = PureShader(str(shader_path))
+        assert shader == other
+
+        moved = shader_path_factory("foo", "env")
+        assert shader.path() == str(shader_path)
+        shader.invalidate()
+        assert shader.path() == str(moved)
+        assert shader != other
+
+    def test_symlink(self, shader_path: Path, tmp_path: Path):
+        (link := tmp_path / "link.glsl").symlink_to(shader_path)
+        assert PureShader(str(link)) == PureShader(str(shader_path))
+
 
 class TestPureShaderDisplay:
     def test_str(self):
@@ -155,7 +198,197 @@ class TestShaderOnOff:
 
 
 class TestShaderTemplate:
-    pass
+    TEMPLATE = "float x = {{x}};"
+
+    def test_renders(self, shader_path_factory: ShaderPathFactory):
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        path = Shader("foo", {"x": 1.0})._rendered_path()
+
+        assert Path(path).name.startswith("foo.")
+        assert Path(path).name.endswith(".glsl")
+        assert PureShader.path_to_name(path) == "foo"
+        assert Shader._get_template_instance_content_without_metadata(path).endswith(
+            "float x = 1.0;"
+        )
+
+    def test_reuses_instance(
+        self, shader_path_factory: ShaderPathFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        path = Shader("foo", {"x": 1.0})._rendered_path()
+        mtime = os.stat(path).st_mtime_ns
+
+        def render(*args, **kwargs):
+            pytest.fail("template should not be rendered again")
+
+        monkeypatch.setattr(mustache, "render", render)
+        assert Shader("foo", {"x": 1.0})._rendered_path() == path
+        assert os.stat(path).st_mtime_ns == mtime
+
+    def test_distinct_per_variables(self, shader_path_factory: ShaderPathFactory):
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        path1 = Shader("foo", {"x": 1.0})._rendered_path()
+        path2 = Shader("foo", {"x": 2.0})._rendered_path()
+
+        assert path1 != path2
+        assert os.path.exists(path1)
+        assert Shader._get_template_instance_content_without_metadata(path2).endswith(
+            "float x = 2.0;"
+        )
+        assert Shader("foo", None)._rendered_path({"x": 1.0}) == path1
+
+    def test_source_changed(self, shader_path_factory: ShaderPathFactory):
+        shader_path = shader_path_factory(
+            "foo", extension="glsl.mustache", text=self.TEMPLATE
+        )
+        path1 = Shader("foo", {"x": 1.0})._rendered_path()
+        shader_path.write_text("float y = {{x}};")
+        path2 = Shader("foo", {"x": 1.0})._rendered_path()
+
+        assert path1 != path2
+        assert Shader._get_template_instance_content_without_metadata(path2).endswith(
+            "float y = 1.0;"
+        )
+
+    def test_same_name_in_different_dirs(self, shader_path_factory: ShaderPathFactory):
+        directories: list[HyprshadeDirectoryName] = ["env", "system"]
+        paths = [
+            shader_path_factory(
+                "foo", directory, extension="glsl.mustache", text=self.TEMPLATE
+            )
+            for directory in directories
+        ]
+        instances = [Shader(str(p), {"x": 1.0})._rendered_path() for p in paths]
+
+        assert instances[0] != instances[1]
+        assert [
+            Shader._extract_template_instance_metadata(i).source for i in instances
+        ] == list(map(str, paths))
+
+    def test_skips_identical_write(
+        self, shader_path_factory: ShaderPathFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        path = Shader("foo", {"x": 1.0})._rendered_path()
+        st = os.stat(path)
+
+        # Another process may create the instance after it was found missing.
+        exists = os.path.exists
+        monkeypatch.setattr(os.path, "exists", lambda p: p != path and exists(p))
+        assert Shader("foo", {"x": 1.0})._rendered_path() == path
+        assert (os.stat(path).st_ino, os.stat(path).st_mtime_ns) == (
+            st.st_ino,
+            st.st_mtime_ns,
+        )
+
+    def test_version_changed(
+        self, shader_path_factory: ShaderPathFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        path1 = Shader("foo", {"x": 1.0})._rendered_path()
+        monkeypatch.setattr(core, "__version__", "0.0.0")
+        path2 = Shader("foo", {"x": 1.0})._rendered_path()
+
+        assert path1 != path2
+
+    def test_prunes_least_recently_used_instances(
+        self, shader_path_factory: ShaderPathFactory, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(Shader, "TEMPLATE_INSTANCES_KEPT", 2)
+        clock = itertools.count(1000, InstanceIndex.USE_RESOLUTION)
+        monkeypatch.setattr(time, "time", lambda: next(clock))
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        shader_path_factory("bar", extension="glsl.mustache", text=self.TEMPLATE)
+        bar = Shader("bar", {"x": 0.0})._rendered_path()
+        paths = [Shader("foo", {"x": float(i)})._rendered_path() for i in range(4)]
+        for path in [bar, *paths]:
+            os.utime(path, (1000, 1000))
+
+        assert Shader("foo", {"x": 0.0})._rendered_path() == paths[0]
+        newest = Shader("foo", {"x": 4.0})._rendered_path()
+
+        assert [os.path.exists(p) for p in paths] == [True, False, False, False]
+        assert os.path.exists(newest)
+        assert os.path.exists(bar)
+
+    def test_prune_spares_current(
+        self,
+        fake_hyprland: FakeHyprland,
+        shader_path_factory: ShaderPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(Shader, "TEMPLATE_INSTANCES_KEPT", 1)
+        monkeypatch.setattr(time, "time", lambda: 1000)
+        shader_path_factory("foo", extension="glsl.mustache", text=self.TEMPLATE)
+        Shader("foo", {"x": 0.0}).on()
+        current = fake_hyprland.screen_shader
+        assert current is not None
+        os.utime(current, (1000, 1000))
+
+        Shader("foo", {"x": 1.0})._rendered_path()
+        Shader("foo", {"x": 2.0})._rendered_path()
+
+        assert os.path.exists(current)
+
+    def test_concurrent_on_and_current(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory(
+            "foo", extension="glsl.mustache", text=self.TEMPLATE
+        )
+        variables = [{"x": float(i)} for i in range(50)]
+        errors: list[BaseException] = []
+        done = threading.Event()
+
+        def on(order: list[dict[str, float]]) -> None:
+            try:
+                for v in order:
+                    Shader("foo", v).on()
+            except BaseException as e:
+                errors.append(e)
+
+        def current() -> None:
+            try:
+                while not done.is_set():
+                    shader = Shader.current()
+                    assert shader is None or shader == PureShader(str(shader_path))
+            except BaseException as e:
+                errors.append(e)
+
+        writers = [
+            threading.Thread(
+                target=on, args=(variables[i * 12 :] + variables[: i * 12],)
+            )
+            for i in range(4)
+        ]
+        readers = [threading.Thread(target=current) for _ in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        for v in variables:
+            path = Shader("foo", v)._rendered_path()
+            assert Shader._get_template_instance_content_without_metadata(
+                path
+            ).endswith(f"float x = {v['x']};")
+
+    def test_current(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory(
+            "foo", extension="glsl.mustache", text=self.TEMPLATE
+        )
+        Shader("foo", {"x": 1.0}).on()
+        current = Shader.current()
+
+        assert current == PureShader(str(shader_path))
+        assert current is not None
+        assert current.template_instance_path == fake_hyprland.screen_shader
 
 
 class TestShaderIntegration:
@@ -174,3 +407,83 @@ class TestShaderIntegration:
 
         shader.on()
         assert Shader.current() == shader
+
+
+class TestShaderToggle:
+    def test_on(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory("foo")
+        Shader.toggle(ShaderNoConfig("foo"), None)
+
+        assert fake_hyprland.screen_shader == str(shader_path)
+        assert len(fake_hyprland.requests) == 2
+
+    def test_off(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory("foo")
+        fake_hyprland.options["decoration:screen_shader"] = str(shader_path)
+        Shader.toggle(ShaderNoConfig("foo"), None)
+
+        assert fake_hyprland.screen_shader is None
+        keywords = [r for r in fake_hyprland.requests if r.startswith("keyword")]
+        assert keywords == [f"keyword decoration:screen_shader {hyprctl.EMPTY_STR}"]
+
+    def test_fallback_does_not_reapply(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory("foo")
+        fallback_path = shader_path_factory("bar")
+        fake_hyprland.options["decoration:screen_shader"] = str(shader_path)
+        Shader.toggle(ShaderNoConfig("foo"), ShaderNoConfig("bar"))
+
+        keywords = [r for r in fake_hyprland.requests if r.startswith("keyword")]
+        assert keywords == [f"keyword decoration:screen_shader {fallback_path}"]
+
+    def test_template_off_does_not_render(
+        self,
+        fake_hyprland: FakeHyprland,
+        shader_path_factory: ShaderPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        shader_path_factory("foo", extension="glsl.mustache")
+        Shader.toggle(ShaderNoConfig("foo"), None)
+        assert fake_hyprland.screen_shader is not None
+
+        def render(*args, **kwargs):
+            raise AssertionError("rendered on toggle off")
+
+        monkeypatch.setattr(Shader, "_render_template", render)
+        Shader.toggle(ShaderNoConfig("foo"), None)
+        assert fake_hyprland.screen_shader is None
+
+    def test_fallback(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path = shader_path_factory("foo")
+        fallback_path = shader_path_factory("bar")
+        fake_hyprland.options["decoration:screen_shader"] = str(shader_path)
+        Shader.toggle(ShaderNoConfig("foo"), ShaderNoConfig("bar"))
+        assert fake_hyprland.screen_shader == str(fallback_path)
+
+        Shader.toggle(ShaderNoConfig("foo"), ShaderNoConfig("bar"))
+        assert fake_hyprland.screen_shader == str(shader_path)
+
+    def test_off_to_fallback(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        fallback_path = shader_path_factory("bar")
+        Shader.toggle(None, ShaderNoConfig("bar"))
+
+        assert fake_hyprland.screen_shader == str(fallback_path)
+
+    def test_template(
+        self, fake_hyprland: FakeHyprland, shader_path_factory: ShaderPathFactory
+    ):
+        shader_path_factory("foo", extension="glsl.mustache")
+        Shader.toggle(ShaderNoConfig("foo"), None)
+        assert fake_hyprland.screen_shader is not None
+
+        Shader.toggle(ShaderNoConfig("foo"), None)
+        assert fake_hyprland.screen_shader is None
@@ -3,8 +3,10 @@ from typing import Any
 import pytest
 
 from hyprshade.template.mustache import (
+    COMPILED_TEMPLATES_KEPT,
     NULLISH_COALESCE_LAMBDA_NAME,
     ReservedVariablesError,
+    compile_template,
     normalize_string,
     render,
 )
@@ -68,3 +70,25 @@ def test_normalize_string():
     assert normalize_string("foo-bar_baz-qux") == "FOOBARBAZQUX"
     assert normalize_string("foo-bar_baz-qux_quux") == "FOOBARBAZQUXQUUX"
     assert normalize_string("foo-_-_---_-___bar") == "FOOBAR"
+
+
+class TestCompileTemplate:
+    def test_render(self):
+        compiled = compile_template("Hello, {{name}}!")
+        assert render(compiled, {"name": "world"}) == "Hello, WORLD!"
+
+    def test_nullish_coalesce(self):
+        compiled = compile_template(f"Hello, {nc('{{name}} ? world')}!")
+
+        assert render(compiled) == "Hello, world!"
+        assert render(compiled, {"name": "planet"}) == "Hello, PLANET!"
+
+    def test_memoized(self):
+        assert compile_template("{{a}}") is compile_template("{{a}}")
+
+    def test_memoized_bounded(self):
+        first = compile_template("{{a}}")
+        for i in range(COMPILED_TEMPLATES_KEPT):
+            compile_template(f"{{{{a}}}} {i}")
+
+        assert compile_template("{{a}}") is not first
@@ -0,0 +1,141 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import chevron
+import pytest
+
+from hyprshade.template import mustache, renderer
+from hyprshade.template.mustache import DEFAULT_RENDER_DATA, normalize_data
+
+SHADERS_DIR = Path(__file__).parents[2] / "shaders"
+
+TEMPLATES = [
+    "",
+    "Hello, world!",
+    "{{",
+    "{{a}}",
+    "{{ a }}",
+    "{{a.b.c}}",
+    "{{a.0}}",
+    "{{{a}}} {{&a}}",
+    "{{.}}",
+    "{{! comment }}x",
+    "  {{! comment }}\nx",
+    "{{#a}}yes{{/a}}{{^a}}no{{/a}}",
+    "{{#a}}{{.}}{{/a}}",
+    "{{#a}}{{b}}{{/a}}",
+    "{{^a}}{{.}}{{/a}}",
+    "{{#list}}[{{.}}]{{/list}}",
+    "{{#list}}{{#list}}{{.}}{{/list}}{{/list}}",
+    "line\n  {{#a}}\n  inner\n  {{/a}}\nend\n",
+    "line\n\t{{#a}}  \ninner\n{{/a}}",
+    "  {{#a}} x\n{{/a}}",
+    "{{#nc}}{{a}} ? default{{/nc}}",
+    "{{#nc}}{{a.b}}?{{c}}{{/nc}}",
+    "{{#nc}}{{{a}}} ? {{&c}}{{/nc}}",
+    "{{#nc}}{{#a}}{{b}}{{/a}} ? none{{/nc}}",
+    "{{#a}}{{#nc}}{{b}} ? x{{/nc}}{{/a}}",
+    "  {{#nc}}\n{{a}} ? default\n  {{/nc}}\n",
+    "{{#nc}}\n{{a}}\n?\n{{c}}\n{{/nc}}",
+]
+
+DATA: list[dict[str, Any]] = [
+    {},
+    {"a": "x<y>&\"'", "b": 2, "c": "c"},
+    {"a": {"b": {"c": 1.5}, "0": "zero"}, "c": 0},
+    {"a": 0, "b": False, "c": None},
+    {"a": "", "b": [], "c": {}},
+    {"a": [1, 0, "two"], "list": [1, 2], "b": "b"},
+    {"a": True, "b": {"b": "inner"}},
+    {"a": {"b": "x"}, "list": [{"a": 1}, {"a": 0}], "nc": {"b": 1}},
+]
+
+
+def chevron_render(template: str, data: dict[str, Any]) -> str:
+    return chevron.render(template, DEFAULT_RENDER_DATA | normalize_data(data))
+
+
+def render(template: str, data: dict[str, Any]) -> str:
+    compiled = mustache.compile_template(template)
+    assert compiled.nodes is not None
+    return renderer.render(compiled.nodes, DEFAULT_RENDER_DATA | normalize_data(data))
+
+
+def outcome(f: Callable[[str, dict[str, Any]], str], *args) -> str | type:
+    try:
+        return f(*args)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+@pytest.mark.parametrize("data", DATA)
+def test_same_as_chevron(template: str, data: dict[str, Any]):
+    assert outcome(render, template, data) == outcome(chevron_render, template, data)
+
+
+@pytest.mark.parametrize(
+    "path", sorted(SHADERS_DIR.glob("*.mustache")), ids=lambda p: p.name
+)
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"type": "red_green", "strength": 0.5},
+        {"balance": {"red": 2.0, "blue": 0}, "strength": -1},
+        {"temperature": 4000, "luminosity_type": "pal", "strength": ""},
+    ],
+)
+def test_shaders_same_as_chevron(path: Path, data: dict[str, Any]):
+    template = path.read_text()
+    assert render(template, data) == chevron_render(template, data)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{>partial}}",
+        "{{=<% %>=}}",
+        "{{{a}}",
+        "{{}}",
+        "{{a",
+        "{{#a}}",
+        "{{/a}}",
+        "{{#a}}{{/b}}",
+        "{{#nc}}{{#nc}}a ? b{{/nc}}{{/nc}}",
+    ],
+)
+def test_unsupported(template: str):
+    with pytest.raises(renderer.UnsupportedTemplateError):
+        renderer.compile_nodes(template)
+
+
+@pytest.mark.parametrize(
+    ("template", "message"),
+    [
+        ("{{#nc}}{{a}}{{/nc}}", "requires a default value"),
+        ("{{#nc}}{{a}} ? b ? c{{/nc}}", "must occur only once"),
+    ],
+)
+def test_nullish_coalesce_errors(template: str, message: str):
+    with pytest.raises(ValueError, match=message):
+        render(template, {})
+    with pytest.raises(ValueError, match=message):
+        chevron_render(template, {})
+
+
+def test_nullish_coalesce_errors_in_falsy_section():
+    template = "{{#a}}{{#nc}}{{b}}{{/nc}}{{/a}}"
+    assert render(template, {}) == chevron_render(template, {}) == ""
+
+
+def test_falls_back_to_chevron():
+    compiled = mustache.compile_template("{{>partial}}{{a}}")
+    assert compiled.nodes is None
+    assert mustache.render(compiled, {"a": "x"}) == "X"
+
+
+def test_other_lambdas_fall_back_to_chevron(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(DEFAULT_RENDER_DATA, "upper", lambda text, r: r(text).upper())
+    assert mustache.render("{{#upper}}{{a}}b{{/upper}}", {"a": "x"}) == "XB"
@@ -0,0 +1,161 @@
+import os
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from hyprshade import client
+from hyprshade.daemon.core import Daemon
+from tests.conftest import Isolation
+from tests.helpers import FakeHyprland
+from tests.types import ConfigFactory, ShaderPathFactory
+
+
+@pytest.fixture()
+def daemon(
+    fake_hyprland: FakeHyprland, config_factory: ConfigFactory
+) -> Iterator[Daemon]:
+    config_factory.write({})
+    stopped = threading.Event()
+
+    with Daemon(config_factory.get_config()) as d:
+
+        def _serve():
+            while not stopped.is_set():
+                d.poll(timeout=0.01)
+
+        thread = threading.Thread(target=_serve)
+        thread.start()
+        try:
+            yield d
+        finally:
+            stopped.set()
+            thread.join()
+
+
+class TestSocketPath:
+    def test_no_runtime_dir(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        assert client.socket_path() is None
+
+    def test_signature(self, isolation: Isolation, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+        monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", "foo")
+        assert client.socket_path() == str(
+            isolation.runtime_dir / "hyprshade" / "daemon-foo.sock"
+        )
+
+
+class TestForward:
+    @pytest.mark.usefixtures("fake_hyprland")
+    def test_no_daemon(self):
+        assert client.forward(["off"]) is None
+
+    @pytest.mark.usefixtures("daemon")
+    @pytest.mark.parametrize(
+        "argv", [[], ["ls"], ["-v", "off"], ["install"], ["current", "--follow"]]
+    )
+    def test_not_forwarded(self, argv: list[str]):
+        assert client.forward(argv) is None
+
+    @pytest.mark.usefixtures("daemon")
+    def test_on_off(
+        self,
+        fake_hyprland: FakeHyprland,
+        shader_path_factory: ShaderPathFactory,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        shader_path = shader_path_factory("foo")
+
+        assert client.forward(["on", "foo"]) == 0
+        assert fake_hyprland.screen_shader == str(shader_path)
+
+        assert client.forward(["current"]) == 0
+        assert capsys.readouterr().out == "foo\n"
+
+        assert client.forward(["toggle", "foo"]) == 0
+        assert fake_hyprland.screen_shader is None
+
+    @pytest.mark.usefixtures("daemon")
+    def test_relative_path(self, fake_hyprland: FakeHyprland, isolation: Isolation):
+        (shader_path := Path(isolation.cwd) / "foo.glsl").write_text("void main() {}")
+
+        assert client.forward(["on", "./foo.glsl"]) == 0
+        assert fake_hyprland.screen_shader == str(shader_path)
+
+    @pytest.mark.usefixtures("daemon")
+    def test_error(self, capsys: pytest.CaptureFixture[str]):
+        assert client.forward(["on", "doesnotexist"]) == 1
+        assert "could not be found" in capsys.readouterr().err
+
+    @pytest.mark.usefixtures("daemon")
+    def test_usage_error(self, capsys: pytest.CaptureFixture[str]):
+        assert client.forward(["on"]) == 2
+        assert "Missing argument" in capsys.readouterr().err
+
+
+class TestForwardNoReply:
+    @pytest.fixture()
+    def serve(
+        self, isolation: Isolation, monkeypatch: pytest.MonkeyPatch
+    ) -> Iterator[Callable[[bytes | None], None]]:
+        # Serve one connection with `reply`, or no reply at all if `None`.
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(isolation.runtime_dir))
+        path = client.socket_path()
+        assert path is not None
+        os.makedirs(os.path.dirname(path))
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+        threads = []
+        done = threading.Event()
+
+        def _serve(reply: bytes | None) -> None:
+            conn, _ = server.accept()
+            with conn:
+                client.recv_all(conn)
+                if reply is None:
+                    done.wait()
+                else:
+                    conn.sendall(reply)
+
+        def start(reply: bytes | None) -> None:
+            thread = threading.Thread(target=_serve, args=(reply,))
+            thread.start()
+            threads.append(thread)
+
+        try:
+            yield start
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+            server.close()
+
+    def test_closed(self, serve: Callable[[bytes | None], None]):
+        serve(b"")
+        assert client.forward(["off"]) is None
+
+    @pytest.mark.parametrize("reply", [b"{", b"[]", b'{"stdout": ""}'])
+    def test_invalid(
+        self,
+        serve: Callable[[bytes | None], None],
+        reply: bytes,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        serve(reply)
+        assert client.forward(["off"]) == 1
+        assert "daemon did not reply" in capsys.readouterr().err
+
+    def test_timeout(
+        self,
+        serve: Callable[[bytes | None], None],
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        monkeypatch.setattr(client, "RESPONSE_TIMEOUT", 0.05)
+        serve(None)
+        assert client.forward(["off"]) == 1
+        assert "daemon did not reply" in capsys.readouterr().err
@@ -1,19 +1,33 @@
+import os
+from itertools import islice
 from pathlib import Path
 
 import pytest
 
-from hyprshade.utils.fs import ls_dirs, scandir_recursive
+from hyprshade.utils.fs import (
+    ls_dirs,
+    read_json,
+    remove_oldest,
+    scandir_forest,
+    scandir_tree,
+    write_file_atomic,
+    write_json,
+)
 
 
-class TestScandirRecursive:
+def scandir_files(path: Path, *, max_depth: int) -> list[os.DirEntry[str]]:
+    return [f for _, files in scandir_tree(path, max_depth=max_depth) for f in files]
+
+
+class TestScandirTreeFiles:
     def test_empty(self, tmp_path: Path):
-        assert list(scandir_recursive(tmp_path, max_depth=0)) == []
+        assert list(scandir_files(tmp_path, max_depth=0)) == []
 
     def test_root(self, tmp_path: Path):
         for name in ["foo", "bar", "baz"]:
             (tmp_path / name).touch()
 
-        assert sorted(f.name for f in scandir_recursive(tmp_path, max_depth=0)) == [
+        assert sorted(f.name for f in scandir_files(tmp_path, max_depth=0)) == [
             "bar",
             "baz",
             "foo",
@@ -29,12 +43,12 @@ class TestScandirRecursive:
             (tmp_path / "foo" / name).touch()
         for name in ["g", "h", "i"]:
             (tmp_path / "foo" / "bar" / name).touch()
-        assert sorted(f.name for f in scandir_recursive(tmp_path, max_depth=0)) == [
+        assert sorted(f.name for f in scandir_files(tmp_path, max_depth=0)) == [
             "a",
             "b",
             "c",
         ]
-        assert sorted(f.name for f in scandir_recursive(tmp_path, max_depth=1)) == [
+        assert sorted(f.name for f in scandir_files(tmp_path, max_depth=1)) == [
             "a",
             "b",
             "c",
@@ -42,7 +56,7 @@ class TestScandirRecursive:
             "e",
             "f",
         ]
-        assert sorted(f.name for f in scandir_recursive(tmp_path, max_depth=2)) == [
+        assert sorted(f.name for f in scandir_files(tmp_path, max_depth=2)) == [
             "a",
             "b",
             "c",
@@ -56,11 +70,214 @@ class TestScandirRecursive:
 
     def test_negative_max_depth(self, tmp_path: Path):
         with pytest.raises(AssertionError):
-            list(scandir_recursive(tmp_path, max_depth=-1))
+            list(scandir_files(tmp_path, max_depth=-1))
 
     def test_invalid_path(self, tmp_path: Path):
         with pytest.raises(FileNotFoundError):
-            list(scandir_recursive(tmp_path / "doesnotexist", max_depth=0))
+            list(scandir_files(tmp_path / "doesnotexist", max_depth=0))
+
+
+class TestScandirTree:
+    def test_empty(self, tmp_path: Path):
+        assert list(scandir_tree(tmp_path, max_depth=0)) == [(tmp_path, [])]
+
+    def test_recursive(self, tmp_path: Path):
+        (tmp_path / "foo" / "bar").mkdir(parents=True)
+        (tmp_path / "a").touch()
+        (tmp_path / "foo" / "b").touch()
+        (tmp_path / "foo" / "bar" / "c").touch()
+        tree = [
+            (os.fspath(d), [f.name for f in files])
+            for d, files in scandir_tree(tmp_path, max_depth=5)
+        ]
+        assert tree == [
+            (str(tmp_path), ["a"]),
+            (str(tmp_path / "foo"), ["b"]),
+            (str(tmp_path / "foo" / "bar"), ["c"]),
+        ]
+
+    def test_symlink_loop(self, tmp_path: Path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "foo").touch()
+        (tmp_path / "a" / "loop").symlink_to(tmp_path)
+        (tmp_path / "self").symlink_to(".")
+        tree = [
+            (os.fspath(d), [f.name for f in files])
+            for d, files in scandir_tree(tmp_path, max_depth=5)
+        ]
+        assert tree == [(str(tmp_path), []), (str(tmp_path / "a"), ["foo"])]
+
+    def test_symlinked_dir_walked_once(self, tmp_path: Path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "foo").touch()
+        (tmp_path / "b").symlink_to("a")
+        files = [f.name for f in scandir_files(tmp_path, max_depth=5)]
+        assert files == ["foo"]
+
+    def test_no_follow_symlinks(self, tmp_path: Path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "foo").touch()
+        (tmp_path / "link").symlink_to(tmp_path / "a")
+        (tmp_path / "file-link").symlink_to(tmp_path / "a" / "foo")
+        tree = [
+            (os.fspath(d), sorted(f.name for f in files))
+            for d, files in scandir_tree(tmp_path, max_depth=5, follow_symlinks=False)
+        ]
+        assert tree == [(str(tmp_path), ["file-link"]), (str(tmp_path / "a"), ["foo"])]
+
+    def test_follow_symlinks(self, tmp_path: Path):
+        (target := tmp_path / "target").mkdir()
+        (target / "foo").touch()
+        (root := tmp_path / "root").mkdir()
+        (root / "link").symlink_to(target)
+        tree = [
+            (os.fspath(d), [f.name for f in files])
+            for d, files in scandir_tree(root, max_depth=5)
+        ]
+        assert tree == [(str(root), []), (str(root / "link"), ["foo"])]
+
+    def test_shared_visited(self, tmp_path: Path):
+        (tmp_path / "foo").touch()
+        visited: set[tuple[int, int]] = set()
+        assert len(list(scandir_tree(tmp_path, max_depth=0, visited=visited))) == 1
+        assert list(scandir_tree(tmp_path, max_depth=0, visited=visited)) == []
+
+
+class TestScandirForest:
+    @pytest.fixture()
+    def roots(self, tmp_path: Path) -> list[Path]:
+        roots = [tmp_path / name for name in ["env", "hypr", "hyprshade", "system"]]
+        for i, root in enumerate(roots):
+            (root / "sub" / "deep").mkdir(parents=True)
+            (root / f"{i}").touch()
+            (root / "sub" / f"{i}").touch()
+            (root / "sub" / "deep" / f"{i}").touch()
+        (roots[1] / "shared").symlink_to(roots[3] / "sub")
+        (roots[2] / "linked").symlink_to(roots[1])
+        (roots[3] / "loop").symlink_to(roots[3])
+        return roots
+
+    @staticmethod
+    def walk(roots: list[Path], **kwargs) -> list[tuple[str, list[str]]]:
+        return [
+            (os.fspath(d), sorted(f.name for f in files))
+            for d, files in scandir_forest(roots, max_depth=5, **kwargs)
+        ]
+
+    def test_sequential(self, roots: list[Path]):
+        visited: set[tuple[int, int]] = set()
+        expected = [
+            (os.fspath(d), sorted(f.name for f in files))
+            for root in roots
+            for d, files in scandir_tree(root, max_depth=5, visited=visited)
+        ]
+        assert self.walk(roots) == expected
+
+    @pytest.mark.parametrize("max_workers", [2, 4, 8])
+    def test_threaded(self, roots: list[Path], max_workers: int):
+        assert self.walk(roots, max_workers=max_workers) == self.walk(roots)
+
+    @pytest.mark.parametrize("max_workers", [2, 4])
+    def test_threaded_depth(self, tmp_path: Path, max_workers: int):
+        x = tmp_path / "r1" / "d1" / "d2" / "d3" / "d4" / "x"
+        (x / "z").mkdir(parents=True)
+        (x / "x.glsl").touch()
+        (x / "z" / "zonly.glsl").touch()
+        (r2 := tmp_path / "r2").mkdir()
+        (r2 / "a").symlink_to(x)
+        (r2 / "b").symlink_to(x / "z")
+
+        roots = [tmp_path / "r1", r2]
+        walk = self.walk(roots, max_workers=max_workers)
+        assert walk == self.walk(roots)
+        assert sorted(name for _, files in walk for name in files) == [
+            "x.glsl",
+            "zonly.glsl",
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_error(self, roots: list[Path], max_workers: int):
+        roots[2] = roots[2] / "doesnotexist"
+        walk = scandir_forest(roots, max_depth=5, max_workers=max_workers)
+        assert [os.fspath(d) for d, _ in islice(walk, 2)] == [
+            str(roots[0]),
+            str(roots[0] / "sub"),
+        ]
+        with pytest.raises(FileNotFoundError):
+            list(walk)
+
+
+class TestWriteFileAtomic:
+    def test_write(self, tmp_path: Path):
+        path = tmp_path / "sub" / "foo"
+        write_file_atomic(str(path), b"hello")
+        assert path.read_bytes() == b"hello"
+
+    def test_overwrite(self, tmp_path: Path):
+        (path := tmp_path / "foo").write_bytes(b"old")
+        write_file_atomic(str(path), b"new")
+        assert path.read_bytes() == b"new"
+        assert os.listdir(tmp_path) == ["foo"]
+
+    def test_skip_identical(self, tmp_path: Path):
+        (path := tmp_path / "foo").write_bytes(b"same")
+        st = path.stat()
+
+        assert not write_file_atomic(str(path), b"same", skip_identical=True)
+        assert (path.stat().st_ino, path.stat().st_mtime_ns) == (
+            st.st_ino,
+            st.st_mtime_ns,
+        )
+        assert write_file_atomic(str(path), b"diff", skip_identical=True)
+        assert path.read_bytes() == b"diff"
+        assert write_file_atomic(str(tmp_path / "new"), b"", skip_identical=True)
+
+
+class TestJson:
+    def test_round_trip(self, tmp_path: Path):
+        path = str(tmp_path / "foo.json")
+        write_json(path, 2, {"a": [1]})
+        assert read_json(path, 2) == {"version": 2, "a": [1]}
+
+    @pytest.mark.parametrize("contents", ["", "[]", '{"version": 1}'])
+    def test_invalid(self, tmp_path: Path, contents: str):
+        (path := tmp_path / "foo.json").write_text(contents)
+        assert read_json(str(path), 2) is None
+
+    def test_missing(self, tmp_path: Path):
+        assert read_json(str(tmp_path / "foo.json"), 2) is None
+
+
+class TestRemoveOldest:
+    def test_keep(self, tmp_path: Path):
+        paths = []
+        for i in range(4):
+            (path := tmp_path / str(i)).touch()
+            os.utime(path, (1000 + i, 1000 + i))
+            paths.append(str(path))
+
+        remove_oldest([*paths, str(tmp_path / "missing")], keep=2)
+        assert sorted(os.listdir(tmp_path)) == ["2", "3"]
+
+    def test_min_age(self, tmp_path: Path):
+        (old := tmp_path / "old").touch()
+        os.utime(old, (1000, 1000))
+        (new := tmp_path / "new").touch()
+
+        remove_oldest([str(old), str(new)], keep=0, min_age=60)
+        assert os.listdir(tmp_path) == ["new"]
+
+    def test_last_used(self, tmp_path: Path):
+        for name in ["used", "unused"]:
+            (path := tmp_path / name).touch()
+            os.utime(path, (1000, 1000))
+
+        remove_oldest(
+            [str(tmp_path / "used"), str(tmp_path / "unused")],
+            keep=1,
+            last_used={str(tmp_path / "used"): 2000},
+        )
+        assert os.listdir(tmp_path) == ["used"]
 
 
 class TestLsDirs:
@@ -93,3 +310,41 @@ class TestLsDirs:
                 ],
             )
         )
+
+    def test_symlinked_dirs(self, tmp_path_factory: pytest.TempPathFactory):
+        hyprshade = tmp_path_factory.mktemp("hyprshade")
+        (hyprshade / "foo").touch()
+        hypr = tmp_path_factory.mktemp("hypr") / "shaders"
+        hypr.symlink_to(hyprshade)
+
+        assert list(ls_dirs([hypr, hyprshade])) == [str(hypr / "foo")]
+
+    def test_same_name_keeps_dir_order(self, tmp_path_factory: pytest.TempPathFactory):
+        paths = [tmp_path_factory.mktemp(name) for name in ["foo", "bar"]]
+        for path in paths:
+            (path / "a").touch()
+            (path / "b").touch()
+        (paths[0] / "sub").mkdir()
+        (paths[0] / "sub" / "a").touch()
+
+        assert list(ls_dirs(paths)) == list(
+            map(
+                str,
+                [
+                    paths[0] / "a",
+                    paths[0] / "sub" / "a",
+                    paths[1] / "a",
+                    paths[0] / "b",
+                    paths[1] / "b",
+                ],
+            )
+        )
+
+    def test_threaded(self, tmp_path_factory: pytest.TempPathFactory):
+        paths = [tmp_path_factory.mktemp(name) for name in ["foo", "bar", "baz"]]
+        for path in paths:
+            (path / "a").touch()
+            (path / "sub").mkdir()
+            (path / "sub" / path.name).touch()
+
+        assert list(ls_dirs(paths, max_workers=3)) == list(ls_dirs(paths))
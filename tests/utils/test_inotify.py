@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from hyprshade.utils.inotify import IN_CLOSE_WRITE, IN_DELETE, Inotify
+
+
+def test_events(tmp_path: Path):
+    with Inotify() as watcher:
+        watcher.add_watch(str(tmp_path), IN_CLOSE_WRITE | IN_DELETE)
+        assert watcher.read() == []
+
+        (tmp_path / "foo").write_text("foo")
+        (tmp_path / "foo").unlink()
+        events = watcher.read()
+
+    assert [(e.name, e.mask) for e in events] == [
+        ("foo", IN_CLOSE_WRITE),
+        ("foo", IN_DELETE),
+    ]
+
+
+def test_close(tmp_path: Path):
+    watcher = Inotify()
+    watcher.close()
+    watcher.close()
+    assert watcher.fileno() == -1
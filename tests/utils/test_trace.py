@@ -0,0 +1,51 @@
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from hyprshade.utils import trace
+
+
+@pytest.fixture()
+def _enabled() -> Iterator[None]:
+    trace.enable()
+    yield
+    trace.disable()
+
+
+def test_disabled():
+    assert not trace.is_enabled()
+    with trace.span("foo", x=1) as span:
+        pass
+    assert span is trace.span("bar")
+    assert trace.disable() == []
+
+
+@pytest.mark.usefixtures("_enabled")
+def test_enabled():
+    with trace.span("outer", x=1), trace.span("inner"):
+        pass
+    inner, outer = trace.disable()
+
+    assert (outer["name"], outer["ph"], outer["args"]) == ("outer", "X", {"x": 1})
+    assert inner["name"] == "inner"
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+@pytest.mark.usefixtures("_enabled")
+def test_records_on_error():
+    with pytest.raises(ValueError, match="boom"), trace.span("failing"):
+        raise ValueError("boom")
+    assert [e["name"] for e in trace.disable()] == ["failing"]
+
+
+def test_dump(tmp_path: Path):
+    path = tmp_path / "trace.json"
+    trace.dump(str(path), [{"name": "foo", "args": {"path": Path("/")}}])
+
+    assert json.loads(path.read_text()) == {
+        "traceEvents": [{"name": "foo", "args": {"path": "/"}}],
+        "displayTimeUnit": "ms",
+    }